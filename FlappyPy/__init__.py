@@ -3,8 +3,10 @@
 
 import logging
 
-logging.basicConfig(level=logging.DEBUG)
+# Importing the package never configures logging; applications (and
+# `python -m FlappyPy`) decide where log records go
 logger = logging.getLogger('FlappyPy')
+logger.addHandler(logging.NullHandler())
 
 class MyClass:
     def my_method(self):
@@ -12,4 +14,4 @@ class MyClass:
 
 
 # let this be the last line of this file
-logger.info("FlappyPy loaded")
\ No newline at end of file
+logger.info("FlappyPy loaded")
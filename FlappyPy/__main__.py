@@ -1,7 +1,27 @@
 """FlappyPy - a simple Flappy Bird in Python using Pygame"""
 """Entry Point for the FlappyPy game"""
 
+import logging
+import os
+
 from FlappyPy.main import main
 
+# Every game played from the command line is logged here by default
+DEFAULT_HISTORY_PATH = os.path.join(os.path.expanduser("~"), ".flappypy", "history.fph")
+
+# FLAPPYPY_HISTORY=runs.fph logs games there instead; FLAPPYPY_HISTORY=off (or empty) logs nothing
+HISTORY_ENV = "FLAPPYPY_HISTORY"
+
+# FLAPPYPY_PROFILE=frames.csv (or .json) shows frame times on screen and exports them at exit
+PROFILE_ENV = "FLAPPYPY_PROFILE"
+
 if __name__ == "__main__":
-    main()
+    logging.basicConfig(level=logging.INFO)
+    profiler = None
+    if os.environ.get(PROFILE_ENV):
+        from FlappyPy.profiling import FrameProfiler
+        profiler = FrameProfiler(overlay=True, export_path=os.environ[PROFILE_ENV])
+    history_path = os.environ.get(HISTORY_ENV, DEFAULT_HISTORY_PATH)
+    if history_path.lower() in ("", "off"):
+        history_path = None
+    main(history_path=history_path, profiler=profiler)
@@ -0,0 +1,188 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Vectorized batch of independent headless games (requires NumPy)"""
+
+try:
+    import numpy as np
+except ImportError as error:  # pragma: no cover - depends on the environment
+    raise ImportError("FlappyPy.batch requires NumPy: pip install numpy") from error
+
+from FlappyPy.main import (
+    WINDOW_HEIGHT,
+    BIRD_WIDTH, BIRD_HEIGHT, BIRD_START_X, BIRD_START_Y,
+    BIRD_JUMP_STRENGTH, BIRD_GRAVITY,
+    PIPE_WIDTH, PIPE_GAP, PIPE_X_START, PIPE_SPEED,
+    PIPE_SPAWN_INTERVAL, GAP_CENTER_MIN, GAP_CENTER_MAX, PIPE_POOL_CAPACITY,
+    ACTION_FLAP,
+    generate_gap_centers,
+)
+
+
+""" Constants """
+# Pipe slots per game, as in the scalar PipePool
+PIPE_CAPACITY = PIPE_POOL_CAPACITY
+
+# Causes of death stored in BatchSimulation.final_cause
+CAUSE_NONE = 0
+CAUSE_PIPE = 1
+CAUSE_GROUND = 2
+
+
+""" Functions """
+def generate_courses(seeds, length):
+    """Pregenerate one course per seed as an (len(seeds), length) array
+
+    Row i matches the pipes of Simulation(seed=seeds[i]).
+    """
+    return np.array([generate_gap_centers(seed, length) for seed in seeds], dtype=np.uint16)
+
+
+""" Classes """
+class BatchSimulation:
+    """Steps many independent games at once using NumPy arrays
+
+    Follows the same rules as Simulation, frame for frame: bird state is
+    kept in (n_envs,) arrays and pipes in (n_envs, PIPE_CAPACITY) slot
+    arrays. Finished games are restarted automatically unless auto_reset
+    is False, in which case they stay frozen until reset() is called.
+    """
+
+    def __init__(self, n_envs, seed=None, auto_reset=True, gap_centers=None):
+        """Allocate the state arrays and start n_envs new games
+
+        Gap centers are drawn from a generator seeded with seed, unless
+        gap_centers gives pregenerated courses: either one course shared by
+        every game, shape (length,), or one per game, shape (n_envs, length).
+        Courses wrap around when they run out and restart with each game.
+        """
+        self.n_envs = n_envs
+        self.auto_reset = auto_reset
+        self.rng = np.random.default_rng(seed)
+        self.gap_centers = None
+        if gap_centers is not None:
+            gap_centers = np.asarray(gap_centers, dtype=np.int64)
+            self.gap_centers = np.broadcast_to(gap_centers, (n_envs, gap_centers.shape[-1]))
+
+        # Bird state
+        self.bird_y = np.zeros(n_envs, dtype=np.float64)
+        self.bird_velocity = np.zeros(n_envs, dtype=np.float64)
+
+        # Pipe slots
+        shape = (n_envs, PIPE_CAPACITY)
+        self.pipe_x = np.zeros(shape, dtype=np.int64)
+        self.pipe_gap_center = np.zeros(shape, dtype=np.int64)
+        self.pipe_top_height = np.zeros(shape, dtype=np.int64)
+        self.pipe_bottom_y = np.zeros(shape, dtype=np.int64)
+        self.pipe_active = np.zeros(shape, dtype=bool)
+        self.pipe_scored = np.zeros(shape, dtype=bool)
+
+        # Game progress
+        self.score = np.zeros(n_envs, dtype=np.int64)
+        self.frame = np.zeros(n_envs, dtype=np.int64)
+        self.frames_since_spawn = np.zeros(n_envs, dtype=np.int64)
+        self.spawn_count = np.zeros(n_envs, dtype=np.int64)
+        self.game_over = np.zeros(n_envs, dtype=bool)
+
+        # Results of the games that ended on the last step
+        self.final_score = np.zeros(n_envs, dtype=np.int64)
+        self.final_frame = np.zeros(n_envs, dtype=np.int64)
+        self.final_cause = np.zeros(n_envs, dtype=np.int8)
+
+        self._env_index = np.arange(n_envs)
+        self.reset()
+
+    def reset(self, mask=None):
+        """Start new games in the environments selected by mask (all by default)"""
+        if mask is None:
+            mask = np.ones(self.n_envs, dtype=bool)
+        self.bird_y[mask] = BIRD_START_Y
+        self.bird_velocity[mask] = 0.0
+        self.pipe_active[mask] = False
+        self.pipe_scored[mask] = False
+        self.score[mask] = 0
+        self.frame[mask] = 0
+        self.frames_since_spawn[mask] = 0
+        self.spawn_count[mask] = 0
+        self.game_over[mask] = False
+
+    def next_gap_centers(self, count):
+        """Pick the gap centers of count new pipes"""
+        return self.rng.integers(GAP_CENTER_MIN, GAP_CENTER_MAX + 1, size=count)
+
+    def step(self, actions):
+        """Advance every running game by one frame
+
+        actions is an (n_envs,) array of simulation actions; only ACTION_FLAP
+        affects physics. Returns (scored, done) boolean arrays. For games
+        that ended, final_score, final_frame and final_cause hold the result.
+        """
+        actions = np.asarray(actions)
+        alive = ~self.game_over
+
+        # Jump, then gravity, then the top boundary (Bird.update)
+        jump = alive & (actions == ACTION_FLAP)
+        self.bird_velocity[jump] = BIRD_JUMP_STRENGTH
+        self.bird_velocity[alive] += BIRD_GRAVITY
+        self.bird_y[alive] += self.bird_velocity[alive]
+        ceiling = self.bird_y < 0
+        self.bird_y[ceiling] = 0.0
+        self.bird_velocity[ceiling] = 0.0
+
+        # Move the pipes of running games
+        moving = self.pipe_active & alive[:, None]
+        self.pipe_x[moving] -= PIPE_SPEED
+
+        # Axis-aligned overlap of the bird with top and bottom pipes
+        # (pygame.Rect truncates the bird's float y to an int)
+        bird_top = self.bird_y.astype(np.int64)[:, None]
+        bird_bottom = bird_top + BIRD_HEIGHT
+        overlap_x = (self.pipe_x < BIRD_START_X + BIRD_WIDTH) & (BIRD_START_X < self.pipe_x + PIPE_WIDTH)
+        hit_top = bird_top < self.pipe_top_height
+        hit_bottom = (bird_bottom > self.pipe_bottom_y) & (bird_top < WINDOW_HEIGHT)
+        hit_pipe = (moving & overlap_x & (hit_top | hit_bottom)).any(axis=1)
+
+        # Scoring for pipes the bird has passed
+        passed = moving & ~self.pipe_scored & (BIRD_START_X > self.pipe_x + PIPE_WIDTH)
+        self.pipe_scored |= passed
+        points = passed.sum(axis=1)
+        self.score += points
+        scored = points > 0
+
+        # Ground collision
+        hit_ground = alive & ~hit_pipe & (self.bird_y + BIRD_HEIGHT >= WINDOW_HEIGHT)
+        done = hit_pipe | hit_ground
+
+        # Remove off-screen pipes
+        self.pipe_active &= self.pipe_x + PIPE_WIDTH > 0
+
+        # Pipe spawning
+        self.frames_since_spawn[alive] += 1
+        spawn = alive & (self.frames_since_spawn >= PIPE_SPAWN_INTERVAL)
+        if spawn.any():
+            rows = self._env_index[spawn]
+            slots = self.spawn_count[spawn] % PIPE_CAPACITY
+            if self.gap_centers is not None:
+                course_index = self.spawn_count[spawn] % self.gap_centers.shape[1]
+                gaps = self.gap_centers[rows, course_index]
+            else:
+                gaps = self.next_gap_centers(len(rows))
+            self.pipe_x[rows, slots] = PIPE_X_START
+            self.pipe_gap_center[rows, slots] = gaps
+            self.pipe_top_height[rows, slots] = gaps - PIPE_GAP // 2
+            self.pipe_bottom_y[rows, slots] = gaps + PIPE_GAP // 2
+            self.pipe_active[rows, slots] = True
+            self.pipe_scored[rows, slots] = False
+            self.spawn_count[spawn] += 1
+            self.frames_since_spawn[spawn] = 0
+
+        self.frame[alive] += 1
+
+        # Record and restart finished games
+        self.game_over |= done
+        if done.any():
+            self.final_score[done] = self.score[done]
+            self.final_frame[done] = self.frame[done]
+            self.final_cause[done] = np.where(hit_pipe[done], CAUSE_PIPE, CAUSE_GROUND)
+            if self.auto_reset:
+                self.reset(done)
+
+        return scored, done
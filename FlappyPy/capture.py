@@ -0,0 +1,209 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Headless frame capture of replays: raw frames to ffmpeg (video or GIF) or PNG sequences"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pygame
+
+from FlappyPy.main import (
+    Simulation, build_sprite_atlas, draw_frame, load_font,
+    WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_COLOR, FPS,
+)
+from FlappyPy.rendering import Renderer, TextCache
+from FlappyPy.replay import Replay, record_policy
+from FlappyPy.rollout import follow_gap, MAX_EPISODE_FRAMES
+
+
+""" Constants """
+FFMPEG = "ffmpeg"
+PNG_PATTERN = "frame_{:05d}.png"
+CHUNKS_PER_WORKER = 4  # Frame ranges handed to each worker when exporting in parallel
+
+# ffmpeg output options by file extension (anything else gets VIDEO_OPTIONS)
+GIF_OPTIONS = ["-vf", "split[a][b];[a]palettegen[p];[b][p]paletteuse", "-loop", "0"]
+VIDEO_OPTIONS = ["-pix_fmt", "yuv420p"]
+
+# ffmpeg names for the bytes of a 32-bit pixel in memory order
+CHANNEL_LETTERS = {"R": "r", "G": "g", "B": "b", "A": "a"}
+
+
+""" Classes """
+class FrameRenderer:
+    """Draws the frames of a replay on an offscreen surface, with no window
+
+    Frame k shows the game after k ticks, drawn by the same draw_frame()
+    the game uses. The surface is reused for every frame, so consume each
+    frame before asking for the next one.
+    """
+
+    def __init__(self, replay):
+        """Prepare to render replay"""
+        pygame.font.init()
+        self.replay = replay
+        self.surface = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT), 0, 32)
+        self.renderer = Renderer(self.surface, BACKGROUND_COLOR, dirty_rects=False)
+        self.atlas = build_sprite_atlas()
+        self.text_cache = TextCache(load_font())
+
+    @property
+    def frame_count(self):
+        """Number of frames in the replay, including the one before the first tick"""
+        return self.replay.frames + 1
+
+    def frames(self, start=0, stop=None, every=1):
+        """Yield (frame, surface) for frames start, start + every, ... up to stop
+
+        Frames before start are simulated without drawing.
+        """
+        stop = self.frame_count if stop is None else min(stop, self.frame_count)
+        actions = self.replay.actions()
+        simulation = Simulation(seed=self.replay.seed)
+        state = simulation.state
+        for frame in range(stop):
+            if frame >= start and (frame - start) % every == 0:
+                draw_frame(self.surface, self.renderer, self.atlas, self.text_cache, state)
+                yield frame, self.surface
+            if frame < self.replay.frames:
+                state, _ = simulation.step(actions[frame])
+
+
+""" Functions """
+def raw_pixel_format(surface):
+    """ffmpeg -pix_fmt name of a 32-bit surface's pixels, e.g. "bgr0" """
+    if surface.get_bytesize() != 4:
+        raise ValueError("Raw capture needs a 32-bit surface")
+    letters = ["0"] * 4
+    for channel, mask, shift in zip("RGBA", surface.get_masks(), surface.get_shifts()):
+        if mask:
+            letters[shift // 8] = CHANNEL_LETTERS[channel]
+    if sys.byteorder == "big":
+        letters.reverse()
+    return "".join(letters)
+
+
+def write_raw_frames(frames, file):
+    """Write each surface's pixels to file without copying them; return the number of frames"""
+    count = 0
+    for _, surface in frames:
+        view = surface.get_view("0")  # The pixels themselves, locked until released
+        try:
+            file.write(view)
+        finally:
+            del view
+        count += 1
+    return count
+
+
+def ffmpeg_command(path, pixel_format, fps, ffmpeg=FFMPEG):
+    """Command line for ffmpeg reading raw frames on stdin and encoding them to path"""
+    options = GIF_OPTIONS if path.lower().endswith(".gif") else VIDEO_OPTIONS
+    return [
+        ffmpeg, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", pixel_format, "-s", f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}",
+        "-r", str(fps), "-i", "-",
+    ] + options + [path]
+
+
+def export_video(replay, path, start=0, stop=None, every=1, ffmpeg=FFMPEG):
+    """Encode frames of replay to a video or GIF at path with ffmpeg; return the number of frames"""
+    renderer = FrameRenderer(replay)
+    command = ffmpeg_command(path, raw_pixel_format(renderer.surface), FPS / every, ffmpeg)
+    try:
+        encoder = subprocess.Popen(command, stdin=subprocess.PIPE)
+    except FileNotFoundError:
+        raise RuntimeError(f"Video export needs ffmpeg ({ffmpeg!r} was not found)") from None
+    try:
+        count = write_raw_frames(renderer.frames(start, stop, every), encoder.stdin)
+    finally:
+        encoder.stdin.close()
+        status = encoder.wait()
+    if status != 0:
+        raise RuntimeError(f"ffmpeg failed with exit status {status}")
+    return count
+
+
+def _export_png_range(replay, directory, start, stop, every):
+    """Worker entry point: save frames start..stop of replay as PNG files"""
+    count = 0
+    for frame, surface in FrameRenderer(replay).frames(start, stop, every):
+        pygame.image.save(surface, os.path.join(directory, PNG_PATTERN.format(frame)))
+        count += 1
+    return count
+
+
+def _init_worker():
+    """Keep workers headless"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def export_png(replay, directory, start=0, stop=None, every=1, workers=None):
+    """Save frames of replay as numbered PNG files in directory; return the number of frames
+
+    The frames are split into ranges rendered in workers processes
+    (default: one per CPU; 0 renders in this process). Each worker
+    fast-forwards to its range headlessly, which costs far less than
+    drawing.
+    """
+    os.makedirs(directory, exist_ok=True)
+    stop = replay.frames + 1 if stop is None else min(stop, replay.frames + 1)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1:
+        return _export_png_range(replay, directory, start, stop, every)
+
+    # Split on multiples of every so the ranges keep the same frames
+    frames = len(range(start, stop, every))
+    if frames == 0:
+        return 0
+    per_range = -(-frames // (workers * CHUNKS_PER_WORKER)) * every
+    ranges = [(first, min(first + per_range, stop)) for first in range(start, stop, per_range)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        futures = [executor.submit(_export_png_range, replay, directory, first, last, every)
+                   for first, last in ranges]
+        return sum(future.result() for future in futures)
+
+
+def main(argv=None):
+    """Command line: render a replay file or a seeded bot run to video, GIF or PNG frames"""
+    parser = argparse.ArgumentParser(prog="python -m FlappyPy.capture", description="Export FlappyPy frames")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--replay", help="replay file to render")
+    source.add_argument("--seed", type=int, help="render the reference bot playing this seed")
+    parser.add_argument("output", help="video or .gif file (needs ffmpeg), or a directory for PNG frames")
+    parser.add_argument("--start", type=int, default=0, help="first frame")
+    parser.add_argument("--stop", type=int, default=None, help="frame to stop before")
+    parser.add_argument("--every", type=int, default=1, help="keep one frame in this many")
+    parser.add_argument("--workers", type=int, default=None, help="processes for PNG export (0 = none)")
+    parser.add_argument("--ffmpeg", default=FFMPEG, help="ffmpeg executable")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if args.replay:
+        replay = Replay.load(args.replay)
+    else:
+        replay = record_policy(args.seed, follow_gap, args.stop or MAX_EPISODE_FRAMES)
+
+    started = time.perf_counter()
+    try:
+        if os.path.splitext(args.output)[1]:
+            count = export_video(replay, args.output, args.start, args.stop, args.every, args.ffmpeg)
+        else:
+            count = export_png(replay, args.output, args.start, args.stop, args.every, args.workers)
+    except RuntimeError as error:
+        print(error, file=sys.stderr)
+        return 1
+    elapsed = time.perf_counter() - started
+    print(f"{count} frames of {replay} to {args.output} in {elapsed:.2f}s "
+          f"({count * args.every / FPS / elapsed:.1f}x real time)")
+    return 0
+
+
+""" Entry Point """
+if __name__ == "__main__":
+    sys.exit(main())
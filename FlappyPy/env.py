@@ -0,0 +1,282 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Gymnasium-style reinforcement learning environments (requires NumPy, not Gymnasium)"""
+
+try:
+    import numpy as np
+except ImportError as error:  # pragma: no cover - depends on the environment
+    raise ImportError("FlappyPy.env requires NumPy: pip install numpy") from error
+
+from FlappyPy.main import (
+    Simulation,
+    WINDOW_WIDTH, WINDOW_HEIGHT,
+    BIRD_START_X, BIRD_WIDTH, BIRD_HEIGHT, BIRD_JUMP_STRENGTH,
+    PIPE_WIDTH, PIPE_X_START, PIPE_SPEED, PIPE_SPAWN_INTERVAL,
+    GAP_CENTER_MIN, GAP_CENTER_MAX,
+    ACTION_NONE, ACTION_FLAP, EVENT_SCORE,
+)
+from FlappyPy.batch import BatchSimulation
+
+
+""" Constants """
+# Environment actions
+ENV_ACTIONS = (ACTION_NONE, ACTION_FLAP)  # Index 0 = do nothing, 1 = flap
+
+# Observation types
+OBS_FEATURES = "features"
+OBS_PIXELS = "pixels"
+
+# Feature vector, each scaled to roughly [-1, 1]
+OBSERVATION_FEATURES = ("bird_y", "bird_velocity", "next_gap_distance", "next_gap_center")
+VELOCITY_SCALE = -BIRD_JUMP_STRENGTH * 2  # Velocity is clipped to +-this before scaling
+
+# Pixel observations: the playfield downscaled by PIXEL_SCALE, one byte per pixel
+PIXEL_SCALE = 5
+PIXEL_HEIGHT = WINDOW_HEIGHT // PIXEL_SCALE
+PIXEL_WIDTH = WINDOW_WIDTH // PIXEL_SCALE
+PIXEL_PIPE = 255
+PIXEL_BIRD = 128
+
+# Rewards
+REWARD_ALIVE = 0.1  # Every frame the bird survives
+REWARD_PIPE = 1.0   # Every pipe passed
+REWARD_DEATH = -1.0  # Instead of REWARD_ALIVE on the frame the game ends
+
+# Where the next pipe is assumed to be before one has spawned
+NO_GAP_CENTER = (GAP_CENTER_MIN + GAP_CENTER_MAX) / 2
+
+
+""" Classes """
+class Discrete:
+    """Integers 0 .. n - 1, like gymnasium.spaces.Discrete"""
+
+    def __init__(self, n, seed=None):
+        self.n = n
+        self.shape = ()
+        self.dtype = np.dtype(np.int64)
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseed the generator used by sample()"""
+        self.np_random = np.random.default_rng(seed)
+
+    def sample(self):
+        """Return a random element"""
+        return int(self.np_random.integers(self.n))
+
+    def contains(self, x):
+        """Whether x is an element of the space"""
+        return isinstance(x, (int, np.integer)) and 0 <= x < self.n
+
+    def __repr__(self):
+        return f"Discrete({self.n})"
+
+
+class Box:
+    """Arrays with per-element bounds, like gymnasium.spaces.Box"""
+
+    def __init__(self, low, high, shape, dtype, seed=None):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.low = np.full(self.shape, low, dtype=self.dtype)
+        self.high = np.full(self.shape, high, dtype=self.dtype)
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reseed the generator used by sample()"""
+        self.np_random = np.random.default_rng(seed)
+
+    def sample(self):
+        """Return a random element"""
+        if np.issubdtype(self.dtype, np.integer):
+            return self.np_random.integers(self.low, self.high, endpoint=True, dtype=self.dtype)
+        return self.np_random.uniform(self.low, self.high).astype(self.dtype)
+
+    def contains(self, x):
+        """Whether x is an element of the space"""
+        x = np.asarray(x)
+        return x.shape == self.shape and bool(np.all((x >= self.low) & (x <= self.high)))
+
+    def __repr__(self):
+        return f"Box({self.low.min()}, {self.high.max()}, {self.shape}, {self.dtype})"
+
+
+class FlappyEnv:
+    """One game as a Gymnasium-style environment
+
+    reset(seed) returns (observation, info) and step(action) returns
+    (observation, reward, terminated, truncated, info). Actions are 0 (do
+    nothing) and 1 (flap). Observations are either the feature vector
+    described by OBSERVATION_FEATURES or a downscaled pixel frame, chosen
+    with obs_type. Episodes are truncated after max_episode_steps frames
+    when it is given.
+    """
+
+    def __init__(self, obs_type=OBS_FEATURES, max_episode_steps=None, gap_centers=None):
+        """Create the environment; call reset() before stepping it"""
+        self.obs_type = obs_type
+        self.max_episode_steps = max_episode_steps
+        self.simulation = Simulation(gap_centers=gap_centers)
+        self.action_space = Discrete(len(ENV_ACTIONS))
+        self.observation_space = observation_space(obs_type)
+
+    def reset(self, seed=None, options=None):
+        """Start a new game and return (observation, info)"""
+        state = self.simulation.reset(seed)
+        return self._observation(), {"score": state.score.get_current_score()}
+
+    def step(self, action):
+        """Play action for one frame and return (observation, reward, terminated, truncated, info)"""
+        state, events = self.simulation.step(ENV_ACTIONS[action])
+        terminated = state.game_over
+        truncated = not terminated and self.max_episode_steps is not None and state.frame >= self.max_episode_steps
+
+        reward = REWARD_DEATH if terminated else REWARD_ALIVE
+        reward += REWARD_PIPE * events.count(EVENT_SCORE)
+        info = {"score": state.score.get_current_score(), "frame": state.frame}
+        if terminated:
+            info["death_cause"] = state.death_cause
+        return self._observation(), reward, terminated, truncated, info
+
+    def close(self):
+        """Nothing to release; present for API compatibility"""
+
+    def _observation(self):
+        """Observation of the current state"""
+        state = self.simulation.state
+        bird = state.bird
+        if self.obs_type == OBS_PIXELS:
+            pipes = list(state.pipes)
+            return rasterize(
+                np.array([bird.y]),
+                np.array([[pipe.x for pipe in pipes]]),
+                np.array([[pipe.top_height for pipe in pipes]]),
+                np.array([[pipe.bottom_y for pipe in pipes]]),
+                np.ones((1, len(pipes)), dtype=bool),
+            )[0]
+
+        # The oldest pipe the bird has not passed yet is the next one
+        for pipe in state.pipes:
+            if pipe.x + pipe.width >= bird.x:
+                distance, center = pipe.x - bird.x, pipe.gap_center_y
+                break
+        else:
+            frames_left = PIPE_SPAWN_INTERVAL - state.frames_since_spawn
+            distance, center = PIPE_X_START + PIPE_SPEED * frames_left - bird.x, NO_GAP_CENTER
+        return scale_features(np.array([bird.y, bird.velocity, distance, center], dtype=np.float64))
+
+
+class FlappyVectorEnv:
+    """num_envs games stepped together by a BatchSimulation
+
+    Mirrors FlappyEnv with a leading num_envs axis on every observation,
+    reward and flag. Games that end are restarted within the same step():
+    the returned observation is already the first of the new game, and
+    info["final_observation"] holds the last one for the rows flagged in
+    info["_final_observation"].
+    """
+
+    def __init__(self, num_envs, obs_type=OBS_FEATURES, max_episode_steps=None, gap_centers=None):
+        """Create the environments; call reset() before stepping them"""
+        self.num_envs = num_envs
+        self.obs_type = obs_type
+        self.max_episode_steps = max_episode_steps
+        self.batch = BatchSimulation(num_envs, auto_reset=False, gap_centers=gap_centers)
+        self.single_action_space = Discrete(len(ENV_ACTIONS))
+        self.single_observation_space = observation_space(obs_type)
+        self.action_space = Box(0, len(ENV_ACTIONS) - 1, (num_envs,), np.int64)
+        self.observation_space = observation_space(obs_type, num_envs)
+        self._actions = np.array(ENV_ACTIONS)
+
+    def reset(self, seed=None, options=None):
+        """Start new games everywhere and return (observations, info)"""
+        if seed is not None:
+            self.batch.rng = np.random.default_rng(seed)
+        self.batch.reset()
+        return self._observation(), {"score": self.batch.score.copy()}
+
+    def step(self, actions):
+        """Play one action per game and return batched (observations, rewards, terminated, truncated, info)"""
+        batch = self.batch
+        scored, terminated = batch.step(self._actions[np.asarray(actions)])
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_episode_steps is not None:
+            truncated = ~terminated & (batch.frame >= self.max_episode_steps)
+
+        rewards = np.where(terminated, REWARD_DEATH, REWARD_ALIVE) + REWARD_PIPE * scored
+        observations = self._observation()
+        info = {"score": batch.score.copy(), "frame": batch.frame.copy()}
+
+        ended = terminated | truncated
+        if ended.any():
+            info["final_observation"] = observations.copy()
+            info["_final_observation"] = ended
+            info["final_score"] = np.where(ended, batch.score, 0)
+            batch.reset(ended)
+            observations[ended] = self._observation()[ended]
+        return observations, rewards, terminated, truncated, info
+
+    def close(self):
+        """Nothing to release; present for API compatibility"""
+
+    def _observation(self):
+        """Observations of every game"""
+        batch = self.batch
+        if self.obs_type == OBS_PIXELS:
+            return rasterize(batch.bird_y, batch.pipe_x, batch.pipe_top_height, batch.pipe_bottom_y, batch.pipe_active)
+
+        # The leftmost active pipe the bird has not passed yet is the next one
+        ahead = batch.pipe_active & (batch.pipe_x + PIPE_WIDTH >= BIRD_START_X)
+        has_next = ahead.any(axis=1)
+        slot = np.where(ahead, batch.pipe_x, np.iinfo(np.int64).max).argmin(axis=1)
+        rows = np.arange(self.num_envs)
+        frames_left = PIPE_SPAWN_INTERVAL - batch.frames_since_spawn
+        distance = np.where(has_next, batch.pipe_x[rows, slot], PIPE_X_START + PIPE_SPEED * frames_left) - BIRD_START_X
+        center = np.where(has_next, batch.pipe_gap_center[rows, slot], NO_GAP_CENTER)
+        return scale_features(np.stack([batch.bird_y, batch.bird_velocity, distance, center], axis=-1))
+
+
+""" Functions """
+def observation_space(obs_type, num_envs=None):
+    """Space of one observation of obs_type, or of num_envs stacked ones"""
+    batch_shape = () if num_envs is None else (num_envs,)
+    if obs_type == OBS_FEATURES:
+        return Box(-1.0, 1.0, batch_shape + (len(OBSERVATION_FEATURES),), np.float32)
+    if obs_type == OBS_PIXELS:
+        return Box(0, 255, batch_shape + (PIXEL_HEIGHT, PIXEL_WIDTH), np.uint8)
+    raise ValueError(f"Unknown observation type: {obs_type!r}")
+
+
+def scale_features(features):
+    """Scale raw (..., 4) features (pixels, pixels per frame) to float32 in about [-1, 1]"""
+    scaled = np.empty(features.shape, dtype=np.float32)
+    scaled[..., 0] = features[..., 0] / WINDOW_HEIGHT * 2 - 1
+    scaled[..., 1] = np.clip(features[..., 1] / VELOCITY_SCALE, -1, 1)
+    scaled[..., 2] = np.clip(features[..., 2] / WINDOW_WIDTH, -1, 1)
+    scaled[..., 3] = features[..., 3] / WINDOW_HEIGHT * 2 - 1
+    return scaled
+
+
+def rasterize(bird_y, pipe_x, pipe_top_height, pipe_bottom_y, pipe_active):
+    """Draw games as (n, PIXEL_HEIGHT, PIXEL_WIDTH) uint8 frames
+
+    Takes the bird heights as (n,) and the pipe slots as (n, slots)
+    arrays. Each output pixel samples the center of its PIXEL_SCALE
+    square of the window: background is 0, pipes PIXEL_PIPE and the bird
+    PIXEL_BIRD.
+    """
+    columns = (np.arange(PIXEL_WIDTH) + 0.5) * PIXEL_SCALE
+    rows = (np.arange(PIXEL_HEIGHT) + 0.5) * PIXEL_SCALE
+    frames = np.zeros((len(bird_y), PIXEL_HEIGHT, PIXEL_WIDTH), dtype=np.uint8)
+
+    for slot in range(pipe_x.shape[1]):
+        x = pipe_x[:, slot, None]
+        in_columns = pipe_active[:, slot, None] & (columns >= x) & (columns < x + PIPE_WIDTH)
+        in_rows = (rows < pipe_top_height[:, slot, None]) | (rows >= pipe_bottom_y[:, slot, None])
+        frames[in_rows[:, :, None] & in_columns[:, None, :]] = PIXEL_PIPE
+
+    # Same box as Bird.get_rect()
+    top = np.asarray(bird_y).astype(np.int64)[:, None]
+    bird_rows = (rows >= top) & (rows < top + BIRD_HEIGHT)
+    bird_columns = (columns >= BIRD_START_X) & (columns < BIRD_START_X + BIRD_WIDTH)
+    frames[bird_rows[:, :, None] & bird_columns[None, None, :]] = PIXEL_BIRD
+    return frames
@@ -0,0 +1,202 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Persistent run history: fixed-size records appended to a memory-mapped file"""
+
+import heapq
+import mmap
+import os
+import struct
+import threading
+from collections import namedtuple
+
+from FlappyPy.main import DEATH_PIPE, DEATH_GROUND
+
+
+""" Constants """
+# File layout: header, leaderboard (record indices, best first, -1 = empty), records
+HISTORY_MAGIC = b"FPHS"
+HISTORY_VERSION = 1
+LEADERBOARD_SIZE = 10
+HISTORY_HEADER = struct.Struct("<4sHHQ")  # magic, version, record size, record count
+LEADERBOARD = struct.Struct(f"<{LEADERBOARD_SIZE}q")
+RECORD = struct.Struct("<dIIQB7x")  # timestamp, score, frames, seed, death cause (32 bytes)
+RECORDS_OFFSET = HISTORY_HEADER.size + LEADERBOARD.size
+
+GROW_RECORDS = 4096  # The file grows by at least this many records at a time
+FLUSH_INTERVAL = 1.0  # Seconds between background writes
+FLUSH_BATCH = 256  # Write early once this many runs are waiting
+
+# Death causes as stored on disk (None = the game was quit)
+CAUSE_CODES = {None: 0, DEATH_PIPE: 1, DEATH_GROUND: 2}
+CAUSES = {code: cause for cause, code in CAUSE_CODES.items()}
+
+# One logged game
+RunRecord = namedtuple("RunRecord", ["timestamp", "score", "frames", "death_cause", "seed"])
+
+
+""" Classes """
+class RunHistory:
+    """Append-only log of every game, with a leaderboard kept in memory
+
+    append() is cheap enough for the frame loop: it updates the in-memory
+    top-LEADERBOARD_SIZE heap and queues the run, and a background thread
+    writes queued runs to the memory-mapped file in batches. The file
+    header keeps the record count and the leaderboard's record indices,
+    so opening a history reads only the header and the leaderboard
+    records, however long the history is.
+    """
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL):
+        """Open or create the history file at path and start the writer thread"""
+        self.path = path
+        self.flush_interval = flush_interval
+        self._pending = []
+        self._lock = threading.Lock()  # Guards the queued runs and the leaderboard
+        self._write_lock = threading.Lock()  # Guards the map, which moves when the file grows
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        size = os.fstat(self._file.fileno()).st_size
+        if size == 0:
+            self._file.write(HISTORY_HEADER.pack(HISTORY_MAGIC, HISTORY_VERSION, RECORD.size, 0))
+            self._file.write(LEADERBOARD.pack(*[-1] * LEADERBOARD_SIZE))
+            self._file.truncate(RECORDS_OFFSET + GROW_RECORDS * RECORD.size)
+        elif size < RECORDS_OFFSET:
+            self._file.close()
+            raise ValueError(f"{path} is truncated")
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+        magic, version, record_size, self.count = HISTORY_HEADER.unpack_from(self._map)
+        if magic != HISTORY_MAGIC or version != HISTORY_VERSION or record_size != RECORD.size:
+            self._close_file()
+            raise ValueError(f"{path} is not a FlappyPy run history")
+        if self.count > self.capacity:
+            self._close_file()
+            raise ValueError(f"{path} is truncated")
+        indices = [index for index in LEADERBOARD.unpack_from(self._map, HISTORY_HEADER.size) if index >= 0]
+        if any(index >= self.count for index in indices):
+            self._close_file()
+            raise ValueError(f"{path} has a corrupt leaderboard")
+
+        # Leaderboard: min-heap of (score, -index, index) so the lowest entry is evicted first
+        self._records = {index: self[index] for index in indices}
+        self._top = [(run.score, -index, index) for index, run in self._records.items()]
+        heapq.heapify(self._top)
+        self._logged = self.count  # Runs appended, written or not
+
+        self._wake = threading.Event()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="FlappyPy history", daemon=True)
+        self._writer.start()
+
+    @property
+    def capacity(self):
+        """Records the file can hold before it grows"""
+        return (len(self._map) - RECORDS_OFFSET) // RECORD.size
+
+    def __len__(self):
+        """Number of runs logged, including ones not written yet"""
+        with self._lock:
+            return self._logged
+
+    def __getitem__(self, index):
+        """The index-th run written to the file"""
+        if not 0 <= index < self.count:
+            raise IndexError("run index out of range")
+        with self._write_lock:
+            timestamp, score, frames, seed, cause = RECORD.unpack_from(self._map, RECORDS_OFFSET + index * RECORD.size)
+        return RunRecord(timestamp, score, frames, CAUSES.get(cause), seed)
+
+    def __iter__(self):
+        """Every run written to the file, oldest first"""
+        for index in range(self.count):
+            yield self[index]
+
+    def append(self, run):
+        """Log a RunRecord; it is written to disk in the background"""
+        with self._lock:
+            index = self._logged
+            self._logged += 1
+            self._pending.append(run)
+            entry = (run.score, -index, index)
+            if len(self._top) < LEADERBOARD_SIZE:
+                heapq.heappush(self._top, entry)
+                self._records[index] = run
+            elif entry > self._top[0]:
+                evicted = heapq.heapreplace(self._top, entry)
+                del self._records[evicted[2]]
+                self._records[index] = run
+            if len(self._pending) >= FLUSH_BATCH:
+                self._wake.set()
+
+    def leaderboard(self):
+        """The best runs, highest score first (earlier runs win ties)"""
+        with self._lock:
+            return [self._records[index] for _, _, index in sorted(self._top, reverse=True)]
+
+    def personal_best(self):
+        """The best run so far, or None for an empty history"""
+        with self._lock:
+            if not self._top:
+                return None
+            return self._records[max(self._top)[2]]
+
+    def flush(self):
+        """Write every queued run to the file now"""
+        with self._write_lock:
+            with self._lock:
+                runs, self._pending = self._pending, []
+                leaderboard = [index for _, _, index in sorted(self._top, reverse=True)]
+            if not runs:
+                return
+
+            if self.count + len(runs) > self.capacity:
+                self._grow(self.count + len(runs))
+            offset = RECORDS_OFFSET + self.count * RECORD.size
+            for run in runs:
+                RECORD.pack_into(self._map, offset, run.timestamp, run.score, run.frames, run.seed,
+                                 CAUSE_CODES[run.death_cause])
+                offset += RECORD.size
+
+            # Publish the records before the header points at them
+            leaderboard += [-1] * (LEADERBOARD_SIZE - len(leaderboard))
+            self.count += len(runs)
+            LEADERBOARD.pack_into(self._map, HISTORY_HEADER.size, *leaderboard)
+            HISTORY_HEADER.pack_into(self._map, 0, HISTORY_MAGIC, HISTORY_VERSION, RECORD.size, self.count)
+            self._map.flush()
+
+    def close(self):
+        """Write what is queued, stop the writer thread and close the file"""
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._writer.join()
+        self.flush()
+        self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _write_loop(self):
+        """Writer thread: flush every flush_interval seconds or when a batch is full"""
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _grow(self, needed):
+        """Enlarge the file and remap it to hold at least needed records"""
+        capacity = max(needed, self.capacity * 2, GROW_RECORDS)
+        self._map.close()
+        self._file.truncate(RECORDS_OFFSET + capacity * RECORD.size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+    def _close_file(self):
+        """Release the map and the file"""
+        self._map.close()
+        self._file.close()
@@ -5,21 +5,33 @@
 """ Packages and Libraries"""
 import warnings
 import random
+import array
+import struct
 import pygame
+import os
 import sys
-import pygame
 import importlib.resources as resources
-from pathlib import Path
+import logging
+import threading
+import time
 
 # Suppress Pygame warnings
 warnings.filterwarnings("ignore", category=UserWarning, module="pygame.pkgdata")
 
+logger = logging.getLogger(__name__)
+
 
 """ Constants """
 # Game constants
 WINDOW_WIDTH = 400
 WINDOW_HEIGHT = 600
-FPS = 60
+FPS = 60  # Simulation ticks per second
+RENDER_FPS = FPS  # Frames drawn per second (0 = uncapped)
+DIRTY_RECTS = True  # Only push changed screen areas (False = full flip every frame)
+IDLE_FPS = 30  # Event polling rate while the game over screen is shown
+REPLAY_DIR = None  # Directory to save a replay of every game in (None = don't save)
+HISTORY_PATH = None  # Run history file logging every game (None = don't log)
+STARTUP_WORKERS = 4  # Threads loading assets while the window opens
 BACKGROUND_COLOR = (135, 206, 235)  # Sky blue
 
 # Bird constants
@@ -35,16 +47,55 @@ PIPE_WIDTH = 70
 PIPE_COLOR = (0, 128, 0)  # Green
 PIPE_GAP = 150  # Gap between top and bottom pipes
 PIPE_X_START = WINDOW_WIDTH  # Start just off-screen right
+PIPE_SPEED = 3  # Pixels per frame
 
 # Pipe generation
 PIPE_SPAWN_INTERVAL = 120 # Frames between pipe spawns (~2s at 60 FPS)
 SAFE_MARGIN = 80 # Keeps gaps fully within the screen
+GAP_CENTER_MIN = SAFE_MARGIN + PIPE_GAP // 2
+GAP_CENTER_MAX = WINDOW_HEIGHT - SAFE_MARGIN - PIPE_GAP // 2
+
+# Most pipes that can be on screen at once, plus one spare slot
+PIPE_POOL_CAPACITY = -(-(PIPE_X_START + PIPE_WIDTH) // (PIPE_SPEED * PIPE_SPAWN_INTERVAL)) + 1
+
+# Asset files
+IMAGE_FILES = ["bird.png", "bird-spaced.png"]
+SOUND_FILES = ["bird.mp3", "score.mp3", "gameover.mp3"]
+MUSIC_FILES = ["music.mp3"]
+
+# Sprite atlas names
+SPRITE_BIRD_FALLING = "bird_falling"
+SPRITE_BIRD_FLYING = "bird_flying"
+SPRITE_PIPE = "pipe"
+
+# Simulation actions
+ACTION_NONE = 0     # No input this frame
+ACTION_FLAP = 1     # Spacebar pressed
+ACTION_RELEASE = 2  # Spacebar released
+
+# Simulation events
+EVENT_FLAP = "flap"
+EVENT_SCORE = "score"
+EVENT_GAME_OVER = "game_over"
+
+# Causes of death
+DEATH_PIPE = "pipe"
+DEATH_GROUND = "ground"
+
+# Save states: a header, one record per pipe, then the random generator's
+# state when the simulation draws gaps from it
+SNAPSHOT_HEADER = struct.Struct("<4d?I?BHII?B")  # bird, score, game over, cause, spawn timer, spawns, frame, RNG?, pipes
+SNAPSHOT_PIPE = struct.Struct("<hhH?")  # x, previous x, gap center, scored
+SNAPSHOT_RNG = struct.Struct("<625Id")  # Mersenne Twister words and position, gauss_next (NaN for None)
+SNAPSHOT_CAUSES = (None, DEATH_PIPE, DEATH_GROUND)
 
 
 """ Classes """
 # Score class
 class Score:
     """Manages the player's score"""
+
+    __slots__ = ("current_score",)
     
     def __init__(self):
         """Initialize score to zero"""
@@ -57,73 +108,157 @@ class Score:
     def add_point(self):
         """Increment the score by one point"""
         self.current_score += 1
+
+    def snapshot(self):
+        """The score, for restore()"""
+        return self.current_score
+
+    def restore(self, snapshot):
+        """Go back to a score from snapshot()"""
+        self.current_score = snapshot
     
 # Pipe class
 class Pipe:
-    """Class representing pipes as obstacles in the game"""
+    """Class representing pipes as obstacles in the game
+
+    The collision rectangles are the only record of the pipe's shape:
+    top_height, bottom_y and bottom_height are read from them.
+    """
+
+    __slots__ = ("x", "previous_x", "gap_center_y", "scored", "top_rect", "bottom_rect")
+
+    # Shared by every pipe
+    width = PIPE_WIDTH
+    gap_size = PIPE_GAP
+    speed = PIPE_SPEED
     
     def __init__(self, x, gap_center_y):
+        # Collision rectangles, moved in place instead of rebuilt
+        self.top_rect = pygame.Rect(0, 0, self.width, 0)
+        self.bottom_rect = pygame.Rect(0, 0, self.width, 0)
+        self.reset(x, gap_center_y)
+    
+    def reset(self, x, gap_center_y):
+        """Place the pipe at x with a new gap, as if freshly built"""
         self.x = x
-        self.width = PIPE_WIDTH
         self.gap_center_y = gap_center_y
-        self.gap_size = PIPE_GAP
         self.scored = False
-        self.speed = 3  # Pixels per frame
+        self.previous_x = x  # Position before the last update, for interpolation
         
         # Calculate pipe hights
-        self.top_height = gap_center_y - (self.gap_size // 2)
-        self.bottom_y = gap_center_y + (self.gap_size // 2)
-        self.bottom_height = WINDOW_HEIGHT - self.bottom_y
+        top_height = gap_center_y - (self.gap_size // 2)
+        bottom_y = gap_center_y + (self.gap_size // 2)
+
+        # Reshape the collision rectangles
+        self.top_rect.x = x
+        self.top_rect.height = top_height
+        self.bottom_rect.x = x
+        self.bottom_rect.y = bottom_y
+        self.bottom_rect.height = WINDOW_HEIGHT - bottom_y
+
+    @property
+    def top_height(self):
+        """Height of the top pipe"""
+        return self.top_rect.height
+
+    @property
+    def bottom_y(self):
+        """Top edge of the bottom pipe"""
+        return self.bottom_rect.y
+
+    @property
+    def bottom_height(self):
+        """Height of the bottom pipe"""
+        return self.bottom_rect.height
     
     def update(self):
         """Move pipe from right to left"""
+        self.previous_x = self.x
         self.x -= self.speed
+        self.top_rect.x = self.x
+        self.bottom_rect.x = self.x
+
+    def snapshot(self):
+        """Tuple of everything that changes, for restore()"""
+        return (self.x, self.previous_x, self.gap_center_y, self.scored)
+
+    def restore(self, snapshot):
+        """Put the pipe back as it was at snapshot()"""
+        x, previous_x, gap_center_y, scored = snapshot
+        self.reset(x, gap_center_y)
+        self.previous_x = previous_x
+        self.scored = scored
     
-    def draw(self, screen):
-        """Draw both top and bottom pipes"""
-        pygame.draw.rect(screen, PIPE_COLOR, (self.x, 0, self.width, self.top_height))  # Top pipe
-        pygame.draw.rect(screen, PIPE_COLOR, (self.x, self.bottom_y, self.width, self.bottom_height))  # Bottom pipe
+    def draw(self, screen, alpha=1.0):
+        """Draw both top and bottom pipes, alpha of the way from the previous position
+
+        Returns the screen area covered by the two pipes.
+        """
+        x = self.previous_x + (self.x - self.previous_x) * alpha
+        top = pygame.draw.rect(screen, PIPE_COLOR, (x, 0, self.width, self.top_height))  # Top pipe
+        bottom = pygame.draw.rect(screen, PIPE_COLOR, (x, self.bottom_y, self.width, self.bottom_height))  # Bottom pipe
+        return top.union(bottom)
+
+    def blit_items(self, atlas, alpha=1.0):
+        """Blit tuples drawing both pipes from the pre-rendered pipe body in atlas"""
+        x = int(self.previous_x + (self.x - self.previous_x) * alpha)
+        return [
+            atlas.item(SPRITE_PIPE, (x, 0), self.top_height),  # Top pipe
+            atlas.item(SPRITE_PIPE, (x, self.bottom_y), self.bottom_height),  # Bottom pipe
+        ]
 
 # Bird class
 class Bird:
-    """Class representing the bird in the game"""
+    """Class representing the bird in the game
+
+    x and y are the only record of the bird's position; rect and the
+    collision box are derived from them.
+    """
+
+    __slots__ = ("x", "y", "previous_y", "velocity", "is_flying", "falling_sprite", "flying_sprite", "_hitbox")
+
+    # Shared by every bird
+    width = BIRD_WIDTH
+    height = BIRD_HEIGHT
+    gravity = BIRD_GRAVITY
 
     def __init__(self):
         self.x = BIRD_START_X
         self.y = BIRD_START_Y
-        self.width = BIRD_WIDTH
-        self.height = BIRD_HEIGHT
+        self.previous_y = self.y  # Position before the last update, for interpolation
         self.velocity = 0
-        self.gravity = BIRD_GRAVITY
+        self._hitbox = pygame.Rect(0, 0, self.width, self.height)  # Scratch collision box, refreshed before each test
 
         # Load bird images
-        self.falling_sprite = load_image("bird.png")
-        self.flying_sprite = load_image("bird-spaced.png")
+        self.falling_sprite = asset_manager.image("bird.png")
+        self.flying_sprite = asset_manager.image("bird-spaced.png")
 
         # Track current state
         self.is_flying = False
-        self.current_sprite = self.falling_sprite
-        
-        # Position and collision
-        self.rect = self.current_sprite.get_rect()
-        self.rect.x = int(self.x)
-        self.rect.y = int(self.y)
+
+    @property
+    def current_sprite(self):
+        """Sprite for the current flapping state"""
+        return self.flying_sprite if self.is_flying else self.falling_sprite
+
+    @property
+    def rect(self):
+        """Area covered by the current sprite"""
+        return self.current_sprite.get_rect(topleft=(int(self.x), int(self.y)))
 
     def flap(self):
         """Call this when spacebar is pressed"""
         self.is_flying = True
-        self.current_sprite = self.flying_sprite
     
     def stop_flapping(self):
         """Call this when spacebar is released"""
         self.is_flying = False
-        self.current_sprite = self.falling_sprite
     
     def update(self):
         """Update the bird's position based on physics"""
+        self.previous_y = self.y
         self.velocity += self.gravity
         self.y += self.velocity
-        self.rect.y = int(self.y)
         self.check_boundaries()
     
     def check_boundaries(self):
@@ -131,31 +266,49 @@ class Bird:
         # Top boundary
         if self.y < 0:
             self.y = 0
-            self.rect.y = 0
             self.velocity = 0
     
-    def draw(self, screen):
-        """Draw the bird on the screen"""
-        screen.blit(self.current_sprite, self.rect)
+    def draw(self, screen, alpha=1.0):
+        """Draw the bird on the screen, alpha of the way from the previous position
+
+        Returns the screen area covered by the sprite.
+        """
+        y = self.previous_y + (self.y - self.previous_y) * alpha
+        return screen.blit(self.current_sprite, (int(self.x), int(y)))
+
+    def blit_item(self, atlas, alpha=1.0):
+        """Blit tuple drawing the current bird frame from atlas"""
+        y = self.previous_y + (self.y - self.previous_y) * alpha
+        name = SPRITE_BIRD_FLYING if self.is_flying else SPRITE_BIRD_FALLING
+        return atlas.item(name, (int(self.x), int(y)))
     
     def jump(self):
         """Make the bird jump up"""
         self.velocity = BIRD_JUMP_STRENGTH
 
+    def snapshot(self):
+        """Tuple of everything that changes, for restore()"""
+        return (self.x, self.y, self.previous_y, self.velocity, self.is_flying)
+
+    def restore(self, snapshot):
+        """Put the bird back as it was at snapshot()"""
+        self.x, self.y, self.previous_y, self.velocity, self.is_flying = snapshot
+
     def get_rect(self):
         """Get bird's collision rectangle for collision detection"""
         return pygame.Rect(self.x, self.y, self.width, self.height)
     
     def check_collision_with_pipe(self, pipe):
-        """Check if the bird collides with a pipe"""
-        bird_rect = self.get_rect()
+        """Check if the bird collides with a pipe (without building any Rect)"""
+        # Same box as get_rect(), refreshed in place
+        bird_rect = self._hitbox
+        bird_rect.x = int(self.x)
+        bird_rect.y = int(self.y)
         
-        top_pipe_rect = pygame.Rect(pipe.x, 0, pipe.width, pipe.top_height)
-        if bird_rect.colliderect(top_pipe_rect):
+        if bird_rect.colliderect(pipe.top_rect):
             return True
         
-        bottom_pipe_rect = pygame.Rect(pipe.x, pipe.bottom_y, pipe.width, pipe.bottom_height)
-        if bird_rect.colliderect(bottom_pipe_rect):
+        if bird_rect.colliderect(pipe.bottom_rect):
             return True
         
         return False
@@ -168,22 +321,425 @@ class Bird:
         """Check if bird has hit the top boundary (ceiling)"""
         return self.y <= 0
 
+# Asset manager class
+class AssetManager:
+    """Loads each image, sound and music file once and keeps it for the whole process
+
+    hits counts requests served from memory and misses counts requests
+    that had to resolve and read a file.
+    """
+
+    def __init__(self):
+        """Start with an empty cache"""
+        self.images = {}       # filename -> (surface, converted for the display)
+        self.sounds = {}       # filename -> (sound, mixer settings it was loaded with)
+        self.music_paths = {}  # filename -> resolved path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()  # Assets may be loaded from worker threads
+        self._image_locks = {}  # filename -> lock held while that image is loaded or converted
+
+    def _count(self, hit):
+        """Record a cache hit or miss"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def image(self, filename):
+        """Return the decoded image, converted once a display exists
+
+        Worker threads only decode: the conversion for the window happens
+        on the main thread, the next time it asks for the image.
+        """
+        with self._lock:
+            image_lock = self._image_locks.setdefault(filename, threading.Lock())
+        convert = pygame.display.get_surface() is not None and threading.current_thread() is threading.main_thread()
+        # Other images keep loading in parallel; only requests for this one wait
+        with image_lock:
+            cached = self.images.get(filename)
+            if cached is None:
+                self._count(hit=False)
+                image = load_image(filename, convert=False)
+            else:
+                self._count(hit=True)
+                image, converted = cached
+                if converted or not convert:
+                    return image
+            if convert:
+                # Also for images decoded before the window opened or by a worker: no file is read again
+                image = image.convert_alpha()
+            self.images[filename] = (image, convert)
+            return image
+
+    def sound(self, filename):
+        """Return the sound effect, reloaded only if the mixer was re-initialized"""
+        mixer_settings = pygame.mixer.get_init()
+        cached = self.sounds.get(filename)
+        if cached is not None and cached[1] == mixer_settings:
+            self._count(hit=True)
+            return cached[0]
+        self._count(hit=False)
+        sound = load_sound(filename)
+        self.sounds[filename] = (sound, mixer_settings)
+        return sound
+
+    def music(self, filename):
+        """Return the resolved path of a music file"""
+        if filename in self.music_paths:
+            self._count(hit=True)
+            return self.music_paths[filename]
+        self._count(hit=False)
+        path = load_music(filename)
+        self.music_paths[filename] = path
+        return path
+
+    def preload(self):
+        """Load every game asset up front so later requests are all hits"""
+        for filename in IMAGE_FILES:
+            self.image(filename)
+        if pygame.mixer.get_init():
+            for filename in SOUND_FILES:
+                self.sound(filename)
+        for filename in MUSIC_FILES:
+            self.music(filename)
+
+    def clear(self):
+        """Forget every cached asset"""
+        self.images.clear()
+        self.sounds.clear()
+        self.music_paths.clear()
+
+# Pipe pool class
+class PipePool:
+    """Fixed-capacity ring buffer of reusable Pipe objects, oldest (leftmost) first
+
+    All pipes move at the same speed, so they leave the screen in the order
+    they were spawned: spawning fills the slot after the newest pipe and
+    despawning just advances the head. Slots keep their Pipe objects, so a
+    running game never builds new pipes or lists.
+    """
+
+    def __init__(self, capacity=PIPE_POOL_CAPACITY):
+        """Preallocate capacity pipes"""
+        self.capacity = capacity
+        self.slots = [Pipe(PIPE_X_START, GAP_CENTER_MIN) for _ in range(capacity)]
+        self.head = 0   # Slot of the oldest live pipe
+        self.count = 0  # Number of live pipes
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for offset in range(self.count):
+            yield self.slots[(self.head + offset) % self.capacity]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("pipe index out of range")
+        return self.slots[(self.head + index) % self.capacity]
+
+    def spawn(self, x, gap_center_y):
+        """Reuse the next free slot for a new pipe and return it"""
+        if self.count == self.capacity:
+            self._grow()
+        pipe = self.slots[(self.head + self.count) % self.capacity]
+        pipe.reset(x, gap_center_y)
+        self.count += 1
+        return pipe
+
+    def append(self, pipe):
+        """Add an existing pipe to the right of the others"""
+        if self.count == self.capacity:
+            self._grow()
+        self.slots[(self.head + self.count) % self.capacity] = pipe
+        self.count += 1
+
+    def drop_oldest(self, count=1):
+        """Despawn the count leftmost pipes"""
+        self.head = (self.head + count) % self.capacity
+        self.count -= count
+
+    def clear(self):
+        """Despawn every pipe"""
+        self.head = 0
+        self.count = 0
+
+    def _grow(self):
+        """Double the capacity (only when more pipes are added than the game spawns)"""
+        live = list(self)
+        spare = [Pipe(PIPE_X_START, GAP_CENTER_MIN) for _ in range(self.capacity)]
+        self.slots = live + spare
+        self.capacity *= 2
+        self.head = 0
+
+# Game state class
+class GameState:
+    """Everything that changes while a game is being played"""
+
+    def __init__(self):
+        """Initialize a fresh game"""
+        self.bird = Bird()
+        self.pipes = PipePool()
+        self.score = Score()
+        self.game_over = False
+        self.death_cause = None
+        self.frames_since_spawn = 0
+        self.spawn_count = 0
+        self.frame = 0
+
+# Simulation class
+class Simulation:
+    """Headless game rules: no window, no mixer, no clock"""
+
+    def __init__(self, seed=None, rng=None, gap_centers=None):
+        """Create the simulation and start a new game
+
+        Each simulation owns its random generator, seeded with seed, so
+        games can be reproduced. When gap_centers is given (for example
+        from generate_gap_centers()) pipes follow that course instead,
+        wrapping around when it runs out.
+        """
+        self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
+        self.gap_centers = gap_centers
+        self.state = GameState()
+        self.events = []  # Reused by every step()
+
+    def reset(self, seed=None):
+        """Start a new game, optionally reseeding it, and return its state"""
+        if seed is not None:
+            self.seed = seed
+            self.rng.seed(seed)
+        self.state = GameState()
+        return self.state
+
+    def apply_action(self, action):
+        """Apply a player input without advancing time and return its events"""
+        events = []
+        self._apply_action(action, events)
+        return events
+
+    def _apply_action(self, action, events):
+        """Apply a player input, appending its events to events"""
+        state = self.state
+        if state.game_over:
+            return
+        if action == ACTION_FLAP:
+            state.bird.flap()
+            state.bird.jump()
+            events.append(EVENT_FLAP)
+        elif action == ACTION_RELEASE:
+            state.bird.stop_flapping()
+
+    def step(self, action=ACTION_NONE):
+        """Apply an action, advance the game by one frame and return (state, events)
+
+        The events list is reused by the next step(); copy it to keep it.
+        Each part of the frame is a method of its own, so a subclass such
+        as the profiler's can wrap them without copying the rules.
+        """
+        state = self.state
+        events = self.events
+        events.clear()
+        if state.game_over:
+            return state, events
+
+        self._apply_action(action, events)
+        self._update_bird()
+        expired = self._update_pipes(events)
+        self._check_ground(events)
+        self._advance_course(expired)
+        return state, events
+
+    def _update_bird(self):
+        """Move the bird"""
+        self.state.bird.update()
+
+    def _update_pipes(self, events):
+        """Move, collide, score and count the expired pipes in one pass; return the expired count"""
+        state = self.state
+        bird = state.bird
+        bird_left = bird.x
+        bird_right = bird.x + bird.width
+
+        # One pass over the pipes, oldest first: move, collide, score and
+        # count the ones that have left the screen
+        pipes = state.pipes
+        slots = pipes.slots
+        index = pipes.head
+        expired = 0
+        for offset in range(pipes.count):
+            pipe = slots[index]
+            index = (index + 1) % pipes.capacity
+
+            # Update the pipe movement
+            pipe.update()
+            if pipe.x + pipe.width <= 0 and expired == offset:
+                expired += 1
+
+            # After a collision the remaining pipes only move
+            if state.game_over:
+                continue
+
+            # Broadphase: only a pipe level with the bird can hit it
+            if pipe.x < bird_right and pipe.x + pipe.width > bird_left:
+                if bird.check_collision_with_pipe(pipe):
+                    self._end_game(events, DEATH_PIPE)
+
+            # Check if bird has passed through this pipe
+            elif bird.x > pipe.x + pipe.width and not pipe.scored:
+                pipe.scored = True
+                state.score.add_point()
+                events.append(EVENT_SCORE)
+        return expired
+
+    def _check_ground(self, events):
+        """End the game if the bird hit the ground"""
+        state = self.state
+        if not state.game_over and state.bird.check_collision_with_ground():
+            self._end_game(events, DEATH_GROUND)
+
+    def _advance_course(self, expired):
+        """Remove the expired pipes, spawn new ones on time and count the frame"""
+        state = self.state
+        pipes = state.pipes
+
+        # Remove off-screen pipes
+        if expired:
+            pipes.drop_oldest(expired)
+
+        # Pipe spawning logic
+        state.frames_since_spawn += 1
+        if state.frames_since_spawn >= PIPE_SPAWN_INTERVAL:
+            state.frames_since_spawn = 0
+            pipes.spawn(PIPE_X_START, self.next_gap_center())
+            state.spawn_count += 1
+
+        state.frame += 1
+
+    def snapshot(self):
+        """Pack the whole game into bytes for restore()
+
+        Only the header has a fixed size: SNAPSHOT_HEADER is followed by one
+        SNAPSHOT_PIPE per live pipe (the header holds the count), then by
+        SNAPSHOT_RNG when the simulation draws gaps from its generator. That
+        is about 70 bytes plus 7 per pipe, but the generator state adds
+        about 2.5 kB and dominates the snapshots of seeded games. Games on
+        gap_centers never use the generator and leave it out, so prefer them
+        where many snapshots are kept, as in rollback.
+        """
+        state = self.state
+        with_rng = self.gap_centers is None
+        pipes = state.pipes
+        data = bytearray(SNAPSHOT_HEADER.size + len(pipes) * SNAPSHOT_PIPE.size)
+        SNAPSHOT_HEADER.pack_into(
+            data, 0, *state.bird.snapshot(), state.score.snapshot(), state.game_over,
+            SNAPSHOT_CAUSES.index(state.death_cause), state.frames_since_spawn, state.spawn_count, state.frame,
+            with_rng, len(pipes),
+        )
+        offset = SNAPSHOT_HEADER.size
+        for pipe in pipes:
+            SNAPSHOT_PIPE.pack_into(data, offset, *pipe.snapshot())
+            offset += SNAPSHOT_PIPE.size
+        if with_rng:
+            _, words, gauss_next = self.rng.getstate()
+            data += SNAPSHOT_RNG.pack(*words, float("nan") if gauss_next is None else gauss_next)
+        return bytes(data)
+
+    def restore(self, snapshot):
+        """Go back to the game packed by snapshot(), reusing the current objects
+
+        The snapshot must come from the same kind of game: seeded games and
+        games on gap_centers draw their pipes differently, so restoring one
+        into the other raises ValueError and leaves the game unchanged.
+        """
+        header = SNAPSHOT_HEADER.unpack_from(snapshot)
+        with_rng = header[-2]
+        if with_rng != (self.gap_centers is None):
+            kinds = ("a game on gap_centers", "a seeded game")
+            raise ValueError(f"Cannot restore a snapshot of {kinds[with_rng]} into {kinds[not with_rng]}")
+        state = self.state
+        (x, y, previous_y, velocity, is_flying, score, state.game_over, cause, state.frames_since_spawn,
+         state.spawn_count, state.frame, _, count) = header
+        state.bird.restore((x, y, previous_y, velocity, is_flying))
+        state.score.restore(score)
+        state.death_cause = SNAPSHOT_CAUSES[cause]
+        pipes = state.pipes
+        pipes.clear()
+        offset = SNAPSHOT_HEADER.size
+        for _ in range(count):
+            pipes.spawn(0, 0).restore(SNAPSHOT_PIPE.unpack_from(snapshot, offset))
+            offset += SNAPSHOT_PIPE.size
+        if with_rng:
+            *words, gauss_next = SNAPSHOT_RNG.unpack_from(snapshot, offset)
+            self.rng.setstate((3, tuple(words), None if gauss_next != gauss_next else gauss_next))  # NaN: None
+
+    def next_gap_center(self):
+        """Pick the gap center of the next pipe"""
+        if self.gap_centers is not None:
+            return self.gap_centers[self.state.spawn_count % len(self.gap_centers)]
+        return self.rng.randint(GAP_CENTER_MIN, GAP_CENTER_MAX)
+
+    def _end_game(self, events, cause):
+        """Mark the game as over"""
+        self.state.game_over = True
+        self.state.death_cause = cause
+        events.append(EVENT_GAME_OVER)
+
+
+# Assets shared by every Bird and game session in this process
+asset_manager = AssetManager()
+
 
 """ Functions """
-def load_image(filename: str) -> pygame.Surface:
-    """Load image files"""
+def _convert_image(image: pygame.Surface) -> pygame.Surface:
+    """Convert an image for fast blitting when a display is available"""
+    if pygame.display.get_surface() is None:
+        # Headless: there is no pixel format to convert to
+        return image
+    return image.convert_alpha()
+
+def generate_gap_centers(seed, count: int) -> array.array:
+    """Pregenerate the gap centers of a course as a compact array
+
+    The values are the same ones Simulation(seed=seed) would draw.
+    """
+    rng = random.Random(seed)
+    return array.array("H", (rng.randint(GAP_CENTER_MIN, GAP_CENTER_MAX) for _ in range(count)))
+
+def build_sprite_atlas() -> "SpriteAtlas":
+    """Pack the bird frames into one atlas page and pre-render the pipe body"""
+    from FlappyPy.rendering import SpriteAtlas
+
+    # A full-height pipe body; shorter pipes blit only its top part
+    pipe_body = pygame.Surface((PIPE_WIDTH, WINDOW_HEIGHT))
+    pipe_body.fill(PIPE_COLOR)
+    
+    return SpriteAtlas(
+        {
+            SPRITE_BIRD_FALLING: asset_manager.image("bird.png"),
+            SPRITE_BIRD_FLYING: asset_manager.image("bird-spaced.png"),
+        },
+        opaque={SPRITE_PIPE: pipe_body},
+    )
+
+def load_image(filename: str, convert: bool = True) -> pygame.Surface:
+    """Load image files (converted for the display unless convert is False)"""
     try:
         if sys.version_info >= (3, 10):
             # For Python 3.10+
-            import importlib.resources as resources
             ref = resources.files("FlappyPy.assets.images") / filename
             with resources.as_file(ref) as image_path:
-                return pygame.image.load(image_path).convert_alpha()
+                image = pygame.image.load(image_path)
         else:
             # For Python 3.9
-            import importlib.resources as resources
             with resources.path("FlappyPy.assets.images", filename) as image_path:
-                return pygame.image.load(image_path).convert_alpha()
+                image = pygame.image.load(image_path)
+        return _convert_image(image) if convert else image
     except (FileNotFoundError, ImportError, AttributeError, TypeError):
         # Create mock surface for testing environments
         mock_surface = pygame.Surface((32, 32))
@@ -195,13 +751,11 @@ def load_sound(filename: str) -> pygame.mixer.Sound:
     try:
         if sys.version_info >= (3, 10):
             # For Python 3.10+
-            import importlib.resources as resources
             ref = resources.files("FlappyPy.assets.sounds") / filename
             with resources.as_file(ref) as sound_path:
                 return pygame.mixer.Sound(sound_path)
         else:
             # For Python 3.9
-            import importlib.resources as resources
             with resources.path("FlappyPy.assets.sounds", filename) as sound_path:
                 return pygame.mixer.Sound(sound_path)
     except (FileNotFoundError, ImportError, AttributeError, TypeError):
@@ -213,22 +767,37 @@ def load_music(filename: str) -> str:
     try:
         if sys.version_info >= (3, 10):
             # For Python 3.10+
-            import importlib.resources as resources
             ref = resources.files("FlappyPy.assets.sounds") / filename
             with resources.as_file(ref) as music_path:
                 return str(music_path)
         else:
             # For Python 3.9
-            import importlib.resources as resources
             with resources.path("FlappyPy.assets.sounds", filename) as music_path:
                 return str(music_path)
     except (FileNotFoundError, ImportError, AttributeError, TypeError):
         return None
 
-def show_game_over_screen(screen, font, score):
-    """Display game over message and final score on screen"""
-    # Clear screen with black background
-    screen.fill((0, 0, 0))
+def load_font() -> pygame.font.Font:
+    """Start the font module and load the game font"""
+    pygame.font.init()
+    return pygame.font.Font(None, 36)
+
+def init_audio():
+    """Start the mixer and load the sound effects and music"""
+    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
+    for filename in SOUND_FILES:
+        asset_manager.sound(filename)
+    for filename in MUSIC_FILES:
+        asset_manager.music(filename)
+
+def build_game_over_screen(font, score, best_score=None):
+    """Compose the game over message and final score once as a full-window surface
+
+    The personal best is shown too when best_score is given.
+    """
+    # Black background
+    overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    overlay.fill((0, 0, 0))
     
     # Create game over text
     game_over_text = font.render("Game Over", True, (255, 0, 0))  # Red text
@@ -240,160 +809,286 @@ def show_game_over_screen(screen, font, score):
     score_rect = score_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2))
     restart_rect = restart_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 50))
     
-    # Draw all text to screen
-    screen.blit(game_over_text, game_over_rect)
-    screen.blit(score_text, score_rect)
-    screen.blit(restart_text, restart_rect)
-    
-    # Update display
-    pygame.display.flip()
+    # Draw all text on the overlay
+    overlay.blit(game_over_text, game_over_rect)
+    overlay.blit(score_text, score_rect)
+    overlay.blit(restart_text, restart_rect)
 
-def main():
-    """ Main Game Function """
-    
-    # Initialize Pygame
-    pygame.init()
-    pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-    font = pygame.font.Font(None, 36)
+    if best_score is not None:
+        best_text = font.render(f"Best Score: {best_score}", True, (255, 215, 0))  # Gold text
+        overlay.blit(best_text, best_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT//2 + 100)))
+    return overlay
+
+def show_game_over_screen(screen, font, score, overlay=None):
+    """Draw the game over message and final score on screen
+
+    Pass the surface from build_game_over_screen() to skip rendering the
+    text again. The caller presents the frame.
+    """
+    if overlay is None:
+        overlay = build_game_over_screen(font, score)
+    return screen.blit(overlay, (0, 0))
+
+def draw_frame(screen, renderer, atlas, text_cache, state, alpha=1.0, extra=()):
+    """Draw the pipes, bird and score, alpha of the way between the last two ticks
+
+    extra holds more (surface, position) blits drawn on top, such as an
+    overlay. The caller presents the frame with renderer.present().
+    """
+    # Erase last frame's moving parts (or the whole screen)
+    renderer.begin_frame()
+
+    # Collect the pipes, bird and score
+    sprites = []
+    for pipe in state.pipes:
+        sprites += pipe.blit_items(atlas, alpha)
+    sprites.append(state.bird.blit_item(atlas, alpha))
+    score_text = text_cache.render(f"Score: {state.score.get_current_score()}", True, (255, 255, 255))
+    sprites.append((score_text, (10, 10)))  # Position at top-left corner
+    sprites += extra
+
+    # Draw them all in one batch
+    for rect in screen.blits(sprites):
+        renderer.add(rect)
+
+async def run_game(render_fps=RENDER_FPS, dirty_rects=DIRTY_RECTS, replay_dir=REPLAY_DIR,
+                   history_path=HISTORY_PATH, profiler=None):
+    """ Main Game Coroutine: plays until the window is closed
+
+    It yields to the event loop between frames instead of sleeping the
+    thread, and file I/O (asset loading, saving replays) runs on worker
+    threads, so other coroutines such as telemetry can share the loop
+    without adding frame jitter.
+
+    The game rules always advance at FPS ticks per second; render_fps only
+    caps how often the screen is redrawn (0 draws as fast as possible).
+    dirty_rects=False falls back to a full-screen flip every frame.
+    Every game is recorded, and saved as a replay file in replay_dir when
+    one is given. With a history_path, every game is logged to that run
+    history and the game over screen shows the personal best.
+    A FrameProfiler times each phase of every frame while a game is
+    played; without one the loop does no timing at all.
+    """
+    # Imported here: only the game loop needs these, and headless users of
+    # Simulation should not pay for them
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+    from FlappyPy.timing import FixedTimestep, FramePacer
+    from FlappyPy.rendering import Renderer, TextCache
+
+    # Imported here: these modules build on this one
+    from FlappyPy.replay import ReplayRecorder, new_seed, replay_path
+    from FlappyPy.history import RunHistory, RunRecord
+    if profiler is not None:
+        from FlappyPy.profiling import (
+            ProfiledSimulation, PHASE_EVENTS, PHASE_GAME, PHASE_RENDER, PHASE_PRESENT, PHASE_IDLE,
+        )
+
+    loop = asyncio.get_running_loop()
+    saving = set()  # Replays being written in the background
+
+    # Persistent run log (opening it reads only its header and leaderboard)
+    history = RunHistory(history_path) if history_path is not None else None
+
+    def save_replay(replay):
+        """Write a replay file (on a worker thread)"""
+        os.makedirs(replay_dir, exist_ok=True)
+        replay.save(replay_path(replay_dir, replay))
+        logger.info("Saved %s", replay)
+
+    def replay_saved(task):
+        """Log a failed save as soon as it fails (the game goes on without it)"""
+        saving.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Could not save the replay: %s", task.exception())
+
+    def finish_game(state):
+        """Save the replay and log the run of the game that just ended"""
+        if replay_dir is not None:
+            task = loop.run_in_executor(None, save_replay, recorder.finish(state))
+            saving.add(task)
+            task.add_done_callback(replay_saved)
+        if history is not None:
+            history.append(RunRecord(
+                time.time(), state.score.get_current_score(), state.frame, state.death_cause, recorder.seed
+            ))
     
-    # Create the game window
-    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-    pygame.display.set_caption("FlappyPy")
+    # Open the window while the font, audio and images load on worker threads
+    pygame.display.init()
+    with ThreadPoolExecutor(max_workers=STARTUP_WORKERS) as pool:
+        font_loading = loop.run_in_executor(pool, load_font)
+        audio_loading = loop.run_in_executor(pool, init_audio)
+        image_loading = [loop.run_in_executor(pool, asset_manager.image, filename) for filename in IMAGE_FILES]
+
+        # Create the game window
+        screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        pygame.display.set_caption("FlappyPy")
+
+        # Other tasks keep running while the assets finish loading
+        font, *_ = await asyncio.gather(font_loading, audio_loading, *image_loading)
+
+    text_cache = TextCache(font)  # The HUD text rarely changes
+    renderer = Renderer(screen, BACKGROUND_COLOR, dirty_rects=dirty_rects)
+
+    # Everything is in memory now (images are converted for the window here);
+    # restarts reuse it without file I/O
+    asset_manager.preload()
+    atlas = build_sprite_atlas()
 
-    # Create a clock object to control the frame rate
-    clock = pygame.time.Clock()
+    # Caps the frame rate by yielding to the event loop between frames
+    pacer = FramePacer()
 
-    # Create the bird
-    bird = Bird()
+    # Fixed-timestep clock that decides how many game ticks each frame runs
+    timestep = FixedTimestep(FPS)
 
-    # Load sound effects
-    bird_sound = load_sound("bird.mp3")
-    score_sound = load_sound("score.mp3")
-    gameover_sound = load_sound("gameover.mp3")
+    # Game over screen, built once per game over and shown until it changes
+    game_over_screen = None
+    game_over_shown = False
 
-    # Load background music
-    music_path = load_music("music.mp3")
+    # Create the game rules (bird, pipes, score and pipe spawning), seeded so
+    # that the game can be replayed from its recorded input
+    recorder = ReplayRecorder(new_seed())
+    if profiler is not None:
+        simulation = ProfiledSimulation(profiler, seed=recorder.seed)
+    else:
+        simulation = Simulation(seed=recorder.seed)
+
+    # Sound effects (already in memory)
+    bird_sound = asset_manager.sound("bird.mp3")
+    score_sound = asset_manager.sound("score.mp3")
+    gameover_sound = asset_manager.sound("gameover.mp3")
+
+    # Start the background music (it stays loaded across restarts)
+    music_path = asset_manager.music("music.mp3")
     if music_path:
         pygame.mixer.music.load(music_path)
         pygame.mixer.music.play(-1)
-    
-    # Create initial pipes list
-    pipes = []
-    
-    # Create scoring system
-    score = Score()
-    
-    # Initialize game state
-    game_over = False
-    
-    # Frame counter for pipe spawning
-    frames_since_spawn = 0
 
     """ Main Function - Game loop """
     running = True
     while running:
+        if profiler is not None:
+            profiler.begin_frame()
+        state = simulation.state
+        events = []
+
         # Handle events
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_SPACE:
-                    if game_over:
+                    if state.game_over:
                         # Reset the game
-                        game_over = False
-                        bird = Bird()
-                        pipes = []
-                        score = Score()
-                        frames_since_spawn = 0
-                        music_path = load_music("music.mp3")
+                        recorder = ReplayRecorder(new_seed())
+                        state = simulation.reset(seed=recorder.seed)
+                        timestep.reset()
+                        game_over_screen = None
                         if music_path:
-                            pygame.mixer.music.load(music_path)
                             pygame.mixer.music.play(-1)
                     else:
-                        bird.flap()
-                        bird.jump()
-                        bird_sound.play()
+                        events += simulation.apply_action(ACTION_FLAP)
+                        recorder.record(ACTION_FLAP)
             elif event.type == pygame.KEYUP:
-                if event.key == pygame.K_SPACE:
-                    bird.stop_flapping()
+                if event.key == pygame.K_SPACE and not state.game_over:
+                    events += simulation.apply_action(ACTION_RELEASE)
+                    recorder.record(ACTION_RELEASE)
+            elif event.type == pygame.VIDEOEXPOSE:
+                # The window contents were lost and must be shown again
+                game_over_shown = False
+                renderer.invalidate()
+        if profiler is not None:
+            profiler.mark(PHASE_EVENTS)
         
         # Game runs normally
-        if not game_over:
-            
-            # Update the bird's position
-            bird.update()
+        playing = not state.game_over
+        if playing:
             
-            # Update the pipes movement
-            for pipe in pipes:
-                pipe.update()
-            
-            # Check pipe collisions
-            for pipe in pipes:
-                
-                # Check if bird collides with this pipe
-                if bird.check_collision_with_pipe(pipe):
-                    if not game_over:
-                        gameover_sound.play()
-                        pygame.mixer.music.stop()
-                    game_over = True
-                    show_game_over_screen(screen, font, score)
+            # Work out how many fixed ticks have elapsed since the last frame
+            ticks = timestep.advance()
+            if ticks > 1:
+                logger.debug("Catching up %d ticks in one frame", ticks)
+
+            # Advance the game rules by the elapsed ticks
+            for _ in range(ticks):
+                recorder.tick()
+                state, step_events = simulation.step()
+                events += step_events
+                if state.game_over:
+                    finish_game(state)
                     break
-                
-                # Check if bird has passed through this pipe
-                if bird.x > pipe.x + pipe.width and not pipe.scored:
-                    pipe.scored = True
-                    score.add_point()
+
+            # Play the sounds for what happened this frame
+            for game_event in events:
+                if game_event == EVENT_FLAP:
+                    bird_sound.play()
+                elif game_event == EVENT_SCORE:
                     score_sound.play()
-            
-            # Check ground collision
-            if bird.check_collision_with_ground():
-                if not game_over:
+                elif game_event == EVENT_GAME_OVER:
                     gameover_sound.play()
                     pygame.mixer.music.stop()
-                game_over = True
-                show_game_over_screen(screen, font, score)
-            
-            # Remove off-screen pipes
-            pipes = [p for p in pipes if p.x + p.width > 0]
-            
-            # Fill the screen with the background color
-            screen.fill(BACKGROUND_COLOR)
             
-            # Pipe spawning logic
-            frames_since_spawn += 1
-            if frames_since_spawn >= PIPE_SPAWN_INTERVAL:
-                frames_since_spawn = 0
-                
-                gap_center = random.randint(
-                    SAFE_MARGIN + PIPE_GAP // 2,
-                    WINDOW_HEIGHT - SAFE_MARGIN - PIPE_GAP // 2
-                )
-                pipes.append(Pipe(PIPE_X_START, gap_center))
-            
-            # Draw the pipes
-            for pipe in pipes:
-                pipe.draw(screen)
+            # Draw the frame, placed between the last two ticks
+            alpha = 1.0 if state.game_over else timestep.alpha
+            if profiler is not None:
+                profiler.mark(PHASE_GAME)
+                draw_frame(screen, renderer, atlas, text_cache, state, alpha, profiler.overlay_items())
+                profiler.mark(PHASE_RENDER)
+            else:
+                draw_frame(screen, renderer, atlas, text_cache, state, alpha)
 
-            # Draw the bird
-            bird.draw(screen)
-        
-            # Draw the score
-            score_text = font.render(f"Score: {score.get_current_score()}", True, (255, 255, 255))
-            screen.blit(score_text, (10, 10))  # Position at top-left corner
+            # Update the display
+            renderer.present()
+            if profiler is not None:
+                profiler.mark(PHASE_PRESENT)
         
         # Game over state
         else:
-            # If game over, show the game over screen
-            show_game_over_screen(screen, font, score)
+            # Build the game over screen once per game over
+            if game_over_screen is None:
+                best = history.personal_best() if history is not None else None
+                game_over_screen = build_game_over_screen(font, state.score, best.score if best else None)
+                game_over_shown = False
 
-        # Update the display
-        pygame.display.flip()
+            # Present it only when it is not already on screen
+            if not game_over_shown:
+                show_game_over_screen(screen, font, state.score, game_over_screen)
+                pygame.display.flip()
+                game_over_shown = True
 
-        # Control the frame rate
-        clock.tick(FPS)
+                # The next game starts from a clean screen
+                renderer.invalidate()
+
+        # Cap the render rate (the game speed does not depend on it);
+        # nothing moves on the game over screen, so just poll for input
+        await pacer.wait(IDLE_FPS if state.game_over else render_fps)
+        if profiler is not None and playing:
+            profiler.mark(PHASE_IDLE)
+            profiler.end_frame()
     
+    # Keep the game that was interrupted as well
+    if not state.game_over:
+        finish_game(state)
+    if history is not None:
+        history.close()  # Writes the runs still queued
+    if saving:
+        await asyncio.gather(*saving, return_exceptions=True)  # Failures are logged by replay_saved
+
+    # Report whether the machine kept up with the tick rate
+    logger.info("Game loop: %s", timestep.report())
+    if profiler is not None:
+        logger.info("Frame times:\n%s", profiler.report())
+        if profiler.export_path is not None:
+            profiler.export(profiler.export_path)
+
     # Clean shutdown
     pygame.quit()
+
+def main(render_fps=RENDER_FPS, dirty_rects=DIRTY_RECTS, replay_dir=REPLAY_DIR, history_path=HISTORY_PATH,
+         profiler=None):
+    """ Main Game Function: runs run_game() on a new event loop, then exits """
+    import asyncio
+    asyncio.run(run_game(render_fps, dirty_rects, replay_dir, history_path, profiler))
     sys.exit()
 
 
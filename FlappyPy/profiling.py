@@ -0,0 +1,220 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Per-phase frame timing: ring buffer of recent frames, percentiles, overlay and export"""
+
+import array
+import csv
+import json
+import math
+import os
+from time import perf_counter_ns
+
+import pygame
+
+from FlappyPy.main import Simulation
+
+
+""" Constants """
+# Phases of a frame, in the order the game loop runs them
+PHASE_EVENTS = 0       # pygame.event.get() and input handling
+PHASE_BIRD = 1         # Bird.update()
+PHASE_PIPES = 2        # One pass moving, colliding and scoring pipes, then removal and spawning
+PHASE_COLLISIONS = 3   # Ground collision check
+PHASE_GAME = 4         # Rest of the update: fixed-timestep clock, recording, sounds
+PHASE_RENDER = 5       # Drawing the frame
+PHASE_PRESENT = 6      # display.flip() / display.update()
+PHASE_IDLE = 7         # Waiting in clock.tick() for the next frame
+PHASE_NAMES = ("events", "bird", "pipes", "collisions", "game", "render", "present", "idle")
+
+PERCENTILES = (50, 95, 99)
+PROFILE_CAPACITY = 600  # Frames kept (10 seconds at 60 FPS)
+OVERLAY_REFRESH = 30  # Frames between overlay text updates
+OVERLAY_FONT_SIZE = 20
+OVERLAY_COLOR = (255, 255, 255)
+OVERLAY_POSITION = (10, 40)  # Below the score
+
+
+""" Classes """
+class FrameProfiler:
+    """Times each phase of the last capacity frames with perf_counter_ns()
+
+    Call begin_frame() at the top of the loop and mark(phase) at the end of
+    each phase: the time since the previous mark goes to that phase. Code
+    that times a part of a phase itself (ProfiledSimulation times the bird,
+    pipes and collisions inside the update) reports it with add(), and that
+    time is taken out of the phase marked next. end_frame() stores the frame
+    in fixed arrays, so the profiler allocates nothing while the game runs.
+    The game loop does none of this unless it is given a profiler.
+    """
+
+    def __init__(self, capacity=PROFILE_CAPACITY, overlay=False, export_path=None):
+        """Create a profiler keeping capacity frames
+
+        overlay shows live frame times on screen; export_path (.csv or
+        .json) is where main() writes the timings when the game exits.
+        """
+        self.capacity = capacity
+        self.overlay = overlay
+        self.export_path = export_path
+        self.frames = 0  # Frames recorded in total, including ones overwritten since
+        self._samples = [array.array("q", bytes(8 * capacity)) for _ in PHASE_NAMES]
+        self._totals = array.array("q", bytes(8 * capacity))
+        self._current = [0] * len(PHASE_NAMES)
+        self._frame_start = self._last = self._nested = 0
+        self._overlay_font = None
+        self._overlay_items = []
+
+    def __len__(self):
+        """Frames currently held"""
+        return min(self.frames, self.capacity)
+
+    def begin_frame(self):
+        """Start timing a frame"""
+        current = self._current
+        for phase in range(len(current)):
+            current[phase] = 0
+        self._nested = 0
+        self._frame_start = self._last = perf_counter_ns()
+
+    def mark(self, phase):
+        """End phase: charge it the time since the previous mark"""
+        now = perf_counter_ns()
+        self._current[phase] += now - self._last - self._nested
+        self._nested = 0
+        self._last = now
+
+    def add(self, phase, ns):
+        """Charge phase ns nanoseconds measured inside the phase being timed"""
+        self._current[phase] += ns
+        self._nested += ns
+
+    def end_frame(self):
+        """Store the frame in the ring buffer"""
+        slot = self.frames % self.capacity
+        for samples, ns in zip(self._samples, self._current):
+            samples[slot] = ns
+        self._totals[slot] = perf_counter_ns() - self._frame_start
+        self.frames += 1
+
+    def _ordered(self, samples):
+        """The held samples of one series, oldest first"""
+        if self.frames <= self.capacity:
+            return samples[:self.frames]
+        start = self.frames % self.capacity
+        return samples[start:] + samples[:start]
+
+    def stats(self):
+        """Timings of the held frames in milliseconds, per phase and for the whole frame
+
+        Returns {name: {"mean", "p50", "p95", "p99", "max"}} with "frame"
+        for the whole frame, or an empty dict before the first frame.
+        """
+        if not self.frames:
+            return {}
+        series = list(zip(PHASE_NAMES, self._samples)) + [("frame", self._totals)]
+        return {name: summarize(self._ordered(samples)) for name, samples in series}
+
+    def report(self):
+        """Table of the percentiles of each phase"""
+        stats = self.stats()
+        if not stats:
+            return "no frames recorded"
+        columns = ("mean",) + tuple(f"p{p}" for p in PERCENTILES) + ("max",)
+        lines = [f"{len(self)} frames, ms  " + "".join(f"{column:>8}" for column in columns)]
+        for name, values in stats.items():
+            lines.append(f"{name:<16}" + "".join(f"{values[column]:8.3f}" for column in columns))
+        return "\n".join(lines)
+
+    def export(self, path):
+        """Write the held frames, oldest first, to a .csv or .json file (times in ms)"""
+        rows = list(zip(*(self._ordered(samples) for samples in self._samples), self._ordered(self._totals)))
+        first = self.frames - len(rows)
+        header = ("frame",) + PHASE_NAMES + ("total",)
+        extension = os.path.splitext(path)[1].lower()
+
+        if extension == ".csv":
+            with open(path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(header)
+                for offset, row in enumerate(rows):
+                    writer.writerow([first + offset] + [f"{ns / 1e6:.4f}" for ns in row])
+        elif extension == ".json":
+            with open(path, "w") as file:
+                json.dump({
+                    "phases": list(header[1:]),
+                    "stats": self.stats(),
+                    "frames": [[first + offset] + [ns / 1e6 for ns in row] for offset, row in enumerate(rows)],
+                }, file)
+        else:
+            raise ValueError(f"Cannot export frame timings to {path}: use a .csv or .json file")
+
+    def overlay_items(self):
+        """(surface, position) blits showing recent frame times, refreshed every OVERLAY_REFRESH frames"""
+        if not self.overlay or not self.frames:
+            return []
+        if not self._overlay_items or self.frames % OVERLAY_REFRESH == 0:
+            if self._overlay_font is None:
+                self._overlay_font = pygame.font.Font(None, OVERLAY_FONT_SIZE)
+            stats = self.stats()
+            frame = stats["frame"]
+            busy = sorted((values["mean"], name) for name, values in stats.items()
+                          if name not in ("frame", "idle"))[-3:]
+            lines = [f"frame p50 {frame['p50']:.2f}  p95 {frame['p95']:.2f}  p99 {frame['p99']:.2f} ms"]
+            lines += [f"{name} {mean:.3f} ms" for mean, name in reversed(busy)]
+            x, y = OVERLAY_POSITION
+            self._overlay_items = []
+            for line in lines:
+                surface = self._overlay_font.render(line, True, OVERLAY_COLOR)
+                self._overlay_items.append((surface, (x, y)))
+                y += surface.get_height()
+        return self._overlay_items
+
+
+class ProfiledSimulation(Simulation):
+    """Simulation that reports its bird, pipe and collision time to a FrameProfiler
+
+    It wraps the parts of Simulation.step() with timers and leaves the
+    rules to Simulation; it is only used while profiling, so the normal
+    step() stays untouched.
+    """
+
+    def __init__(self, profiler, seed=None, rng=None, gap_centers=None):
+        """Create a simulation reporting to profiler"""
+        super().__init__(seed=seed, rng=rng, gap_centers=gap_centers)
+        self.profiler = profiler
+
+    def _update_bird(self):
+        start = perf_counter_ns()
+        super()._update_bird()
+        self.profiler.add(PHASE_BIRD, perf_counter_ns() - start)
+
+    def _update_pipes(self, events):
+        start = perf_counter_ns()
+        expired = super()._update_pipes(events)
+        self.profiler.add(PHASE_PIPES, perf_counter_ns() - start)
+        return expired
+
+    def _check_ground(self, events):
+        start = perf_counter_ns()
+        super()._check_ground(events)
+        self.profiler.add(PHASE_COLLISIONS, perf_counter_ns() - start)
+
+    def _advance_course(self, expired):
+        start = perf_counter_ns()
+        super()._advance_course(expired)
+        self.profiler.add(PHASE_PIPES, perf_counter_ns() - start)
+
+
+""" Functions """
+def percentile(ordered, p):
+    """Nearest-rank p-th percentile of a sorted sequence"""
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+def summarize(samples):
+    """Mean, percentiles and maximum of nanosecond samples, in milliseconds"""
+    ordered = sorted(samples)
+    summary = {"mean": sum(ordered) / len(ordered) / 1e6}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = percentile(ordered, p) / 1e6
+    summary["max"] = ordered[-1] / 1e6
+    return summary
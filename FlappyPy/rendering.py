@@ -0,0 +1,141 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Frame presentation (dirty rectangles or full flips) and render caches"""
+
+from collections import OrderedDict
+
+import pygame
+
+
+""" Constants """
+TEXT_CACHE_SIZE = 64  # Rendered strings kept per font
+
+
+""" Classes """
+class Renderer:
+    """Presents frames either as dirty rectangles or as full-screen flips
+
+    Every frame the caller runs begin_frame(), draws each moving element
+    and passes the rect it covered to add(), then calls present(). In
+    dirty-rect mode begin_frame() only repaints the background where things
+    were drawn last frame, and present() pushes just the old and new rects
+    to the display. With dirty_rects=False the whole screen is cleared and
+    flipped every frame, exactly like the classic loop.
+    """
+
+    def __init__(self, screen, background_color, dirty_rects=True):
+        """Create a renderer drawing on screen over a plain background"""
+        self.screen = screen
+        self.background_color = background_color
+        self.dirty_rects = dirty_rects
+        self.previous_rects = []
+        self.current_rects = []
+        self.full_redraw = True  # The first frame always paints everything
+
+    def invalidate(self):
+        """Force a full repaint next frame (after something else drew on the screen)"""
+        self.full_redraw = True
+
+    def begin_frame(self):
+        """Erase what was drawn last frame"""
+        if not self.dirty_rects or self.full_redraw:
+            self.screen.fill(self.background_color)
+        else:
+            for rect in self.previous_rects:
+                self.screen.fill(self.background_color, rect)
+        self.current_rects = []
+
+    def add(self, rect):
+        """Record the screen area covered by something drawn this frame"""
+        if rect is not None:
+            self.current_rects.append(rect)
+
+    def present(self):
+        """Show the frame and return the rects that were pushed (None for a full flip)"""
+        if not self.dirty_rects or self.full_redraw:
+            pygame.display.flip()
+            updated = None
+        else:
+            updated = self.previous_rects + self.current_rects
+            pygame.display.update(updated)
+        self.previous_rects = self.current_rects
+        self.full_redraw = False
+        return updated
+
+
+class TextCache:
+    """Least-recently-used cache of rendered text surfaces for one font
+
+    font.render() rasterizes the string with FreeType on every call; the
+    HUD text only changes when the score does, so repeated strings are
+    served from the cache instead.
+    """
+
+    def __init__(self, font, max_entries=TEXT_CACHE_SIZE):
+        """Create an empty cache for font"""
+        self.font = font
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, antialias, color):
+        """Same as font.render(text, antialias, color), cached"""
+        key = (text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.surfaces.clear()
+
+
+class SpriteAtlas:
+    """Named sprites packed side by side into a couple of shared surfaces
+
+    Sprites with transparency go on a per-pixel-alpha page and solid ones
+    (like the pipe body) on an opaque page, so opaque blits skip blending.
+    item() returns (surface, dest, area) tuples ready for Surface.blits(),
+    which draws a whole frame's sprites in one call.
+    """
+
+    def __init__(self, sprites, opaque=None):
+        """Pack sprites (name -> Surface) and opaque sprites into pages"""
+        self.areas = {}
+        self.surface = self._pack(sprites, pygame.SRCALPHA)
+        self.opaque_surface = self._pack(opaque or {}, 0)
+
+    def _pack(self, sprites, flags):
+        """Copy sprites left to right onto a new page and record their areas"""
+        width = sum(sprite.get_width() for sprite in sprites.values())
+        height = max((sprite.get_height() for sprite in sprites.values()), default=0)
+        page = pygame.Surface((max(width, 1), max(height, 1)), flags)
+
+        # Match the display pixel format for fast blits when there is one
+        if pygame.display.get_surface() is not None:
+            page = page.convert_alpha() if flags & pygame.SRCALPHA else page.convert()
+        if flags & pygame.SRCALPHA:
+            page.fill((0, 0, 0, 0))
+
+        x = 0
+        for name, sprite in sprites.items():
+            page.blit(sprite, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy onto the empty page
+            self.areas[name] = (page, pygame.Rect(x, 0, sprite.get_width(), sprite.get_height()))
+            x += sprite.get_width()
+        return page
+
+    def item(self, name, dest, height=None):
+        """Blit tuple drawing sprite name at dest, optionally cropped to height"""
+        page, area = self.areas[name]
+        if height is not None:
+            area = pygame.Rect(area.x, area.y, area.width, height)
+        return page, dest, area
@@ -0,0 +1,305 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Compact replays (seed plus run-length encoded inputs), fast verification and playback"""
+
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+
+import pygame
+
+from FlappyPy.main import (
+    Simulation, asset_manager, build_sprite_atlas, draw_frame, load_font,
+    WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_COLOR, FPS, RENDER_FPS, PIPE_SPAWN_INTERVAL,
+    ACTION_NONE, ACTION_FLAP, ACTION_RELEASE,
+)
+from FlappyPy.rendering import Renderer, TextCache
+from FlappyPy.timing import FixedTimestep
+
+try:
+    import numpy as np
+    from FlappyPy.batch import BatchSimulation, generate_courses
+except ImportError:  # pragma: no cover - depends on the environment
+    BatchSimulation = None  # Replays are verified one at a time
+
+
+""" Constants """
+# File format: header, then one varint per input event
+REPLAY_MAGIC = b"FPRP"
+REPLAY_VERSION = 1
+REPLAY_HEADER = struct.Struct("<4sBQII?")  # magic, version, seed, frames, score, game over
+REPLAY_SUFFIX = ".fpr"
+
+VERIFY_BATCH_SIZE = 1024  # Replays checked together by one BatchSimulation
+
+
+""" Classes """
+class Replay:
+    """One game: its seed, the input of every frame and the result it claims
+
+    events lists (frame, action) for the frames that had input; every
+    other frame is ACTION_NONE. On disk each event is a single varint of
+    (frames since the previous event << 2 | action), so a typical
+    ten-minute game takes a few KB.
+    """
+
+    def __init__(self, seed, events, frames, score, game_over):
+        """Create a replay from its recorded parts"""
+        self.seed = seed
+        self.events = events
+        self.frames = frames
+        self.score = score
+        self.game_over = game_over
+
+    def actions(self):
+        """Action of every frame, as a bytearray"""
+        actions = bytearray(self.frames)
+        for frame, action in self.events:
+            actions[frame] = action
+        return actions
+
+    def to_bytes(self):
+        """Encode the replay"""
+        data = bytearray(REPLAY_HEADER.pack(
+            REPLAY_MAGIC, REPLAY_VERSION, self.seed, self.frames, self.score, self.game_over
+        ))
+        previous = 0
+        for frame, action in self.events:
+            value = (frame - previous) << 2 | action
+            previous = frame
+            while value >= 0x80:
+                data.append(value & 0x7F | 0x80)
+                value >>= 7
+            data.append(value)
+        return bytes(data)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Decode a replay made by to_bytes()"""
+        if len(data) < REPLAY_HEADER.size:
+            raise ValueError("Replay is truncated")
+        magic, version, seed, frames, score, game_over = REPLAY_HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError("Not a FlappyPy replay (or an unsupported version)")
+
+        events = []
+        frame = value = shift = 0
+        for byte in memoryview(data)[REPLAY_HEADER.size:]:
+            value |= (byte & 0x7F) << shift
+            shift += 7
+            if byte & 0x80:
+                continue
+            frame += value >> 2
+            if frame >= frames or value & 3 not in (ACTION_FLAP, ACTION_RELEASE):
+                raise ValueError("Replay input is corrupt")
+            events.append((frame, value & 3))
+            value = shift = 0
+        if shift:
+            raise ValueError("Replay is truncated")
+        return cls(seed, events, frames, score, game_over)
+
+    def save(self, path):
+        """Write the replay to path"""
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a replay written by save()"""
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def __repr__(self):
+        ending = "game over" if self.game_over else "quit"
+        return f"Replay(seed={self.seed:#x}, {self.frames} frames, score {self.score}, {ending})"
+
+
+class ReplayRecorder:
+    """Records the input of one game as it is played
+
+    Call record() whenever an action is applied to the simulation and
+    tick() just before each Simulation.step(); the actions applied since
+    the previous tick belong to that frame. A flap wins over a release in
+    the same frame, since only the flap changes the physics.
+    """
+
+    def __init__(self, seed):
+        """Start recording a game played with Simulation(seed=seed)"""
+        self.seed = seed
+        self.events = []
+        self.frame = 0
+        self.pending = ACTION_NONE
+
+    def record(self, action):
+        """Note an action applied before the next tick"""
+        if action == ACTION_FLAP or self.pending == ACTION_NONE:
+            self.pending = action
+
+    def tick(self):
+        """Close the current frame"""
+        if self.pending != ACTION_NONE:
+            self.events.append((self.frame, self.pending))
+            self.pending = ACTION_NONE
+        self.frame += 1
+
+    def finish(self, state):
+        """Return the Replay of the game ending in state"""
+        return Replay(self.seed, list(self.events), self.frame, state.score.get_current_score(), state.game_over)
+
+
+""" Functions """
+def new_seed():
+    """Pick a seed for a new recorded game"""
+    return random.getrandbits(64)
+
+
+def replay_path(replay_dir, replay):
+    """File name for a replay saved in replay_dir"""
+    return os.path.join(replay_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{replay.seed:016x}{REPLAY_SUFFIX}")
+
+
+def record_policy(seed, policy, max_frames):
+    """Play a seeded game with policy(state) -> action, cut after max_frames, and return its Replay"""
+    recorder = ReplayRecorder(seed)
+    simulation = Simulation(seed=seed)
+    state = simulation.state
+    while not state.game_over and state.frame < max_frames:
+        action = policy(state)
+        if action != ACTION_NONE:
+            simulation.apply_action(action)
+            recorder.record(action)
+        recorder.tick()
+        state, _ = simulation.step()
+    return recorder.finish(state)
+
+
+def simulate_replay(replay):
+    """Fast-forward the replay headlessly and return the final game state"""
+    simulation = Simulation(seed=replay.seed)
+    state = simulation.state
+    step = simulation.step
+    for action in replay.actions():
+        if state.game_over:
+            break
+        step(action)
+    return state
+
+
+def verify_replay(replay):
+    """Whether replaying the inputs gives exactly the claimed result"""
+    state = simulate_replay(replay)
+    return (state.frame, state.score.get_current_score(), state.game_over) == \
+        (replay.frames, replay.score, replay.game_over)
+
+
+def verify_replays(replays):
+    """verify_replay() for many replays, checked side by side with NumPy when it is installed"""
+    if BatchSimulation is None:
+        return [verify_replay(replay) for replay in replays]
+    results = []
+    for start in range(0, len(replays), VERIFY_BATCH_SIZE):
+        results += _verify_batch(replays[start:start + VERIFY_BATCH_SIZE])
+    return results
+
+
+def _verify_batch(replays):
+    """Verify replays in one BatchSimulation, each on its own seeded course"""
+    n = len(replays)
+    if n == 0:
+        return []
+    length = max(replay.frames for replay in replays)
+    actions = np.zeros((length, n), dtype=np.uint8)
+    for column, replay in enumerate(replays):
+        actions[:replay.frames, column] = np.frombuffer(replay.actions(), dtype=np.uint8)
+    ends = np.array([replay.frames for replay in replays])
+
+    courses = generate_courses([replay.seed for replay in replays], length // PIPE_SPAWN_INTERVAL + 1)
+    batch = BatchSimulation(n, auto_reset=False, gap_centers=courses)
+
+    # Result of each game at its recorded end (games over stay frozen)
+    frame = np.zeros(n, dtype=np.int64)
+    score = np.zeros(n, dtype=np.int64)
+    game_over = np.zeros(n, dtype=bool)
+    for t in range(length + 1):
+        ending = ends == t
+        frame[ending] = batch.frame[ending]
+        score[ending] = batch.score[ending]
+        game_over[ending] = batch.game_over[ending]
+        if t < length:
+            batch.step(actions[t])
+
+    claimed_score = np.array([replay.score for replay in replays])
+    claimed_over = np.array([replay.game_over for replay in replays])
+    return ((frame == ends) & (score == claimed_score) & (game_over == claimed_over)).tolist()
+
+
+def play_replay(replay, render_fps=RENDER_FPS):
+    """Show the replay in a window in real time and return the final game state
+
+    Closing the window stops playback early.
+    """
+    pygame.init()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption(f"FlappyPy replay {replay.seed:016x}")
+    asset_manager.preload()
+    atlas = build_sprite_atlas()
+    text_cache = TextCache(load_font())
+    renderer = Renderer(screen, BACKGROUND_COLOR)
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep(FPS)
+
+    simulation = Simulation(seed=replay.seed)
+    state = simulation.state
+    actions = replay.actions()
+    running = True
+    while running and state.frame < replay.frames and not state.game_over:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.VIDEOEXPOSE:
+                renderer.invalidate()
+
+        for _ in range(timestep.advance()):
+            state, _ = simulation.step(actions[state.frame])
+            if state.frame >= replay.frames or state.game_over:
+                break
+
+        done = state.frame >= replay.frames or state.game_over
+        draw_frame(screen, renderer, atlas, text_cache, state, 1.0 if done else timestep.alpha)
+        renderer.present()
+        clock.tick(render_fps)
+    pygame.quit()
+    return state
+
+
+def main(argv=None):
+    """Command line: verify replays headlessly or play one back"""
+    parser = argparse.ArgumentParser(prog="python -m FlappyPy.replay", description="FlappyPy replays")
+    commands = parser.add_subparsers(dest="command", required=True)
+    verify = commands.add_parser("verify", help="fast-forward replays and check their scores")
+    verify.add_argument("paths", nargs="+")
+    play = commands.add_parser("play", help="watch a replay in real time")
+    play.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "play":
+        replay = Replay.load(args.path)
+        state = play_replay(replay)
+        print(f"{replay}: reached frame {state.frame} with score {state.score.get_current_score()}")
+        return 0
+
+    replays = [Replay.load(path) for path in args.paths]
+    start = time.perf_counter()
+    results = verify_replays(replays)
+    elapsed = time.perf_counter() - start
+    for path, replay, ok in zip(args.paths, replays, results):
+        print(f"{'OK  ' if ok else 'FAIL'} {path}: {replay}")
+    print(f"{sum(results)}/{len(results)} replays verified in {elapsed:.2f}s")
+    return 0 if all(results) else 1
+
+
+""" Entry Point """
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Run seeded headless episodes of a bot across CPU cores and aggregate the results"""
+
+import os
+import multiprocessing
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from FlappyPy.main import (
+    Simulation, asset_manager,
+    BIRD_START_Y, ACTION_FLAP, ACTION_NONE, DEATH_PIPE, DEATH_GROUND,
+)
+
+
+""" Constants """
+MAX_EPISODE_FRAMES = 60 * 60 * 5  # Five minutes of play, then the episode is cut short
+CHUNKS_PER_WORKER = 4  # Default chunking: a few chunks per worker balances load with little IPC
+
+# One finished episode; death_cause is None when it hit the frame limit
+EpisodeResult = namedtuple("EpisodeResult", ["seed", "score", "frames", "death_cause"])
+
+
+""" Functions """
+def follow_gap(state):
+    """Reference bot: flap whenever the bird sinks below the next gap"""
+    target = BIRD_START_Y
+    bird = state.bird
+    for pipe in state.pipes:
+        if pipe.x + pipe.width >= bird.x:
+            target = pipe.gap_center_y
+            break
+    falling = bird.y + bird.height // 2 > target + 20
+    return ACTION_FLAP if falling and bird.velocity >= 0 else ACTION_NONE
+
+
+def run_episode(seed, policy, max_frames=MAX_EPISODE_FRAMES):
+    """Play one seeded game with policy(state) -> action and return its EpisodeResult"""
+    simulation = Simulation(seed=seed)
+    state = simulation.state
+    step = simulation.step
+    while not state.game_over and state.frame < max_frames:
+        step(policy(state))
+    return EpisodeResult(seed, state.score.get_current_score(), state.frame, state.death_cause)
+
+
+def _run_chunk(seeds, policy, max_frames):
+    """Worker entry point: play a chunk of episodes and return their results"""
+    return [run_episode(seed, policy, max_frames) for seed in seeds]
+
+
+def _init_worker():
+    """Keep workers headless even when they were not forked from a headless parent"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+""" Classes """
+class RolloutSummary:
+    """Running totals over finished episodes"""
+
+    def __init__(self):
+        """Start with no episodes"""
+        self.episodes = 0
+        self.total_score = 0
+        self.best_score = 0
+        self.total_frames = 0
+        self.deaths = {DEATH_PIPE: 0, DEATH_GROUND: 0, None: 0}  # None = hit the frame limit
+
+    def add(self, result):
+        """Count one EpisodeResult"""
+        self.episodes += 1
+        self.total_score += result.score
+        self.best_score = max(self.best_score, result.score)
+        self.total_frames += result.frames
+        self.deaths[result.death_cause] += 1
+
+    @property
+    def mean_score(self):
+        """Average score per episode"""
+        return self.total_score / self.episodes if self.episodes else 0.0
+
+    @property
+    def mean_frames(self):
+        """Average frames survived per episode"""
+        return self.total_frames / self.episodes if self.episodes else 0.0
+
+    def __repr__(self):
+        return (f"RolloutSummary({self.episodes} episodes, mean score {self.mean_score:.2f}, "
+                f"best {self.best_score}, mean frames {self.mean_frames:.0f}, "
+                f"{self.deaths[DEATH_PIPE]} pipe / {self.deaths[DEATH_GROUND]} ground / {self.deaths[None]} cut)")
+
+
+class RolloutRunner:
+    """Shards seeded episodes of one bot across worker processes
+
+    policy must be picklable (a module-level function or an instance of a
+    module-level class); each chunk of chunk_size seeds is played by one
+    worker and sent back as a single message. Assets are resolved before
+    the workers fork, so they start without touching the disk, and the
+    workers never open a display. workers=0 plays everything in this
+    process.
+    """
+
+    def __init__(self, policy=follow_gap, workers=None, chunk_size=None, max_frames=MAX_EPISODE_FRAMES):
+        """Configure the runner; workers defaults to the number of CPUs"""
+        self.policy = policy
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.chunk_size = chunk_size
+        self.max_frames = max_frames
+
+    def chunks(self, seeds):
+        """Split seeds into the lists sent to workers"""
+        seeds = list(seeds)
+        size = self.chunk_size or max(1, -(-len(seeds) // (max(self.workers, 1) * CHUNKS_PER_WORKER)))
+        return [seeds[start:start + size] for start in range(0, len(seeds), size)]
+
+    def imap(self, seeds):
+        """Yield an EpisodeResult per seed as soon as its chunk finishes (in completion order)"""
+        chunks = self.chunks(seeds)
+        if self.workers == 0:
+            for chunk in chunks:
+                yield from _run_chunk(chunk, self.policy, self.max_frames)
+            return
+
+        # Forked workers inherit the decoded assets instead of loading them again.
+        # Forking a process that runs other threads can deadlock, so fall back
+        # to the platform's default start method then
+        asset_manager.preload()
+        fork = "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1
+        context = multiprocessing.get_context("fork" if fork else None)
+        executor = ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker)
+        try:
+            futures = [executor.submit(_run_chunk, chunk, self.policy, self.max_frames) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+        finally:
+            # Don't play chunks nobody will read when the caller stops early
+            executor.shutdown(cancel_futures=True)
+
+    def run(self, seeds, on_result=None):
+        """Play every seed and return a RolloutSummary, calling on_result(result) as they arrive"""
+        summary = RolloutSummary()
+        for result in self.imap(seeds):
+            summary.add(result)
+            if on_result is not None:
+                on_result(result)
+        return summary
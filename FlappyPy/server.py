@@ -0,0 +1,289 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Headless game server: many authoritative sessions in one process, stepped together each tick"""
+
+import argparse
+import asyncio
+import logging
+import struct
+import sys
+from collections import deque
+from time import perf_counter_ns
+
+from FlappyPy.main import (
+    Simulation, FPS, ACTION_NONE, ACTION_FLAP, ACTION_RELEASE, EVENT_SCORE, EVENT_GAME_OVER,
+)
+from FlappyPy.history import CAUSE_CODES
+from FlappyPy.profiling import summarize
+from FlappyPy.replay import new_seed
+from FlappyPy.timing import FixedTimestep
+
+logger = logging.getLogger(__name__)
+
+
+""" Constants """
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+TICK_SAMPLES = 600  # Server ticks kept for latency statistics
+MAX_PENDING_OUTPUT = 64 * 1024  # Bytes held back for a client that stopped reading before it is dropped
+
+# Client to server: one byte per input
+INPUT_FLAP = b"\x01"[0]
+INPUT_RELEASE = b"\x02"[0]
+INPUT_RESTART = b"\x03"[0]
+INPUT_ACTIONS = {INPUT_FLAP: ACTION_FLAP, INPUT_RELEASE: ACTION_RELEASE}
+
+# Server to client: a type byte, then a fixed-size body
+MSG_START = 1  # A game started: its seed
+MSG_TICK = 2   # One tick passed: bird y in half pixels (the bird always moves in half pixels)
+MSG_SPAWN = 3  # A pipe spawned: its gap center
+MSG_SCORE = 4  # The bird passed a pipe: the new score
+MSG_OVER = 5   # The game ended: frames, score and death cause (history.CAUSE_CODES)
+MESSAGES = {
+    MSG_START: struct.Struct("<BQ"),
+    MSG_TICK: struct.Struct("<Bh"),
+    MSG_SPAWN: struct.Struct("<BH"),
+    MSG_SCORE: struct.Struct("<BI"),
+    MSG_OVER: struct.Struct("<BIIB"),
+}
+
+
+""" Classes """
+class Session:
+    """One client's game, stepped by the server"""
+
+    __slots__ = ("server", "transport", "simulation", "pending", "restart", "spawn_count", "output", "paused")
+
+    def __init__(self, server, transport):
+        """Start a session writing its updates to transport"""
+        self.server = server
+        self.transport = transport
+        self.simulation = Simulation()
+        self.pending = ACTION_NONE
+        self.restart = False
+        self.output = bytearray()
+        self.paused = False  # The transport's buffer is full: hold updates back
+        self.start()
+
+    def start(self):
+        """Begin a new seeded game"""
+        seed = new_seed()
+        self.simulation.reset(seed=seed)
+        self.spawn_count = 0
+        self.pending = ACTION_NONE
+        self.restart = False
+        self.output += MESSAGES[MSG_START].pack(MSG_START, seed)
+
+    def receive(self, data):
+        """Queue the inputs in data for the next tick (a flap wins over a release)
+
+        A restart only counts once the game is over.
+        """
+        for byte in data:
+            action = INPUT_ACTIONS.get(byte)
+            if action == ACTION_FLAP or (action is not None and self.pending == ACTION_NONE):
+                self.pending = action
+            elif byte == INPUT_RESTART and self.simulation.state.game_over:
+                self.restart = True
+
+    def step(self):
+        """Advance the game one tick and queue its updates"""
+        simulation = self.simulation
+        if simulation.state.game_over:
+            if self.restart:
+                self.start()
+            return
+        state, events = simulation.step(self.pending)
+        self.pending = ACTION_NONE
+
+        output = self.output
+        output += MESSAGES[MSG_TICK].pack(MSG_TICK, int(state.bird.y * 2))
+        if state.spawn_count != self.spawn_count:
+            self.spawn_count = state.spawn_count
+            output += MESSAGES[MSG_SPAWN].pack(MSG_SPAWN, state.pipes[-1].gap_center_y)
+        for event in events:
+            if event == EVENT_SCORE:
+                output += MESSAGES[MSG_SCORE].pack(MSG_SCORE, state.score.get_current_score())
+            elif event == EVENT_GAME_OVER:
+                output += MESSAGES[MSG_OVER].pack(
+                    MSG_OVER, state.frame, state.score.get_current_score(), CAUSE_CODES[state.death_cause]
+                )
+
+    def flush(self):
+        """Send the queued updates in one write
+
+        While the transport has paused writing the updates are held back,
+        and a client that falls more than MAX_PENDING_OUTPUT bytes behind
+        is disconnected.
+        """
+        output = self.output
+        if not output:
+            return
+        if self.paused:
+            if len(output) > MAX_PENDING_OUTPUT:
+                logger.warning("Dropping a client that stopped reading (%d bytes behind)", len(output))
+                output.clear()
+                self.transport.abort()
+                self.server.close_session(self)
+            return
+        self.transport.write(bytes(output))
+        output.clear()
+
+
+class SessionProtocol(asyncio.Protocol):
+    """Connection of one client to the server"""
+
+    def __init__(self, server):
+        self.server = server
+        self.session = None
+
+    def connection_made(self, transport):
+        self.session = self.server.open_session(transport)
+
+    def data_received(self, data):
+        self.session.receive(data)
+
+    def pause_writing(self):
+        """The client is not keeping up: hold its updates back"""
+        self.session.paused = True
+
+    def resume_writing(self):
+        """The client caught up: send the held updates on the next flush"""
+        self.session.paused = False
+
+    def connection_lost(self, exc):
+        self.server.close_session(self.session)
+
+
+class GameServer:
+    """Hosts many sessions, all stepped in one batch per server tick
+
+    One coroutine (run()) ticks every session at tick_rate and then
+    flushes each client's updates in a single write, instead of a timer
+    or task per session. The server's Simulation is the only source of
+    truth for scores; clients just send inputs. The time each batched
+    tick takes is kept for tick_stats().
+    """
+
+    def __init__(self, tick_rate=FPS, tick_samples=TICK_SAMPLES):
+        """Create a server ticking tick_rate times per second, timing the last tick_samples ticks"""
+        self.tick_rate = tick_rate
+        self.sessions = []
+        self.tick_times = deque(maxlen=tick_samples)  # Nanoseconds per batched tick
+        self.ticks = 0
+        self._servers = []
+        self._running = False
+
+    def open_session(self, transport):
+        """Add a session for a new connection"""
+        session = Session(self, transport)
+        self.sessions.append(session)
+        return session
+
+    def close_session(self, session):
+        """Drop the session of a closed connection"""
+        if session in self.sessions:
+            self.sessions.remove(session)
+
+    async def listen_tcp(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """Accept clients on a TCP port; return the bound (host, port)"""
+        loop = asyncio.get_running_loop()
+        server = await loop.create_server(lambda: SessionProtocol(self), host, port)
+        self._servers.append(server)
+        return server.sockets[0].getsockname()[:2]
+
+    async def listen_unix(self, path):
+        """Accept clients on a Unix socket"""
+        loop = asyncio.get_running_loop()
+        self._servers.append(await loop.create_unix_server(lambda: SessionProtocol(self), path))
+
+    def tick(self):
+        """Step every session once and send their updates"""
+        start = perf_counter_ns()
+        sessions = self.sessions
+        for session in sessions:
+            session.step()
+        for session in tuple(sessions):  # Flushing may drop a session
+            session.flush()
+        self.ticks += 1
+        self.tick_times.append(perf_counter_ns() - start)
+
+    async def run(self):
+        """Tick at tick_rate until stop() is called"""
+        timestep = FixedTimestep(self.tick_rate)
+        self._running = True
+        while self._running:
+            for _ in range(timestep.advance()):
+                self.tick()
+            await asyncio.sleep(max(timestep.dt - timestep.accumulator, 0.0))
+
+    def stop(self):
+        """End run() and stop accepting clients"""
+        self._running = False
+        for server in self._servers:
+            server.close()
+        self._servers = []
+
+    def tick_stats(self):
+        """Milliseconds per batched tick over the recent ticks (mean, p50, p95, p99, max)"""
+        return summarize(self.tick_times) if self.tick_times else {}
+
+
+class MessageReader:
+    """Splits the server's byte stream into messages"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes and return the complete messages as (type, fields...) tuples"""
+        buffer = self.buffer
+        buffer += data
+        messages = []
+        offset = 0
+        while offset < len(buffer):
+            message = MESSAGES.get(buffer[offset])
+            if message is None:
+                raise ValueError(f"Unknown message type {buffer[offset]}")
+            if offset + message.size > len(buffer):
+                break
+            messages.append(message.unpack_from(buffer, offset))
+            offset += message.size
+        del buffer[:offset]
+        return messages
+
+
+""" Functions """
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, unix_path=None):
+    """Run a game server until cancelled"""
+    server = GameServer()
+    if unix_path:
+        await server.listen_unix(unix_path)
+        logger.info("Serving FlappyPy on %s", unix_path)
+    else:
+        host, port = await server.listen_tcp(host, port)
+        logger.info("Serving FlappyPy on %s:%d", host, port)
+    try:
+        await server.run()
+    finally:
+        server.stop()
+
+
+def main(argv=None):
+    """Command line: run a game server"""
+    parser = argparse.ArgumentParser(prog="python -m FlappyPy.server", description="FlappyPy game server")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+""" Entry Point """
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Spectator streams: game state as quantized per-tick deltas with periodic keyframes"""
+
+import struct
+
+from FlappyPy.main import GameState, PIPE_X_START
+
+
+""" Constants """
+KEYFRAME_INTERVAL = 120  # Ticks between keyframes (2 seconds at 60 FPS)
+
+# The first byte of every message is a set of flags
+FLAG_KEYFRAME = 0x01   # Full state follows (KEYFRAME struct, then the pipes)
+FLAG_BIRD_Y = 0x02     # int8 change of the bird's y, in half pixels
+FLAG_VELOCITY = 0x04   # int8 change of the bird's velocity, in half pixels per tick
+FLAG_SCORE = 0x08      # uint16 new score (higher scores are sent in a keyframe)
+FLAG_SPAWN = 0x10      # uint16 gap center of a pipe spawned at PIPE_X_START
+FLAG_DROP = 0x20       # uint8 number of pipes that left the screen
+FLAG_GAME_OVER = 0x40  # The game is over
+FLAG_FLYING = 0x80     # Delta: the bird's sprite toggled; keyframe: the bird is flying
+
+# Bodies, in the order of their flags
+KEYFRAME = struct.Struct("<IhhIB")  # frame, bird y, velocity (half units), score, pipe count
+KEYFRAME_PIPE = struct.Struct("<hH")  # x, gap center
+DELTA_FIELDS = (
+    (FLAG_BIRD_Y, struct.Struct("<b")),
+    (FLAG_VELOCITY, struct.Struct("<b")),
+    (FLAG_SCORE, struct.Struct("<H")),
+    (FLAG_SPAWN, struct.Struct("<H")),
+    (FLAG_DROP, struct.Struct("<B")),
+)
+INT8_RANGE = range(-128, 128)
+UINT16_RANGE = range(0x10000)
+
+
+""" Classes """
+class SpectatorEncoder:
+    """Turns a game's state, once per tick, into a stream of small messages
+
+    The bird moves in half pixels, so y and velocity are sent in half
+    units and decode exactly. Every pipe moves by PIPE_SPEED each tick, so
+    a delta only names pipes that spawned or left. A tick where nothing
+    changed (the game is over) sends nothing. A keyframe with the full state
+    is sent every keyframe_interval ticks, on a new game, and whenever a
+    change does not fit in a delta.
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        """Create an encoder sending a keyframe at least every keyframe_interval ticks"""
+        self.keyframe_interval = keyframe_interval
+        self.previous = None  # (frame, y, velocity, score, flying, game over, spawn count, pipe count)
+        self.pipes = []
+        self.since_keyframe = 0
+
+    def encode(self, state):
+        """Message for the tick that state is at, or None when nothing changed"""
+        bird = state.bird
+        current = (
+            state.frame, int(bird.y * 2), int(bird.velocity * 2), state.score.get_current_score(),
+            bird.is_flying, state.game_over, state.spawn_count, len(state.pipes),
+        )
+        previous = self.previous
+        if previous is not None and current == previous:
+            return None
+        self.previous = current
+        self.pipes = [(pipe.x, pipe.gap_center_y) for pipe in state.pipes]
+
+        message = None
+        if previous is not None and current[0] == previous[0] + 1 and self.since_keyframe + 1 < self.keyframe_interval:
+            message = self._delta(previous, current)
+        if message is None:
+            self.since_keyframe = 0
+            return self.keyframe()
+        self.since_keyframe += 1
+        return message
+
+    def keyframe(self):
+        """Full state of the last tick encoded (also sent to spectators who join late)"""
+        frame, y, velocity, score, flying, game_over, _, count = self.previous
+        flags = FLAG_KEYFRAME | (FLAG_FLYING if flying else 0) | (FLAG_GAME_OVER if game_over else 0)
+        message = bytearray([flags])
+        message += KEYFRAME.pack(frame, y, velocity, score, count)
+        for x, gap_center_y in self.pipes:
+            message += KEYFRAME_PIPE.pack(x, gap_center_y)
+        return bytes(message)
+
+    def _delta(self, previous, current):
+        """Delta message between two ticks, or None when a change does not fit"""
+        _, y, velocity, score, flying, game_over, spawn_count, count = current
+        spawned = spawn_count - previous[6]
+        dropped = previous[7] + spawned - count
+        if spawned not in (0, 1) or dropped not in range(256) or score < previous[3]:
+            return None
+        if score != previous[3] and score not in UINT16_RANGE:
+            return None
+        values = {
+            FLAG_BIRD_Y: y - previous[1],
+            FLAG_VELOCITY: velocity - previous[2],
+            FLAG_SCORE: score if score != previous[3] else 0,
+            FLAG_SPAWN: self.pipes[-1][1] if spawned else 0,
+            FLAG_DROP: dropped,
+        }
+        if values[FLAG_BIRD_Y] not in INT8_RANGE or values[FLAG_VELOCITY] not in INT8_RANGE:
+            return None
+
+        # Fields that did not change are left out
+        flags = (FLAG_FLYING if flying != previous[4] else 0) | (FLAG_GAME_OVER if game_over else 0)
+        message = bytearray(1)
+        for flag, field in DELTA_FIELDS:
+            if values[flag]:
+                flags |= flag
+                message += field.pack(values[flag])
+        message[0] = flags
+        return bytes(message)
+
+
+class SpectatorDecoder:
+    """Rebuilds a game from a spectator stream, ready to draw
+
+    state is a real GameState, so spectators draw it with draw_frame()
+    (or Pipe.draw/Bird.draw) exactly like the game. Messages arriving before
+    the first keyframe are skipped. write() takes raw stream bytes, so a
+    decoder can be subscribed to a SpectatorChannel directly.
+    """
+
+    def __init__(self):
+        """Create a decoder waiting for a keyframe"""
+        self.state = GameState()
+        self.synced = False
+        self.buffer = bytearray()
+        self.ticks = 0  # Messages applied
+
+    def write(self, data):
+        """Apply every complete message in data (plus what was left over before)"""
+        buffer = self.buffer
+        buffer += data
+        offset = 0
+        while offset < len(buffer):
+            size = message_size(buffer, offset)
+            if size is None or offset + size > len(buffer):
+                break
+            self.apply(buffer[offset:offset + size])
+            offset += size
+        del buffer[:offset]
+
+    def apply(self, message):
+        """Apply one complete message"""
+        flags = message[0]
+        if flags & FLAG_KEYFRAME:
+            self._apply_keyframe(message, flags)
+        elif self.synced:
+            self._apply_delta(message, flags)
+        else:
+            return
+        self.ticks += 1
+
+    def _apply_keyframe(self, message, flags):
+        """Replace the state with the one in a keyframe"""
+        frame, y, velocity, score, count = KEYFRAME.unpack_from(message, 1)
+        state = self.state
+        bird = state.bird
+        # The previous positions follow from the motion, for interpolated drawing
+        bird.y = y / 2
+        bird.velocity = velocity / 2
+        bird.previous_y = bird.y - bird.velocity
+        bird.is_flying = bool(flags & FLAG_FLYING)
+        state.frame = frame
+        state.score.current_score = score
+        state.game_over = bool(flags & FLAG_GAME_OVER)
+        state.pipes.clear()
+        for index in range(count):
+            x, gap_center_y = KEYFRAME_PIPE.unpack_from(message, 1 + KEYFRAME.size + index * KEYFRAME_PIPE.size)
+            pipe = state.pipes.spawn(x, gap_center_y)
+            if x != PIPE_X_START:  # Only a pipe spawned this tick has not moved yet
+                pipe.previous_x = x + pipe.speed
+        self.synced = True
+
+    def _apply_delta(self, message, flags):
+        """Advance the state by one tick"""
+        values = {}
+        offset = 1
+        for flag, field in DELTA_FIELDS:
+            if flags & flag:
+                values[flag] = field.unpack_from(message, offset)[0]
+                offset += field.size
+
+        state = self.state
+        bird = state.bird
+        bird.previous_y = bird.y
+        bird.y += values.get(FLAG_BIRD_Y, 0) / 2
+        bird.velocity += values.get(FLAG_VELOCITY, 0) / 2
+        if flags & FLAG_FLYING:
+            bird.is_flying = not bird.is_flying
+        if FLAG_SCORE in values:
+            state.score.current_score = values[FLAG_SCORE]
+        state.game_over = bool(flags & FLAG_GAME_OVER)
+
+        # Same order as Simulation.step(): move, drop, then spawn
+        pipes = state.pipes
+        for pipe in pipes:
+            pipe.update()
+        if FLAG_DROP in values:
+            pipes.drop_oldest(values[FLAG_DROP])
+        if FLAG_SPAWN in values:
+            pipes.spawn(PIPE_X_START, values[FLAG_SPAWN])
+        state.frame += 1
+
+
+class SpectatorChannel:
+    """Broadcasts one game to many spectators
+
+    publish() encodes each tick once and writes the same bytes to every
+    subscriber: anything with a write(bytes) method, such as an asyncio
+    transport or a SpectatorDecoder. Spectators who subscribe mid-game get
+    a keyframe straight away instead of waiting for the next one.
+    """
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        """Create a channel with no subscribers"""
+        self.encoder = SpectatorEncoder(keyframe_interval)
+        self.subscribers = []
+        self.messages = 0
+        self.bytes_published = 0  # Sent to each subscriber
+
+    def subscribe(self, subscriber):
+        """Start sending the stream to subscriber"""
+        self.subscribers.append(subscriber)
+        if self.encoder.previous is not None:
+            subscriber.write(self.encoder.keyframe())
+
+    def unsubscribe(self, subscriber):
+        """Stop sending the stream to subscriber"""
+        self.subscribers.remove(subscriber)
+
+    def publish(self, state):
+        """Send the tick state is at to every subscriber; return the message (None if nothing changed)"""
+        message = self.encoder.encode(state)
+        if message is not None:
+            self.messages += 1
+            self.bytes_published += len(message)
+            for subscriber in self.subscribers:
+                subscriber.write(message)
+        return message
+
+
+""" Functions """
+def message_size(buffer, offset=0):
+    """Length of the message starting at offset, or None if its header is incomplete"""
+    flags = buffer[offset]
+    if flags & FLAG_KEYFRAME:
+        header = 1 + KEYFRAME.size
+        if offset + header > len(buffer):
+            return None
+        count = buffer[offset + header - 1]
+        return header + count * KEYFRAME_PIPE.size
+    return 1 + sum(field.size for flag, field in DELTA_FIELDS if flags & flag)
@@ -0,0 +1,97 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Fixed-timestep game clock decoupled from the render rate, and asyncio frame pacing"""
+
+import asyncio
+import time
+
+
+""" Constants """
+MAX_TICKS_PER_FRAME = 5  # Beyond this the game slows down instead of freezing
+
+
+""" Classes """
+class FixedTimestep:
+    """Turns elapsed wall-clock time into a whole number of fixed simulation ticks
+
+    Call advance() once per rendered frame and run that many ticks. The
+    leftover time is exposed as alpha (0..1) so the renderer can interpolate
+    between the previous and the current tick. When a frame needs more than
+    max_ticks_per_frame ticks the extra time is dropped and counted, so a
+    slow machine never spirals into an ever-growing backlog.
+    """
+
+    def __init__(self, tick_rate, max_ticks_per_frame=MAX_TICKS_PER_FRAME, time_source=time.perf_counter):
+        """Create a clock running tick_rate ticks per second"""
+        self.tick_rate = tick_rate
+        self.dt = 1.0 / tick_rate
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.time_source = time_source
+        self.accumulator = 0.0
+        self.last_time = None
+
+        # Catch-up statistics
+        self.frames = 0
+        self.ticks = 0
+        self.catch_up_frames = 0  # Frames that needed more than one tick
+        self.most_ticks_in_frame = 0
+        self.dropped_ticks = 0  # Ticks skipped because the machine fell behind
+
+    def reset(self):
+        """Forget accumulated time, e.g. after a pause"""
+        self.accumulator = 0.0
+        self.last_time = None
+
+    def advance(self):
+        """Return how many ticks to simulate for the frame being drawn now"""
+        now = self.time_source()
+        if self.last_time is not None:
+            self.accumulator += now - self.last_time
+        self.last_time = now
+
+        ticks = int(self.accumulator // self.dt)
+        self.accumulator -= ticks * self.dt
+        if ticks > self.max_ticks_per_frame:
+            self.dropped_ticks += ticks - self.max_ticks_per_frame
+            ticks = self.max_ticks_per_frame
+
+        self.frames += 1
+        self.ticks += ticks
+        if ticks > 1:
+            self.catch_up_frames += 1
+        self.most_ticks_in_frame = max(self.most_ticks_in_frame, ticks)
+        return ticks
+
+    @property
+    def alpha(self):
+        """Fraction of a tick elapsed since the last simulated tick"""
+        return min(self.accumulator / self.dt, 1.0)
+
+    def report(self):
+        """One-line summary of the catch-up statistics"""
+        return (
+            f"{self.frames} frames, {self.ticks} ticks at {self.tick_rate} Hz, "
+            f"{self.catch_up_frames} catch-up frames (max {self.most_ticks_in_frame} ticks), "
+            f"{self.dropped_ticks} dropped ticks"
+        )
+
+
+class FramePacer:
+    """Caps the frame rate of a game loop running on an asyncio event loop
+
+    Unlike pygame.time.Clock.tick(), which sleeps the whole thread, wait()
+    sleeps with asyncio.sleep(), so other tasks (file writes, telemetry)
+    run in the gap before the next frame. It always yields at least once.
+    """
+
+    def __init__(self, time_source=time.perf_counter):
+        """Create a pacer timing frames with time_source"""
+        self.time_source = time_source
+        self.last_frame = None
+
+    async def wait(self, fps):
+        """Sleep until 1/fps seconds after the previous frame (fps 0 = no cap)"""
+        delay = 0.0
+        if fps and self.last_frame is not None:
+            delay = max(self.last_frame + 1.0 / fps - self.time_source(), 0.0)
+        await asyncio.sleep(delay)
+        self.last_frame = self.time_source()
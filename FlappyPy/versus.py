@@ -0,0 +1,349 @@
+"""FlappyPy - a simple Flappy Bird in Python using Pygame"""
+"""Two-player race on a shared pipe course, kept in sync with rollback netcode"""
+
+import argparse
+import heapq
+import logging
+import random
+import socket
+import struct
+import sys
+import time
+
+import pygame
+
+from FlappyPy.main import (
+    Simulation, asset_manager, build_sprite_atlas, draw_frame, generate_gap_centers, init_audio, load_font,
+    WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_COLOR, FPS, RENDER_FPS, IDLE_FPS,
+    ACTION_NONE, ACTION_FLAP, ACTION_RELEASE,
+)
+from FlappyPy.rendering import Renderer, TextCache
+from FlappyPy.timing import FixedTimestep
+
+logger = logging.getLogger(__name__)
+
+
+""" Constants """
+COURSE_LENGTH = 10000  # Pipes pregenerated per race (over five hours of play)
+INPUT_DELAY = 2  # Frames local input is delayed by, to hide some latency without rolling back
+MAX_ROLLBACK = 8  # Frames simulated ahead of the peer before waiting for it
+GHOST_ALPHA = 120  # Opacity of the other player's bird
+
+# Packet: ack (last remote frame received in order), first frame, input count, then one byte per input
+PACKET_HEADER = struct.Struct("<iiB")
+
+
+""" Classes """
+class VersusGame:
+    """Two birds racing through the same seeded pipe course
+
+    Each player has a Simulation of their own on the same pregenerated
+    course, so the pipes match frame for frame whatever the birds do, and
+    the whole race can be saved and loaded for rollback.
+    """
+
+    def __init__(self, seed, course_length=COURSE_LENGTH):
+        """Start a race on the course of seed"""
+        course = generate_gap_centers(seed, course_length)
+        self.players = [Simulation(seed=seed, gap_centers=course) for _ in range(2)]
+
+    @property
+    def over(self):
+        """Whether both birds have crashed"""
+        return all(player.state.game_over for player in self.players)
+
+    def step(self, actions):
+        """Advance both players by one frame with their actions"""
+        for player, action in zip(self.players, actions):
+            player.step(action)
+
+    def winner(self):
+        """Index of the player who flew further, or None for a tie (or a race still running)"""
+        if not self.over:
+            return None
+        first, second = (player.state.frame for player in self.players)
+        if first == second:
+            return None
+        return 0 if first > second else 1
+
+    def save(self):
+        """Snapshot of both players, for load()"""
+        return tuple(player.snapshot() for player in self.players)
+
+    def load(self, snapshot):
+        """Go back to a snapshot from save()"""
+        for player, saved in zip(self.players, snapshot):
+            player.restore(saved)
+
+
+class RollbackSession:
+    """One side of a networked race, GGPO style
+
+    Each frame the local input is sent to the peer and the frame is
+    simulated at once, predicting that the peer pressed nothing new. When
+    the peer's real input arrives and differs from the prediction, the race
+    is loaded from the snapshot taken before that frame and re-simulated up
+    to the present. Local input is delayed by input_delay frames to make
+    mispredictions rarer, and advance() refuses to run more than
+    max_rollback frames ahead of the last frame both inputs are known for.
+    Packets repeat every input the peer has not acknowledged, so lost
+    packets only cost time.
+    """
+
+    def __init__(self, player, link, seed, input_delay=INPUT_DELAY, max_rollback=MAX_ROLLBACK):
+        """Play as player (0 or 1) against the peer at the other end of link"""
+        self.player = player
+        self.remote = 1 - player
+        self.link = link
+        self.game = VersusGame(seed)
+        self.input_delay = input_delay
+        self.max_rollback = max_rollback
+        self.frame = 0  # Next frame to simulate
+        self.confirmed = -1  # Last frame simulated with both inputs known
+        self.inputs = ({}, {})  # Known input of each player, by frame
+        self.predicted = {}  # Remote input assumed for frames simulated without it
+        self.snapshots = {}  # Race state before each unconfirmed frame
+        self.received = -1  # Last remote input frame received with none missing before it
+        self.acked = -1  # Last local input frame the peer has received
+        self.forgotten = -1  # Last local input frame dropped
+        self.rollbacks = 0
+        self.resimulated = 0
+        for frame in range(input_delay):
+            self.inputs[player][frame] = ACTION_NONE
+
+    def advance(self, action):
+        """Simulate the next frame with the local action; False if waiting for the peer
+
+        When it returns False the action was not used; pass it again.
+        """
+        self.poll()
+        if self.frame - self.confirmed > self.max_rollback:
+            self.send()
+            return False
+        self.inputs[self.player][self.frame + self.input_delay] = action
+        self.send()
+        self._simulate(self.frame)
+        self.frame += 1
+        self._confirm()
+        return True
+
+    def poll(self):
+        """Read the peer's packets and roll back if they prove a prediction wrong"""
+        remote_inputs = self.inputs[self.remote]
+        for packet in self.link.receive():
+            ack, first, count = PACKET_HEADER.unpack_from(packet)
+            self.acked = max(self.acked, ack)
+            for offset, action in enumerate(packet[PACKET_HEADER.size:PACKET_HEADER.size + count]):
+                if first + offset > self.received:  # Older ones are repeats
+                    remote_inputs.setdefault(first + offset, action)
+        while self.received + 1 in remote_inputs:
+            self.received += 1
+
+        # Roll back to the first frame simulated with a wrong guess
+        wrong = [frame for frame, guess in self.predicted.items()
+                 if frame in remote_inputs and remote_inputs[frame] != guess]
+        if wrong:
+            start = min(wrong)
+            self.rollbacks += 1
+            self.resimulated += self.frame - start
+            self.game.load(self.snapshots[start])
+            for frame in range(start, self.frame):
+                self._simulate(frame)
+        self._confirm()
+
+    def send(self):
+        """Send the peer every local input it has not acknowledged"""
+        local_inputs = self.inputs[self.player]
+        first = self.acked + 1
+        last = self.frame + self.input_delay
+        actions = bytes(local_inputs[frame] for frame in range(first, min(last + 1, first + 255))
+                        if frame in local_inputs)
+        self.link.send(PACKET_HEADER.pack(self.received, first, len(actions)) + actions)
+
+    def _simulate(self, frame):
+        """Save the race and simulate frame with the best inputs known"""
+        self.snapshots[frame] = self.game.save()
+        remote = self.inputs[self.remote].get(frame)
+        if remote is None:
+            remote = ACTION_NONE  # Inputs are edges: most frames have none
+            self.predicted[frame] = remote
+        else:
+            self.predicted.pop(frame, None)
+        actions = [None, None]
+        actions[self.player] = self.inputs[self.player][frame]
+        actions[self.remote] = remote
+        self.game.step(actions)
+
+    def _confirm(self):
+        """Forget snapshots, guesses and inputs for frames that can no longer change
+
+        Local inputs are kept until the peer has them and no rollback can
+        re-simulate them.
+        """
+        confirmed = min(self.received, self.frame - 1)
+        for frame in range(self.confirmed + 1, confirmed + 1):
+            self.predicted.pop(frame, None)
+            self.snapshots.pop(frame, None)
+            self.inputs[self.remote].pop(frame, None)
+        self.confirmed = max(self.confirmed, confirmed)
+
+        local_inputs = self.inputs[self.player]
+        for frame in range(self.forgotten + 1, min(self.acked, self.confirmed) + 1):
+            local_inputs.pop(frame, None)
+        self.forgotten = max(self.forgotten, min(self.acked, self.confirmed))
+
+
+class UdpLink:
+    """Datagram link between two sessions"""
+
+    def __init__(self, address=("127.0.0.1", 0), peer=None):
+        """Bind a non-blocking UDP socket to address and send to peer"""
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+        self.socket.bind(address)
+        self.peer = peer
+
+    @property
+    def address(self):
+        """Address the peer should send to"""
+        return self.socket.getsockname()
+
+    def send(self, data):
+        """Send a packet to the peer (lost packets are not retried here)"""
+        self.socket.sendto(data, self.peer)
+
+    def receive(self):
+        """Packets waiting to be read"""
+        packets = []
+        while True:
+            try:
+                data, _ = self.socket.recvfrom(2048)
+            except (BlockingIOError, ConnectionResetError):
+                return packets
+            packets.append(data)
+
+    def close(self):
+        """Close the socket"""
+        self.socket.close()
+
+
+class LossyLink:
+    """Wraps a link to drop and delay incoming packets like a bad network
+
+    Packets are lost with probability loss and otherwise delivered
+    latency (plus up to jitter) later, timed by clock.
+    """
+
+    def __init__(self, link, latency=0.0, jitter=0.0, loss=0.0, seed=None, clock=time.monotonic):
+        """Wrap link"""
+        self.link = link
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.in_flight = []  # Heap of (delivery time, order, packet)
+        self.order = 0
+        self.dropped = 0
+
+    def send(self, data):
+        """Send a packet through the wrapped link (only incoming packets are dropped or delayed)"""
+        self.link.send(data)
+
+    def receive(self):
+        """Packets whose delivery time has come"""
+        now = self.clock()
+        for data in self.link.receive():
+            if self.rng.random() < self.loss:
+                self.dropped += 1
+                continue
+            self.order += 1
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            heapq.heappush(self.in_flight, (now + delay, self.order, data))
+        packets = []
+        while self.in_flight and self.in_flight[0][0] <= now:
+            packets.append(heapq.heappop(self.in_flight)[2])
+        return packets
+
+
+""" Functions """
+def play(session, render_fps=RENDER_FPS):
+    """Race in a window: the local bird in front, the other player's as a ghost"""
+    pygame.init()
+    init_audio()
+    screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+    pygame.display.set_caption(f"FlappyPy versus (player {session.player + 1})")
+    asset_manager.preload()
+    atlas = build_sprite_atlas()
+    font = load_font()
+    text_cache = TextCache(font)
+    renderer = Renderer(screen, BACKGROUND_COLOR, dirty_rects=False)
+    ghosts = {}
+    for flying, filename in ((False, "bird.png"), (True, "bird-spaced.png")):
+        ghosts[flying] = asset_manager.image(filename).copy()
+        ghosts[flying].set_alpha(GHOST_ALPHA)
+    clock = pygame.time.Clock()
+    timestep = FixedTimestep(FPS)
+
+    pending = ACTION_NONE
+    running = True
+    while running:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type in (pygame.KEYDOWN, pygame.KEYUP) and event.key == pygame.K_SPACE:
+                action = ACTION_FLAP if event.type == pygame.KEYDOWN else ACTION_RELEASE
+                if action == ACTION_FLAP or pending == ACTION_NONE:
+                    pending = action
+
+        # Keep advancing after the race ends: the peer still needs our inputs
+        for _ in range(timestep.advance()):
+            if session.advance(pending):
+                pending = ACTION_NONE
+
+        # Follow the other bird once ours has crashed
+        game = session.game
+        local = game.players[session.player].state
+        remote = game.players[session.remote].state
+        extra = []
+        if local.game_over and not remote.game_over:
+            shown = remote
+        else:
+            shown = local
+            if not remote.game_over:
+                extra.append((ghosts[remote.bird.is_flying], (int(remote.bird.x), int(remote.bird.y))))
+        if game.over:
+            winner = game.winner()
+            message = "Draw" if winner is None else "You win!" if winner == session.player else "You lose"
+            extra.append((text_cache.render(message, True, (255, 215, 0)), (WINDOW_WIDTH // 2 - 50, WINDOW_HEIGHT // 2)))
+        draw_frame(screen, renderer, atlas, text_cache, shown, extra=extra)
+        renderer.present()
+        clock.tick(IDLE_FPS if game.over else render_fps)
+
+    logger.info("Race ended after %d rollbacks (%d frames re-simulated)", session.rollbacks, session.resimulated)
+    pygame.quit()
+
+
+def main(argv=None):
+    """Command line: race another player over UDP"""
+    parser = argparse.ArgumentParser(prog="python -m FlappyPy.versus", description="FlappyPy versus race")
+    parser.add_argument("--player", type=int, choices=(1, 2), required=True, help="1 or 2 (one on each side)")
+    parser.add_argument("--port", type=int, required=True, help="local UDP port")
+    parser.add_argument("--peer", required=True, help="host:port of the other player")
+    parser.add_argument("--seed", type=int, required=True, help="course seed (the same on both sides)")
+    parser.add_argument("--latency", type=float, default=0.0, help="extra incoming delay in seconds, for testing")
+    parser.add_argument("--loss", type=float, default=0.0, help="incoming packet loss rate, for testing")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    host, port = args.peer.rsplit(":", 1)
+    link = UdpLink(("0.0.0.0", args.port), (host, int(port)))
+    if args.latency or args.loss:
+        link = LossyLink(link, args.latency, loss=args.loss)
+    play(RollbackSession(args.player - 1, link, args.seed))
+    return 0
+
+
+""" Entry Point """
+if __name__ == "__main__":
+    sys.exit(main())
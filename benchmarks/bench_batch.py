@@ -0,0 +1,57 @@
+"""Throughput of the scalar Simulation versus BatchSimulation
+
+Run from the repository root:
+
+    python -m benchmarks.bench_batch --envs 4096 --frames 2000
+"""
+
+import argparse
+import random
+import time
+
+import numpy as np
+
+from FlappyPy.main import Simulation, ACTION_NONE, ACTION_FLAP
+from FlappyPy.batch import BatchSimulation
+
+
+def bench_scalar(frames, seed):
+    """Frames per second of a single scalar Simulation with restarts"""
+    policy = random.Random(seed)
+    simulation = Simulation(rng=random.Random(seed))
+    start = time.perf_counter()
+    for _ in range(frames):
+        if simulation.state.game_over:
+            simulation.reset()
+        action = ACTION_FLAP if policy.random() < 0.08 else ACTION_NONE
+        simulation.step(action)
+    return frames / (time.perf_counter() - start)
+
+
+def bench_batch(n_envs, frames, seed):
+    """Environment-frames per second of a BatchSimulation"""
+    policy = np.random.default_rng(seed)
+    batch = BatchSimulation(n_envs, seed=seed)
+    start = time.perf_counter()
+    for _ in range(frames):
+        actions = np.where(policy.random(n_envs) < 0.08, ACTION_FLAP, ACTION_NONE)
+        batch.step(actions)
+    return n_envs * frames / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--envs", type=int, default=4096, help="number of batched games")
+    parser.add_argument("--frames", type=int, default=2000, help="frames to simulate")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    scalar = bench_scalar(args.frames * 10, args.seed)
+    batch = bench_batch(args.envs, args.frames, args.seed)
+    print(f"scalar Simulation:  {scalar:>14,.0f} frames/s")
+    print(f"BatchSimulation({args.envs}): {batch:>14,.0f} env-frames/s")
+    print(f"speedup: {batch / scalar:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Memory used per Bird, Pipe and Score instance, with and without __slots__
+
+Each class is measured next to a dict-backed reference: a plain class
+holding the same fields in an instance __dict__, as the classes did
+before they used __slots__. Run from the repository root:
+
+    python -m benchmarks.bench_memory --count 100000
+"""
+
+import argparse
+import os
+import tracemalloc
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from FlappyPy.main import Bird, Pipe, Score, asset_manager, PIPE_X_START, GAP_CENTER_MIN
+
+
+def bytes_per_instance(factory, count):
+    """Average bytes allocated for each of count live objects built by factory"""
+    factory()  # Load shared assets outside the measurement
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        objects = [factory() for _ in range(count)]
+        end, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Don't charge the list holding the objects to them
+    return (end - start) / count - 8, objects
+
+
+def dict_backed(cls, factory):
+    """Factory building a dict-backed copy of each object factory builds, field for field"""
+    reference = type(f"{cls.__name__}Dict", (), {})  # A class per type, so instance dicts share keys
+
+    def build():
+        original = factory()
+        copy = reference()
+        for name in cls.__slots__:
+            setattr(copy, name, getattr(original, name))
+        return copy
+
+    return build
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="instances to build of each class")
+    args = parser.parse_args()
+
+    asset_manager.preload()
+    factories = {
+        Bird: Bird,
+        Pipe: lambda: Pipe(PIPE_X_START, GAP_CENTER_MIN),
+        Score: Score,
+    }
+    print(f"{'':<6} {'slots':>8} {'dict':>8}  bytes/instance")
+    for cls, factory in factories.items():
+        slotted, _ = bytes_per_instance(factory, args.count)
+        unslotted, _ = bytes_per_instance(dict_backed(cls, factory), args.count)
+        print(f"{cls.__name__:<6} {slotted:>8.1f} {unslotted:>8.1f}  ({1 - slotted / unslotted:.0%} smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Replay size and verification speed
+
+Records games with the reference bot, then verifies them one by one and
+batched. Run from the repository root:
+
+    python -m benchmarks.bench_replay --replays 1000 --frames 3600
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from FlappyPy.main import Simulation, ACTION_NONE
+from FlappyPy.replay import ReplayRecorder, verify_replay, verify_replays
+from FlappyPy.rollout import follow_gap
+
+
+def record(seed, frames):
+    """Record a game of the reference bot, cut after frames"""
+    recorder = ReplayRecorder(seed)
+    simulation = Simulation(seed=seed)
+    state = simulation.state
+    while not state.game_over and state.frame < frames:
+        action = follow_gap(state)
+        if action != ACTION_NONE:
+            simulation.apply_action(action)
+            recorder.record(action)
+        recorder.tick()
+        state, _ = simulation.step()
+    return recorder.finish(state)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--replays", type=int, default=1000, help="games to record and verify")
+    parser.add_argument("--frames", type=int, default=3600, help="length of each game")
+    args = parser.parse_args()
+
+    replays = [record(seed, args.frames) for seed in range(args.replays)]
+    sizes = [len(replay.to_bytes()) for replay in replays]
+    print(f"{args.frames} frames: {sum(sizes) / len(sizes):.0f} bytes per replay on average")
+
+    start = time.perf_counter()
+    assert all(verify_replay(replay) for replay in replays)
+    serial = time.perf_counter() - start
+    start = time.perf_counter()
+    assert all(verify_replays(replays))
+    batched = time.perf_counter() - start
+    print(f"one by one: {serial:.2f}s for {args.replays} replays")
+    print(f"batched:    {batched:.2f}s for {args.replays} replays")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Cost of rollback in a versus race: saving, loading and re-simulating frames
+
+Plays a seeded race with the reference bot on both sides and times
+VersusGame.save() and load(), and the worst case of a rollback: loading
+the oldest snapshot and re-simulating max_rollback frames, compared with
+the 16 ms frame budget. Run from the repository root:
+
+    python -m benchmarks.bench_rollback --max-rollback 8
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from FlappyPy.main import FPS
+from FlappyPy.rollout import follow_gap
+from FlappyPy.versus import VersusGame, MAX_ROLLBACK
+
+FRAME_BUDGET = 1 / FPS
+
+
+def play(game):
+    """Advance both players by one frame with the bot"""
+    game.step([follow_gap(player.state) for player in game.players])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--max-rollback", type=int, default=MAX_ROLLBACK, help="frames re-simulated per rollback")
+    parser.add_argument("--frames", type=int, default=3000, help="race frames to measure over")
+    parser.add_argument("--seed", type=int, default=0, help="course seed")
+    args = parser.parse_args()
+
+    game = VersusGame(args.seed)
+    saving = loading = rollback = worst = 0.0
+    history = []
+    for _ in range(args.frames):
+        start = time.perf_counter()
+        history.append(game.save())
+        saving += time.perf_counter() - start
+        play(game)
+        if len(history) > args.max_rollback:
+            history.pop(0)
+
+        # Roll back to the oldest snapshot and catch up again
+        start = time.perf_counter()
+        game.load(history[0])
+        loading += time.perf_counter() - start
+        for _ in range(len(history)):
+            play(game)
+        elapsed = time.perf_counter() - start
+        rollback += elapsed
+        worst = max(worst, elapsed)
+
+    print(f"save: {saving / args.frames * 1e6:.1f} us, load: {loading / args.frames * 1e6:.1f} us")
+    print(f"rollback of {args.max_rollback} frames: {rollback / args.frames * 1e3:.3f} ms mean, "
+          f"{worst * 1e3:.3f} ms worst ({worst / FRAME_BUDGET:.1%} of a {FRAME_BUDGET * 1e3:.1f} ms frame)")
+
+
+if __name__ == "__main__":
+    main()
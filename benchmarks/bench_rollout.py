@@ -0,0 +1,42 @@
+"""Episodes per second of RolloutRunner in one process versus across workers
+
+Run from the repository root:
+
+    python -m benchmarks.bench_rollout --episodes 400 --workers 4 --chunk-size 10
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from FlappyPy.rollout import RolloutRunner
+
+
+def bench(episodes, workers, chunk_size, max_frames):
+    """Episodes per second and the summary of one run"""
+    runner = RolloutRunner(workers=workers, chunk_size=chunk_size, max_frames=max_frames)
+    start = time.perf_counter()
+    summary = runner.run(range(episodes))
+    return episodes / (time.perf_counter() - start), summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--episodes", type=int, default=400, help="seeded episodes to play")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=None, help="episodes per worker task")
+    parser.add_argument("--max-frames", type=int, default=3600, help="frame limit per episode")
+    args = parser.parse_args()
+
+    serial, summary = bench(args.episodes, 0, args.chunk_size, args.max_frames)
+    parallel, _ = bench(args.episodes, args.workers, args.chunk_size, args.max_frames)
+    print(summary)
+    print(f"in process:    {serial:>10,.1f} episodes/s")
+    print(f"{args.workers} workers: {parallel:>10,.1f} episodes/s")
+    print(f"speedup: {parallel / serial:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""Load test of the game server: tick latency and sessions per core
+
+The server runs in this process; a separate client process opens the
+sessions over TCP and plays them with a simple bot, restarting after
+every game over. Run from the repository root:
+
+    python -m benchmarks.bench_server --sessions 100 250 500 1000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from FlappyPy.main import BIRD_START_Y, BIRD_HEIGHT, FPS
+from FlappyPy.server import (
+    GameServer, MessageReader, MSG_TICK, MSG_SPAWN, MSG_OVER, INPUT_FLAP, INPUT_RESTART,
+)
+
+
+class LoadClient(asyncio.Protocol):
+    """Bot connection: flaps when it sinks below the newest gap, restarts when it dies"""
+
+    def __init__(self):
+        self.reader = MessageReader()
+        self.target = BIRD_START_Y * 2  # In half pixels, like MSG_TICK
+        self.previous_y = None
+        self.ticks = 0
+        self.games = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        for message in self.reader.feed(data):
+            kind = message[0]
+            if kind == MSG_TICK:
+                self.ticks += 1
+                y = message[1] + BIRD_HEIGHT
+                if self.previous_y is not None and y >= self.previous_y and y > self.target + 40:
+                    self.transport.write(bytes([INPUT_FLAP]))
+                self.previous_y = y
+            elif kind == MSG_SPAWN:
+                self.target = message[1] * 2
+            elif kind == MSG_OVER:
+                self.games += 1
+                self.previous_y = None
+                self.transport.write(bytes([INPUT_RESTART]))
+
+
+async def play(port, sessions, seconds):
+    """Open sessions connections, play for seconds and return (ticks, games) received"""
+    loop = asyncio.get_running_loop()
+    clients = []
+    for _ in range(sessions):
+        _, client = await loop.create_connection(LoadClient, "127.0.0.1", port)
+        clients.append(client)
+    await asyncio.sleep(seconds)
+    for client in clients:
+        client.transport.close()
+    return sum(client.ticks for client in clients), sum(client.games for client in clients)
+
+
+def client_process(port, sessions, seconds, results):
+    """Entry point of the client process"""
+    results.put(asyncio.run(play(port, sessions, seconds)))
+
+
+async def measure(sessions, seconds):
+    """Serve sessions bot clients for seconds and return the server's tick statistics and client totals"""
+    server = GameServer(tick_samples=None)
+    _, port = await server.listen_tcp("127.0.0.1", 0)
+    ticking = asyncio.ensure_future(server.run())
+    results = multiprocessing.Queue()
+    clients = multiprocessing.Process(target=client_process, args=(port, sessions, seconds + 1, results))
+    clients.start()
+
+    # Measure once every session is connected
+    while len(server.sessions) < sessions:
+        await asyncio.sleep(0.05)
+    server.tick_times.clear()
+    await asyncio.sleep(seconds)
+    stats = server.tick_stats()
+
+    ticks, games = await asyncio.get_running_loop().run_in_executor(None, results.get)
+    clients.join()
+    server.stop()
+    ticking.cancel()
+    return stats, ticks, games
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=[100, 250, 500, 1000],
+                        help="concurrent sessions to test")
+    parser.add_argument("--seconds", type=float, default=5.0, help="measurement time per step")
+    args = parser.parse_args()
+
+    for sessions in args.sessions:
+        started = time.perf_counter()
+        stats, ticks, games = asyncio.run(measure(sessions, args.seconds))
+        elapsed = time.perf_counter() - started
+        budget = 1000 / FPS
+        per_core = sessions * budget / stats["mean"]
+        print(f"{sessions:>5} sessions: tick mean {stats['mean']:.2f} ms, p50 {stats['p50']:.2f}, "
+              f"p99 {stats['p99']:.2f} (budget {budget:.1f} ms), ~{per_core:,.0f} sessions/core; "
+              f"clients got {ticks / sessions / elapsed:.0f} ticks/s each over {games} games")
+
+
+if __name__ == "__main__":
+    main()
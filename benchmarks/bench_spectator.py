@@ -0,0 +1,68 @@
+"""Spectator stream bandwidth and local fan-out to many subscribers
+
+Plays seeded games with the reference bot and publishes every tick to a
+SpectatorChannel with the given number of subscribers, each decoding the
+stream into its own game state. Run from the repository root:
+
+    python -m benchmarks.bench_spectator --subscribers 1000 --seconds 60
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from FlappyPy.main import Simulation, FPS
+from FlappyPy.rollout import follow_gap
+from FlappyPy.spectator import SpectatorChannel, SpectatorDecoder, KEYFRAME_INTERVAL
+
+
+class ByteCounter:
+    """Subscriber that only counts bytes, to time the fan-out itself"""
+
+    def __init__(self):
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+
+def broadcast(subscribers, ticks, keyframe_interval):
+    """Publish ticks of play to the subscribers; return (channel, seconds spent publishing)"""
+    channel = SpectatorChannel(keyframe_interval)
+    for subscriber in subscribers:
+        channel.subscribe(subscriber)
+    simulation = Simulation(seed=0)
+    elapsed = 0.0
+    for _ in range(ticks):
+        if simulation.state.game_over:
+            simulation.reset()
+        simulation.step(follow_gap(simulation.state))
+        start = time.perf_counter()
+        channel.publish(simulation.state)
+        elapsed += time.perf_counter() - start
+    return channel, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subscribers", type=int, default=1000, help="spectators watching the game")
+    parser.add_argument("--seconds", type=float, default=60.0, help="game time to stream")
+    parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL, help="ticks between keyframes")
+    args = parser.parse_args()
+    ticks = int(args.seconds * FPS)
+
+    channel, sending = broadcast([ByteCounter() for _ in range(args.subscribers)], ticks, args.keyframe_interval)
+    decoders = [SpectatorDecoder() for _ in range(args.subscribers)]
+    _, decoding = broadcast(decoders, ticks, args.keyframe_interval)
+
+    rate = channel.bytes_published / args.seconds
+    print(f"{channel.messages} messages, {rate:.0f} bytes/s per spectator "
+          f"({channel.bytes_published / max(channel.messages, 1):.1f} bytes per message)")
+    print(f"fan-out to {args.subscribers}: {sending / ticks * 1e6:.0f} us per tick ({rate * args.subscribers / 1e3:.0f} kB/s total)")
+    print(f"with decoding: {decoding / ticks * 1e3:.2f} ms per tick ({decoding / args.seconds:.1%} of real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Time to first frame of a cold `python -m FlappyPy` start
+
+Each run starts a fresh interpreter with the SDL dummy video and audio
+drivers, runs main() and stops as soon as the first frame is presented.
+Run from the repository root:
+
+    python -m benchmarks.bench_startup --runs 10
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Child process: present the first frame, report it and exit immediately
+CHILD = """
+import os, sys
+import pygame
+
+def first_frame(*args, **kwargs):
+    sys.stdout.write("frame\\n")
+    sys.stdout.flush()
+    os._exit(0)
+
+pygame.display.flip = first_frame
+pygame.display.update = first_frame
+
+from FlappyPy.main import main
+main()
+"""
+
+
+def time_to_first_frame(root):
+    """Seconds from spawning the interpreter to its first presented frame"""
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYGAME_HIDE_SUPPORT_PROMPT="1", PYTHONPATH=root)
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, "-c", CHILD], cwd=root, env=env,
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    for line in child.stdout:
+        if line.strip() == "frame":
+            elapsed = time.perf_counter() - start
+            child.wait()
+            return elapsed
+    child.wait()
+    raise RuntimeError("FlappyPy exited before presenting a frame")
+
+
+def run(runs, root):
+    """Time several cold starts and summarize them in milliseconds"""
+    samples = [time_to_first_frame(root) * 1000 for _ in range(runs)]
+    return {
+        "runs": runs,
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="number of cold starts")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    result = run(args.runs, root)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"time to first frame over {result['runs']} runs: "
+              f"median {result['median_ms']:.1f} ms "
+              f"(min {result['min_ms']:.1f}, max {result['max_ms']:.1f})")
+
+
+if __name__ == "__main__":
+    main()
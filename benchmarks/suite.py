@@ -0,0 +1,241 @@
+"""Headless benchmark suite for the game's hot paths, with a JSON baseline check
+
+Measures simulation ticks per second, collision checks per second with
+several pipe counts, save state snapshots and restores per second, frame
+render time, game over screen time, restart latency and cold start time,
+all with the SDL dummy drivers. Run from the repository root:
+
+    python -m benchmarks.suite --save-baseline baseline.json
+    python -m benchmarks.suite --baseline baseline.json --threshold 0.15
+
+With --baseline the suite exits with status 1 when any result is worse
+than the baseline by more than the threshold (a fraction). Baselines are
+specific to the machine they were measured on.
+
+run_suite() opens and closes pygame's display itself unless the caller
+has already initialized it; only main() selects the SDL dummy drivers.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import pygame
+
+from FlappyPy.main import (
+    Simulation, Bird, Pipe, Score, asset_manager, build_sprite_atlas, build_game_over_screen,
+    show_game_over_screen, draw_frame, load_font,
+    WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_COLOR, BIRD_START_X, GAP_CENTER_MIN,
+)
+from FlappyPy.rendering import Renderer, TextCache
+from FlappyPy.rollout import follow_gap
+from benchmarks.bench_startup import run as run_startup
+
+PIPE_COUNTS = (1, 4, 16)
+DEFAULT_THRESHOLD = 0.10  # Allowed slowdown before a result counts as a regression
+
+
+def best_time(function, number, repeat):
+    """Fastest of repeat runs of number calls to function, in seconds per call"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def result(value, unit, higher_is_better):
+    """One benchmark result"""
+    return {"value": value, "unit": unit, "higher_is_better": higher_is_better}
+
+
+def bench_simulation(frames, repeat):
+    """Simulation ticks per second with the reference bot, restarting after each death"""
+    simulation = Simulation(seed=0)
+
+    def tick():
+        state = simulation.state
+        if state.game_over:
+            state = simulation.reset()
+        simulation.step(follow_gap(state))
+
+    return result(1 / best_time(tick, frames, repeat), "ticks/s", True)
+
+
+def bench_collisions(pipe_count, checks, repeat):
+    """Bird.check_collision_with_pipe calls per second against pipe_count pipes level with the bird"""
+    bird = Bird()
+    pipes = [Pipe(BIRD_START_X - index % 3, GAP_CENTER_MIN + index) for index in range(pipe_count)]
+
+    def check_all():
+        for pipe in pipes:
+            bird.check_collision_with_pipe(pipe)
+
+    return result(pipe_count / best_time(check_all, checks // pipe_count, repeat), "checks/s", True)
+
+
+def bench_snapshots(count, repeat):
+    """Simulation.snapshot() and restore() calls per second in a game with pipes on screen"""
+    simulation = Simulation(seed=0)
+    while simulation.state.frame < 600 and not simulation.state.game_over:
+        simulation.step(follow_gap(simulation.state))
+    snapshot = simulation.snapshot()
+    return {
+        "snapshots_per_sec": result(1 / best_time(simulation.snapshot, count, repeat), "snapshots/s", True),
+        "restores_per_sec": result(1 / best_time(lambda: simulation.restore(snapshot), count, repeat), "restores/s", True),
+    }
+
+
+def bench_render(screen, frames, repeat):
+    """Milliseconds to draw and present a mid-game frame, and to draw the pipes with Pipe.draw"""
+    simulation = Simulation(seed=0)
+    state = simulation.state
+    while state.frame < 600 and not state.game_over:
+        state, _ = simulation.step(follow_gap(state))
+    atlas = build_sprite_atlas()
+    text_cache = TextCache(load_font())
+    renderer = Renderer(screen, BACKGROUND_COLOR)
+
+    def frame():
+        draw_frame(screen, renderer, atlas, text_cache, state, 0.5)
+        renderer.present()
+
+    def pipes():
+        for pipe in state.pipes:
+            pipe.draw(screen, 0.5)
+
+    return {
+        "render_frame_ms": result(best_time(frame, frames, repeat) * 1000, "ms", False),
+        "pipe_draw_ms": result(best_time(pipes, frames, repeat) * 1000, "ms", False),
+    }
+
+
+def bench_game_over(screen, frames, repeat):
+    """Milliseconds to build and show the game over screen and present it"""
+    font = load_font()
+    score = Score()
+
+    def show():
+        show_game_over_screen(screen, font, score, build_game_over_screen(font, score, 10))
+        pygame.display.flip()
+
+    return result(best_time(show, frames, repeat) * 1000, "ms", False)
+
+
+def bench_restart(screen, restarts, repeat):
+    """Milliseconds from pressing space on the game over screen to the first new frame"""
+    simulation = Simulation(seed=0)
+    atlas = build_sprite_atlas()
+    text_cache = TextCache(load_font())
+    renderer = Renderer(screen, BACKGROUND_COLOR)
+    seeds = iter(range(restarts * repeat))
+
+    def restart():
+        state = simulation.reset(seed=next(seeds))
+        state, _ = simulation.step()
+        renderer.invalidate()
+        draw_frame(screen, renderer, atlas, text_cache, state)
+        renderer.present()
+
+    return result(best_time(restart, restarts, repeat) * 1000, "ms", False)
+
+
+def run_suite(scale=1.0, repeat=5, startup_runs=5):
+    """Run every benchmark and return {name: result}
+
+    scale multiplies the work per measurement; startup_runs=0 skips the
+    cold start benchmark.
+    """
+    work = lambda count: max(int(count * scale), 1)
+    results = {"sim_ticks_per_sec": bench_simulation(work(20000), repeat)}
+    for pipe_count in PIPE_COUNTS:
+        results[f"collisions_per_sec_{pipe_count}_pipes"] = bench_collisions(pipe_count, work(50000), repeat)
+    results.update(bench_snapshots(work(5000), repeat))
+
+    # Leave pygame running for a caller that already started it
+    owns_display = not pygame.display.get_init()
+    if owns_display:
+        pygame.display.init()
+    try:
+        screen = pygame.display.get_surface() or pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        asset_manager.preload()
+        results.update(bench_render(screen, work(500), repeat))
+        results["game_over_screen_ms"] = bench_game_over(screen, work(100), repeat)
+        results["restart_latency_ms"] = bench_restart(screen, work(200), repeat)
+    finally:
+        if owns_display:
+            pygame.quit()
+
+    if startup_runs:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        results["startup_ms"] = result(run_startup(startup_runs, root)["median_ms"], "ms", False)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Regressions of results against baseline as [(name, change)]
+
+    change is how much worse the result is, as a fraction of the baseline.
+    Benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        previous = baseline[name]["value"]
+        if previous <= 0:
+            continue
+        change = (current["value"] - previous) / previous
+        if current["higher_is_better"]:
+            change = -change
+        if change > threshold:
+            regressions.append((name, change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction of the baseline (default %(default)s)")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write the results as a new baseline")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the work per measurement")
+    parser.add_argument("--repeat", type=int, default=5, help="measurements per benchmark (the best is kept)")
+    parser.add_argument("--startup-runs", type=int, default=5, help="cold starts to time (0 skips them)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    results = run_suite(args.scale, args.repeat, args.startup_runs)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    for name, current in results.items():
+        line = f"{name:<30} {current['value']:>14,.3f} {current['unit']}"
+        if baseline and name in baseline:
+            previous = baseline[name]["value"]
+            line += f"   (baseline {previous:,.3f}, {(current['value'] - previous) / previous:+.1%})"
+        print(line)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, "w") as file:
+                json.dump(results, file, indent=2)
+
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, change in regressions:
+        print(f"REGRESSION {name}: {change:.1%} worse than the baseline (threshold {args.threshold:.0%})")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+import unittest
+from unittest import mock
+import asyncio
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy import main as game
+from FlappyPy.main import FPS
+from FlappyPy.timing import FixedTimestep
+
+class FakeClock:
+    """Time source moved forward by the test, and by step on every reading"""
+
+    def __init__(self, step=0.0):
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+class InstantPacer:
+    """Frame pacer that yields to the event loop without waiting"""
+
+    async def wait(self, fps):
+        await asyncio.sleep(0)
+
+class GameLoopTestCase(unittest.TestCase):
+    """Base for tests that run the game loop headless on scripted input"""
+
+    def setUp(self):
+        """Use dummy audio so the game can start headless, and clean up pygame after each test"""
+        audio = mock.patch.dict(os.environ, {"SDL_AUDIODRIVER": "dummy"})
+        audio.start()
+        self.addCleanup(audio.stop)
+        self.addCleanup(pygame.quit)
+        self.calls = 0
+
+    def script(self, frame):
+        """Return the events for the given frame, counted from 1"""
+        return []
+
+    def scripted_events(self):
+        """Stand-in for pygame.event.get() that plays script() one frame per call"""
+        self.calls += 1
+        return self.script(self.calls)
+
+    def play_main(self, **kwargs):
+        """Run main() on the scripted events with one tick per frame until it exits"""
+        timestep = lambda rate: FixedTimestep(rate, time_source=FakeClock(1 / FPS + 1e-9))
+        with mock.patch("pygame.event.get", self.scripted_events), \
+                mock.patch("FlappyPy.timing.FixedTimestep", timestep), \
+                mock.patch("FlappyPy.timing.FramePacer", InstantPacer):
+            with self.assertRaises(SystemExit):
+                game.main(**kwargs)
@@ -0,0 +1,92 @@
+import unittest
+from unittest import mock
+import sys
+import os
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy import main as game
+from FlappyPy.main import AssetManager, Bird, IMAGE_FILES, MUSIC_FILES
+
+class TestAssetManager(unittest.TestCase):
+    """Unit tests for the process-wide asset cache"""
+
+    def setUp(self):
+        """Open a window and start from an empty cache"""
+        pygame.init()
+        pygame.display.set_mode((100, 100))
+        self.assets = AssetManager()
+
+    def test_image_loaded_once(self):
+        """Test that repeated requests for an image read the file once"""
+        with mock.patch.object(game, "load_image", wraps=game.load_image) as load_image:
+            first = self.assets.image("bird.png")
+            for _ in range(5):
+                self.assertIs(self.assets.image("bird.png"), first)
+        load_image.assert_called_once_with("bird.png", convert=False)
+        self.assertEqual((self.assets.hits, self.assets.misses), (5, 1))
+
+    def test_headless_image_converted_without_reloading(self):
+        """Test that an image loaded before the window opened is converted from memory"""
+        pygame.display.quit()
+        headless = self.assets.image("bird.png")
+
+        pygame.display.init()
+        pygame.display.set_mode((100, 100))
+        with mock.patch.object(game, "load_image") as load_image:
+            converted = self.assets.image("bird.png")
+            self.assertIs(self.assets.image("bird.png"), converted)
+        load_image.assert_not_called()
+        self.assertEqual(converted.get_size(), headless.get_size())
+
+    def test_worker_threads_decode_once_without_converting(self):
+        """Test that concurrent requests from worker threads read the file once and leave conversion to the main thread"""
+        with mock.patch.object(game, "load_image", wraps=game.load_image) as load_image, \
+                ThreadPoolExecutor(max_workers=4) as pool:
+            images = list(pool.map(self.assets.image, ["bird.png"] * 8))
+        load_image.assert_called_once_with("bird.png", convert=False)
+        self.assertTrue(all(image is images[0] for image in images))
+        self.assertFalse(self.assets.images["bird.png"][1], "Not converted on a worker thread")
+
+        converted = self.assets.image("bird.png")
+        self.assertTrue(self.assets.images["bird.png"][1])
+        self.assertIs(self.assets.image("bird.png"), converted)
+
+    def test_music_path_resolved_once(self):
+        """Test that music files are resolved once"""
+        with mock.patch.object(game, "load_music", wraps=game.load_music) as load_music:
+            path = self.assets.music("music.mp3")
+            self.assertEqual(self.assets.music("music.mp3"), path)
+        load_music.assert_called_once()
+
+    def test_preload_makes_restarts_free(self):
+        """Test that after preloading, building birds does no file I/O"""
+        with mock.patch.object(game, "asset_manager", self.assets):
+            self.assets.preload()
+            misses = self.assets.misses
+            self.assertGreaterEqual(misses, len(IMAGE_FILES) + len(MUSIC_FILES))
+
+            with mock.patch.object(game, "load_image") as load_image:
+                for _ in range(10):
+                    Bird()
+            load_image.assert_not_called()
+            self.assertEqual(self.assets.misses, misses)
+            self.assertGreater(self.assets.hits, 0)
+
+    def test_birds_share_sprites(self):
+        """Test that every Bird uses the same sprite surfaces"""
+        first, second = Bird(), Bird()
+        self.assertIs(first.falling_sprite, second.falling_sprite)
+        self.assertIs(first.flying_sprite, second.flying_sprite)
+
+    def test_clear(self):
+        """Test that clear() forgets cached assets"""
+        self.assets.image("bird.png")
+        self.assets.clear()
+        self.assets.image("bird.png")
+        self.assertEqual(self.assets.misses, 2)
+
+if __name__ == '__main__':
+    unittest.main()
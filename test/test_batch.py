@@ -0,0 +1,148 @@
+import unittest
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import (
+    Simulation, ACTION_NONE, ACTION_FLAP, EVENT_SCORE,
+    DEATH_PIPE, BIRD_START_Y, PIPE_X_START
+)
+
+try:
+    import numpy as np
+    from FlappyPy.batch import BatchSimulation, CAUSE_PIPE, CAUSE_GROUND, generate_courses
+except ImportError:
+    np = None
+
+class ScriptedRng:
+    """Random source that returns gap centers chosen by the test"""
+
+    def __init__(self):
+        self.next_value = None
+
+    def randint(self, low, high):
+        return self.next_value
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchSimulation(unittest.TestCase):
+    """Unit tests for the vectorized batch simulation"""
+
+    def test_initial_state(self):
+        """Test that every environment starts a fresh game"""
+        batch = BatchSimulation(8, seed=0)
+        self.assertTrue(np.all(batch.bird_y == BIRD_START_Y))
+        self.assertTrue(np.all(batch.bird_velocity == 0))
+        self.assertFalse(batch.pipe_active.any())
+        self.assertFalse(batch.game_over.any())
+
+    def test_matches_scalar_simulation(self):
+        """Test that each environment follows the scalar rules frame for frame"""
+        n_envs = 16
+        batch = BatchSimulation(n_envs, seed=1, auto_reset=False)
+        scalars = [Simulation(rng=ScriptedRng()) for _ in range(n_envs)]
+        policy = random.Random(2)
+
+        for _ in range(2000):
+            # Flap more often when low so that games last through several pipes
+            actions = np.array([
+                ACTION_FLAP if policy.random() < (0.25 if sim.state.bird.y > 300 else 0.02) else ACTION_NONE
+                for sim in scalars
+            ])
+            spawned_before = batch.spawn_count.copy()
+            scored, done = batch.step(actions)
+
+            for i, sim in enumerate(scalars):
+                if sim.state.game_over:
+                    continue
+
+                # Hand the gap the batch picked to the scalar game
+                if batch.spawn_count[i] != spawned_before[i]:
+                    slot = spawned_before[i] % batch.pipe_x.shape[1]
+                    sim.rng.next_value = int(batch.pipe_gap_center[i, slot])
+
+                state, events = sim.step(int(actions[i]))
+                self.assertEqual(state.bird.y, batch.bird_y[i])
+                self.assertEqual(state.bird.velocity, batch.bird_velocity[i])
+                self.assertEqual(state.score.get_current_score(), batch.score[i])
+                self.assertEqual(EVENT_SCORE in events, scored[i])
+                self.assertEqual(state.game_over, done[i])
+                self.assertEqual(
+                    sorted(p.x for p in state.pipes),
+                    sorted(batch.pipe_x[i][batch.pipe_active[i]])
+                )
+                if state.game_over:
+                    expected = CAUSE_PIPE if state.death_cause == DEATH_PIPE else CAUSE_GROUND
+                    self.assertEqual(batch.final_cause[i], expected)
+                    self.assertEqual(batch.final_frame[i], state.frame)
+
+            if all(sim.state.game_over for sim in scalars):
+                break
+
+        self.assertTrue(all(sim.state.game_over for sim in scalars))
+        self.assertGreater(batch.final_score.max(), 0, "Some game should have scored")
+
+    def test_auto_reset(self):
+        """Test that finished games restart automatically"""
+        batch = BatchSimulation(4, seed=0)
+        actions = np.zeros(4, dtype=np.int64)
+        done = np.zeros(4, dtype=bool)
+        while not done.all():
+            _, done = batch.step(actions)
+
+        self.assertTrue(np.all(batch.final_cause == CAUSE_GROUND))
+        self.assertFalse(batch.game_over.any())
+        self.assertTrue(np.all(batch.bird_y == BIRD_START_Y))
+        self.assertTrue(np.all(batch.frame == 0))
+
+    def test_frozen_without_auto_reset(self):
+        """Test that finished games stay frozen when auto_reset is off"""
+        batch = BatchSimulation(2, seed=0, auto_reset=False)
+        done = np.zeros(2, dtype=bool)
+        while not done.all():
+            _, done = batch.step(np.zeros(2))
+        y = batch.bird_y.copy()
+        batch.step(np.full(2, ACTION_FLAP))
+        self.assertTrue(np.all(batch.bird_y == y))
+
+    def test_pipes_spawn_off_screen(self):
+        """Test that spawned pipes start at the right edge"""
+        batch = BatchSimulation(3, seed=0)
+        for _ in range(120):
+            # Keep the birds in the air
+            batch.step(np.where(batch.bird_y > BIRD_START_Y, ACTION_FLAP, ACTION_NONE))
+        self.assertTrue(np.all(batch.pipe_active.sum(axis=1) == 1))
+        self.assertTrue(np.all(batch.pipe_x[batch.pipe_active] == PIPE_X_START))
+
+    def test_seeded_courses_match_scalar(self):
+        """Test that per-game courses reproduce seeded scalar games"""
+        seeds = [10, 11, 12]
+        batch = BatchSimulation(3, auto_reset=False, gap_centers=generate_courses(seeds, 20))
+        scalars = [Simulation(seed=seed) for seed in seeds]
+
+        for _ in range(600):
+            # Keep the birds in the air
+            actions = np.where(batch.bird_y > BIRD_START_Y, ACTION_FLAP, ACTION_NONE)
+            batch.step(actions)
+            for i, sim in enumerate(scalars):
+                state, _ = sim.step(int(actions[i]))
+                self.assertEqual(
+                    sorted(p.gap_center_y for p in state.pipes),
+                    sorted(batch.pipe_gap_center[i][batch.pipe_active[i]])
+                )
+
+    def test_same_seed_is_reproducible(self):
+        """Test that two batches with the same seed evolve identically"""
+        first = BatchSimulation(32, seed=5)
+        second = BatchSimulation(32, seed=5)
+        policy = np.random.default_rng(0)
+        for _ in range(500):
+            actions = np.where(policy.random(32) < 0.08, ACTION_FLAP, ACTION_NONE)
+            first.step(actions)
+            second.step(actions)
+        self.assertTrue(np.array_equal(first.pipe_gap_center, second.pipe_gap_center))
+        self.assertTrue(np.array_equal(first.bird_y, second.bird_y))
+
+if __name__ == '__main__':
+    unittest.main()
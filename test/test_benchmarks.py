@@ -0,0 +1,64 @@
+import unittest
+import json
+import subprocess
+import sys
+import os
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from benchmarks.suite import compare, result, PIPE_COUNTS
+
+class TestBaselineComparison(unittest.TestCase):
+    """Unit tests for comparing benchmark results with a baseline"""
+
+    def setUp(self):
+        """A baseline with a throughput and a latency"""
+        self.baseline = {
+            "ticks": result(1000.0, "ticks/s", True),
+            "frame_ms": result(2.0, "ms", False),
+        }
+
+    def test_within_threshold(self):
+        """Test that small changes, and improvements of any size, pass"""
+        results = {"ticks": result(950.0, "ticks/s", True), "frame_ms": result(1.0, "ms", False)}
+        self.assertEqual(compare(results, self.baseline, 0.1), [])
+
+    def test_slowdowns_are_regressions(self):
+        """Test that lower throughput and higher latency beyond the threshold fail"""
+        results = {"ticks": result(800.0, "ticks/s", True), "frame_ms": result(2.5, "ms", False)}
+        regressions = dict(compare(results, self.baseline, 0.1))
+        self.assertAlmostEqual(regressions["ticks"], 0.2)
+        self.assertAlmostEqual(regressions["frame_ms"], 0.25)
+        self.assertEqual(compare(results, self.baseline, 0.3), [])
+
+    def test_new_benchmarks_are_ignored(self):
+        """Test that results missing from the baseline are not compared"""
+        self.assertEqual(compare({"startup_ms": result(300.0, "ms", False)}, self.baseline), [])
+
+class TestSuite(unittest.TestCase):
+    """Unit tests for running the suite headless"""
+
+    def test_runs_every_benchmark(self):
+        """Test a tiny run of the suite without the cold starts
+
+        It runs in a process of its own, since it starts and stops pygame.
+        """
+        root = os.path.join(os.path.dirname(__file__), '..')
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "results.json")
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.suite", "--scale", "0.01", "--repeat", "1",
+                 "--startup-runs", "0", "--output", output],
+                cwd=root, check=True, stdout=subprocess.DEVNULL,
+            )
+            with open(output) as file:
+                results = json.load(file)
+        expected = {"sim_ticks_per_sec", "render_frame_ms", "pipe_draw_ms", "game_over_screen_ms", "restart_latency_ms",
+                    "snapshots_per_sec", "restores_per_sec"}
+        expected |= {f"collisions_per_sec_{count}_pipes" for count in PIPE_COUNTS}
+        self.assertEqual(set(results), expected)
+        self.assertTrue(all(value["value"] > 0 for value in results.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -105,6 +105,33 @@ class TestBird(unittest.TestCase):
         self.assertLessEqual(self.bird.x, 400, "Bird's x position should not exceed window width")
         self.assertLessEqual(self.bird.y, 600, "Bird's y position should not exceed window height")
 
+    def test_bird_is_slotted(self):
+        """Test that birds keep no per-instance dict"""
+        self.assertFalse(hasattr(self.bird, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.bird.color = (255, 0, 0)
+
+    def test_birds_do_not_share_collision_boxes(self):
+        """Test that each bird checks collisions with a box of its own (birds may step in different threads)"""
+        from FlappyPy.main import Bird, Pipe
+        other = Bird()
+        other.y = 500
+        pipe = Pipe(self.bird.x, 315)  # Gap from 240 to 390: only the other bird is in the pipe
+        self.assertTrue(other.check_collision_with_pipe(pipe))
+        self.assertFalse(self.bird.check_collision_with_pipe(pipe))
+        self.assertIsNot(self.bird._hitbox, other._hitbox)
+
+    def test_rect_follows_position(self):
+        """Test that rect and get_rect() always agree with x and y"""
+        self.bird.jump()
+        for _ in range(20):
+            self.bird.update()
+            self.assertEqual(self.bird.rect.topleft, (int(self.bird.x), int(self.bird.y)))
+            self.assertEqual(self.bird.get_rect().topleft, self.bird.rect.topleft)
+        self.bird.y = 123.7
+        self.assertEqual(self.bird.rect.y, 123)
+        self.assertEqual(self.bird.rect.size, self.bird.current_sprite.get_size())
+
 if __name__ == '__main__':
     unittest.main()
         
\ No newline at end of file
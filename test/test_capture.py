@@ -0,0 +1,107 @@
+import unittest
+import tempfile
+import io
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_COLOR
+from FlappyPy.capture import FrameRenderer, raw_pixel_format, write_raw_frames, export_png, export_video, PNG_PATTERN
+from FlappyPy.replay import record_policy
+from FlappyPy.rollout import follow_gap
+
+FRAME_BYTES = WINDOW_WIDTH * WINDOW_HEIGHT * 4
+
+class TestFrameRenderer(unittest.TestCase):
+    """Unit tests for drawing replay frames offscreen"""
+
+    def setUp(self):
+        """Record a short bot game"""
+        self.replay = record_policy(4, follow_gap, 400)
+
+    def tearDown(self):
+        """Clean up pygame after each test"""
+        pygame.quit()
+
+    def test_frame_ranges(self):
+        """Test that ranges and steps pick the right frames"""
+        renderer = FrameRenderer(self.replay)
+        self.assertEqual([frame for frame, _ in renderer.frames()], list(range(401)))
+        self.assertEqual([frame for frame, _ in renderer.frames(100, 130, 10)], [100, 110, 120])
+
+    def test_fast_forward_matches(self):
+        """Test that starting mid-replay draws the same frame as rendering from the start"""
+        renderer = FrameRenderer(self.replay)
+        expected = {frame: pygame.image.tobytes(surface, "RGB") for frame, surface in renderer.frames()
+                    if frame in (0, 250, 400)}
+        for frame in expected:
+            _, surface = next(renderer.frames(frame))
+            self.assertEqual(pygame.image.tobytes(surface, "RGB"), expected[frame])
+        self.assertNotEqual(expected[0], expected[250])
+
+    def test_raw_frames(self):
+        """Test that raw frames hold every pixel in the advertised format"""
+        renderer = FrameRenderer(self.replay)
+        output = io.BytesIO()
+        self.assertEqual(write_raw_frames(renderer.frames(0, 3), output), 3)
+        data = output.getvalue()
+        self.assertEqual(len(data), 3 * FRAME_BYTES)
+
+        pixel_format = raw_pixel_format(renderer.surface)
+        corner = data[FRAME_BYTES - 4:FRAME_BYTES]  # Bottom-right pixel is sky
+        channels = dict(zip(pixel_format, corner))
+        self.assertEqual((channels["r"], channels["g"], channels["b"]), BACKGROUND_COLOR)
+
+class TestExport(unittest.TestCase):
+    """Unit tests for exporting frames"""
+
+    def setUp(self):
+        """Record a short bot game and make an output directory"""
+        self.replay = record_policy(4, follow_gap, 200)
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Remove the output and clean up pygame"""
+        self.directory.cleanup()
+        pygame.quit()
+
+    def test_png_in_parallel_matches_serial(self):
+        """Test that worker processes render the same PNG frames"""
+        serial = os.path.join(self.directory.name, "serial")
+        parallel = os.path.join(self.directory.name, "parallel")
+        self.assertEqual(export_png(self.replay, serial, 20, 120, 5, workers=0), 20)
+        self.assertEqual(export_png(self.replay, parallel, 20, 120, 5, workers=2), 20)
+        self.assertEqual(sorted(os.listdir(parallel)), [PNG_PATTERN.format(frame) for frame in range(20, 120, 5)])
+        for name in os.listdir(serial):
+            images = [pygame.image.load(os.path.join(path, name)) for path in (serial, parallel)]
+            self.assertEqual(*(pygame.image.tobytes(image, "RGB") for image in images))
+
+    def test_png_range_past_the_end(self):
+        """Test that a start past the last frame exports nothing, with or without workers"""
+        for workers in (0, 2):
+            with self.subTest(workers=workers):
+                directory = os.path.join(self.directory.name, f"empty-{workers}")
+                self.assertEqual(export_png(self.replay, directory, self.replay.frames + 100, workers=workers), 0)
+                self.assertEqual(os.listdir(directory), [])
+
+    @unittest.skipIf(sys.platform == "win32", "uses a shell script in place of ffmpeg")
+    def test_video_streams_to_encoder(self):
+        """Test that every frame is piped to the encoder, which writes the output"""
+        encoder = os.path.join(self.directory.name, "fake-ffmpeg")
+        with open(encoder, "w") as file:
+            file.write('#!/bin/sh\nfor last; do :; done\ncat > "$last"\n')
+        os.chmod(encoder, 0o755)
+        output = os.path.join(self.directory.name, "clip.gif")
+        self.assertEqual(export_video(self.replay, output, 0, 10, ffmpeg=encoder), 10)
+        self.assertEqual(os.path.getsize(output), 10 * FRAME_BYTES)
+
+    def test_missing_encoder(self):
+        """Test that a missing ffmpeg is reported clearly"""
+        missing = os.path.join(self.directory.name, "no-such-ffmpeg")
+        with self.assertRaises(RuntimeError):
+            export_video(self.replay, os.path.join(self.directory.name, "clip.mp4"), 0, 5, ffmpeg=missing)
+
+if __name__ == '__main__':
+    unittest.main()
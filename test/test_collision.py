@@ -1,10 +1,12 @@
 import unittest
+from unittest import mock
 import sys
 import os
+import pygame
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from FlappyPy.main import Bird, Pipe, WINDOW_HEIGHT, PIPE_GAP
+from FlappyPy.main import Bird, Pipe, Simulation, WINDOW_HEIGHT, PIPE_GAP, PIPE_X_START
 
 class TestCollisionDetection(unittest.TestCase):
     """Unit tests for collision detection and game mechanics"""
@@ -115,5 +117,48 @@ class TestCollisionDetection(unittest.TestCase):
         self.bird.y = WINDOW_HEIGHT - 110  # In low gap
         self.assertFalse(self.bird.check_collision_with_pipe(low_pipe), "Bird should fit through low gap")
 
+    def test_pipe_rects_follow_pipe(self):
+        """Test that a pipe's cached collision rects move with it"""
+        for _ in range(5):
+            self.pipe.update()
+        self.assertEqual(self.pipe.top_rect, pygame.Rect(self.pipe.x, 0, self.pipe.width, self.pipe.top_height))
+        self.assertEqual(self.pipe.bottom_rect,
+                         pygame.Rect(self.pipe.x, self.pipe.bottom_y, self.pipe.width, self.pipe.bottom_height))
+
+    def test_pipe_rects_follow_reset(self):
+        """Test that reusing a pipe reshapes its collision rects"""
+        self.pipe.reset(250, 200)
+        self.assertEqual(self.pipe.top_rect, pygame.Rect(250, 0, self.pipe.width, 200 - PIPE_GAP // 2))
+        self.assertEqual(self.pipe.bottom_rect.topleft, (250, 200 + PIPE_GAP // 2))
+        self.assertEqual(self.pipe.bottom_rect.bottom, WINDOW_HEIGHT)
+
+    def test_collision_check_builds_no_rects(self):
+        """Test that collision checks reuse cached rectangles"""
+        self.bird.x = self.pipe.x + 10
+        self.bird.y = self.pipe.top_height - 10
+        with mock.patch("pygame.Rect", side_effect=AssertionError("Rect built")):
+            self.assertTrue(self.bird.check_collision_with_pipe(self.pipe))
+            self.bird.y = self.pipe.gap_center_y - self.bird.height // 2
+            self.assertFalse(self.bird.check_collision_with_pipe(self.pipe))
+
+    def test_collision_matches_get_rect(self):
+        """Test that the cached hitbox agrees with get_rect() at fractional positions"""
+        for y in (self.pipe.top_height - 0.5, self.pipe.top_height + 0.7, self.pipe.bottom_y - 30.2, self.pipe.bottom_y - 29.9):
+            self.bird.x = self.pipe.x
+            self.bird.y = y
+            rect = self.bird.get_rect()
+            expected = rect.colliderect(self.pipe.top_rect) or rect.colliderect(self.pipe.bottom_rect)
+            self.assertEqual(self.bird.check_collision_with_pipe(self.pipe), expected, f"Mismatch at y={y}")
+
+    def test_broadphase_skips_distant_pipes(self):
+        """Test that only pipes level with the bird get a collision check"""
+        simulation = Simulation(seed=0)
+        state = simulation.state
+        state.pipes.append(Pipe(PIPE_X_START - 100, WINDOW_HEIGHT // 2))
+        state.pipes.append(Pipe(PIPE_X_START, WINDOW_HEIGHT // 2))
+        with mock.patch.object(Bird, "check_collision_with_pipe") as check:
+            simulation.step()
+        check.assert_not_called()
+
 if __name__ == '__main__':
     unittest.main()
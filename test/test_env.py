@@ -0,0 +1,179 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import generate_gap_centers, BIRD_START_Y, DEATH_GROUND
+from FlappyPy.rollout import follow_gap
+
+try:
+    import numpy as np
+    from FlappyPy.env import (
+        FlappyEnv, FlappyVectorEnv, OBS_PIXELS, OBSERVATION_FEATURES,
+        PIXEL_HEIGHT, PIXEL_WIDTH, PIXEL_PIPE, PIXEL_BIRD, REWARD_ALIVE, REWARD_DEATH
+    )
+except ImportError:
+    np = None
+
+def hover_policy(observation):
+    """Flap whenever the bird is below the next gap"""
+    return int(observation[0] > observation[3] + 0.05)
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFlappyEnv(unittest.TestCase):
+    """Unit tests for the single-game environment"""
+
+    def setUp(self):
+        """Create an environment and start a game"""
+        self.env = FlappyEnv()
+        self.observation, self.info = self.env.reset(seed=0)
+
+    def test_reset_observation(self):
+        """Test that reset returns the feature vector of a fresh game"""
+        self.assertEqual(self.observation.shape, (len(OBSERVATION_FEATURES),))
+        self.assertEqual(self.observation.dtype, np.float32)
+        self.assertAlmostEqual(self.observation[0], BIRD_START_Y / 600 * 2 - 1)
+        self.assertEqual(self.observation[1], 0.0)
+        self.assertTrue(self.env.observation_space.contains(self.observation))
+        self.assertEqual(self.info["score"], 0)
+
+    def test_step_api(self):
+        """Test the (observation, reward, terminated, truncated, info) result"""
+        observation, reward, terminated, truncated, info = self.env.step(1)
+        self.assertLess(observation[1], 0, "Flapping should give upward velocity")
+        self.assertAlmostEqual(reward, REWARD_ALIVE)
+        self.assertFalse(terminated)
+        self.assertFalse(truncated)
+        self.assertEqual(info["frame"], 1)
+
+    def test_falling_terminates(self):
+        """Test that doing nothing ends the game on the ground"""
+        for _ in range(200):
+            _, reward, terminated, _, info = self.env.step(0)
+            if terminated:
+                break
+        self.assertTrue(terminated)
+        self.assertEqual(reward, REWARD_DEATH)
+        self.assertEqual(info["death_cause"], DEATH_GROUND)
+
+    def test_next_gap_features(self):
+        """Test that the features track the next pipe once it spawns"""
+        observation = self.observation
+        while len(self.env.simulation.state.pipes) == 0:
+            previous = observation
+            observation, *_ = self.env.step(hover_policy(observation))
+        pipe = self.env.simulation.state.pipes[0]
+        self.assertAlmostEqual(observation[3], pipe.gap_center_y / 600 * 2 - 1, places=5)
+        self.assertLess(observation[2], previous[2], "The next pipe only gets closer")
+
+    def test_truncation(self):
+        """Test that max_episode_steps truncates long games"""
+        env = FlappyEnv(max_episode_steps=10)
+        observation, _ = env.reset(seed=0)
+        for _ in range(10):
+            observation, _, terminated, truncated, _ = env.step(hover_policy(observation))
+        self.assertFalse(terminated)
+        self.assertTrue(truncated)
+
+    def test_same_seed_same_game(self):
+        """Test that reset(seed) makes episodes reproducible"""
+        runs = []
+        for _ in range(2):
+            observation, _ = self.env.reset(seed=5)
+            trajectory = []
+            for _ in range(400):
+                observation, reward, terminated, _, _ = self.env.step(hover_policy(observation))
+                trajectory.append((observation.tobytes(), reward))
+                if terminated:
+                    break
+            runs.append(trajectory)
+        self.assertEqual(runs[0], runs[1])
+
+    def test_pixel_observation(self):
+        """Test that pixel frames show the bird and the pipes"""
+        env = FlappyEnv(obs_type=OBS_PIXELS)
+        observation, _ = env.reset(seed=0)
+        self.assertEqual(observation.shape, (PIXEL_HEIGHT, PIXEL_WIDTH))
+        self.assertEqual(observation.dtype, np.uint8)
+        self.assertIn(PIXEL_BIRD, observation)
+        self.assertNotIn(PIXEL_PIPE, observation)
+
+        while len(env.simulation.state.pipes) == 0 or env.simulation.state.pipes[0].x > 300:
+            observation, *_ = env.step(int(env.simulation.state.bird.y > 300))
+        self.assertIn(PIXEL_PIPE, observation)
+        self.assertTrue(env.observation_space.contains(observation))
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestFlappyVectorEnv(unittest.TestCase):
+    """Unit tests for the vectorized environment"""
+
+    def test_shapes(self):
+        """Test that every result has a leading num_envs axis"""
+        env = FlappyVectorEnv(8)
+        observations, _ = env.reset(seed=0)
+        self.assertEqual(observations.shape, (8, len(OBSERVATION_FEATURES)))
+        observations, rewards, terminated, truncated, _ = env.step(env.action_space.sample())
+        self.assertEqual(observations.shape, (8, len(OBSERVATION_FEATURES)))
+        for result in (rewards, terminated, truncated):
+            self.assertEqual(result.shape, (8,))
+
+    def test_matches_single_env(self):
+        """Test that each game of the vector env matches FlappyEnv on the same course"""
+        course = generate_gap_centers(3, 64)
+        single = FlappyEnv(gap_centers=course)
+        vector = FlappyVectorEnv(4, gap_centers=course)
+        expected, _ = single.reset()
+        observations, _ = vector.reset()
+
+        for _ in range(600):
+            np.testing.assert_allclose(observations[0], expected, atol=1e-6)
+            action = hover_policy(expected)
+            expected, reward, terminated, _, _ = single.step(action)
+            observations, rewards, dones, _, info = vector.step(np.full(4, action))
+            self.assertAlmostEqual(rewards[0], reward)
+            self.assertEqual(dones[0], terminated)
+            if terminated:
+                np.testing.assert_allclose(info["final_observation"][0], expected, atol=1e-6)
+                break
+
+    def test_finished_games_restart(self):
+        """Test that ended games restart within the same step"""
+        env = FlappyVectorEnv(4)
+        env.reset(seed=0)
+        for _ in range(200):
+            observations, _, terminated, _, info = env.step(np.zeros(4, dtype=np.int64))
+            if terminated.any():
+                break
+        self.assertTrue(terminated.all())
+        self.assertTrue(info["_final_observation"].all())
+        self.assertGreater(info["final_observation"][0, 0], 0.8, "The last frame is on the ground")
+        np.testing.assert_allclose(observations[:, 0], BIRD_START_Y / 600 * 2 - 1)
+
+    def test_truncation(self):
+        """Test that max_episode_steps truncates and restarts games"""
+        env = FlappyVectorEnv(2, max_episode_steps=5)
+        env.reset(seed=0)
+        for _ in range(5):
+            _, _, terminated, truncated, info = env.step(np.array([1, 1]))
+        self.assertFalse(terminated.any())
+        self.assertTrue(truncated.all())
+        self.assertTrue(np.all(env.batch.frame == 0))
+
+    def test_pixel_observation_matches_single_env(self):
+        """Test that batched pixel frames equal single-game frames"""
+        course = generate_gap_centers(4, 64)
+        single = FlappyEnv(obs_type=OBS_PIXELS, gap_centers=course)
+        vector = FlappyVectorEnv(2, obs_type=OBS_PIXELS, gap_centers=course)
+        expected, _ = single.reset()
+        observations, _ = vector.reset()
+        for _ in range(300):
+            np.testing.assert_array_equal(observations[1], expected)
+            action = follow_gap(single.simulation.state)
+            expected, _, terminated, _, _ = single.step(action)
+            observations, *_ = vector.step(np.full(2, action))
+            if terminated:
+                break
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,11 +2,12 @@ import unittest
 import sys
 import os
 import pygame
+from unittest import mock
 
 # Add the FlappyPy package to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from FlappyPy.main import show_game_over_screen, Score, WINDOW_WIDTH, WINDOW_HEIGHT
+from FlappyPy.main import show_game_over_screen, build_game_over_screen, Score, WINDOW_WIDTH, WINDOW_HEIGHT
 
 class TestGameOverDisplay(unittest.TestCase):
     """Unit tests for game over display functionality"""
@@ -61,5 +62,40 @@ class TestGameOverDisplay(unittest.TestCase):
             
             self.assertTrue(success, f"Game over screen should work with score {score_value}")
 
+    def test_game_over_screen_does_not_flip(self):
+        """Test that drawing the game over screen leaves presenting to the caller"""
+        with mock.patch("pygame.display.flip") as flip:
+            show_game_over_screen(self.screen, self.font, self.score)
+        flip.assert_not_called()
+
+    def test_prebuilt_screen_skips_text_rendering(self):
+        """Test that a prebuilt game over screen is reused without rendering text"""
+        overlay = build_game_over_screen(self.font, self.score)
+        self.assertEqual(overlay.get_size(), (WINDOW_WIDTH, WINDOW_HEIGHT))
+
+        font = mock.Mock(spec=["render"])
+        for _ in range(10):
+            show_game_over_screen(self.screen, font, self.score, overlay)
+        font.render.assert_not_called()
+
+    def test_prebuilt_screen_matches_direct_drawing(self):
+        """Test that the prebuilt screen looks the same as drawing it directly"""
+        show_game_over_screen(self.screen, self.font, self.score)
+        direct = self.screen.copy()
+
+        self.screen.fill((0, 0, 255))
+        show_game_over_screen(self.screen, self.font, self.score, build_game_over_screen(self.font, self.score))
+        for point in [(0, 0), (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2), (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2 - 50)]:
+            self.assertEqual(self.screen.get_at(point), direct.get_at(point))
+
+    def test_best_score_line(self):
+        """Test that the personal best is rendered only when given"""
+        font = mock.Mock(spec=["render"])
+        font.render.side_effect = lambda text, antialias, color: pygame.Surface((len(text), 10))
+        build_game_over_screen(font, self.score)
+        self.assertEqual(font.render.call_count, 3)
+        build_game_over_screen(font, self.score, best_score=42)
+        self.assertEqual(font.render.call_args_list[-1][0][0], "Best Score: 42")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+from unittest import mock
+import tempfile
+import time
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy import history as histories
+from FlappyPy.history import RunHistory, RunRecord, LEADERBOARD_SIZE, RECORD, HISTORY_HEADER, RECORDS_OFFSET
+from FlappyPy.main import DEATH_PIPE, DEATH_GROUND
+from test.helpers import GameLoopTestCase
+
+def run(score, seed=0, cause=DEATH_PIPE):
+    """A logged game with the given score"""
+    return RunRecord(1700000000.0 + seed, score, score * 120 + 50, cause, seed)
+
+class TestRunHistory(unittest.TestCase):
+    """Unit tests for the memory-mapped run history"""
+
+    def setUp(self):
+        """Create a history file in a temporary directory"""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "runs", "history.fph")
+        self.history = RunHistory(self.path, flush_interval=60)
+
+    def tearDown(self):
+        """Close the history and remove its directory"""
+        self.history.close()
+        self.directory.cleanup()
+
+    def test_records_are_fixed_size(self):
+        """Test that every run takes the same small number of bytes"""
+        self.assertEqual(RECORD.size, 32)
+
+    def test_runs_persist(self):
+        """Test that runs survive closing and reopening the file"""
+        runs = [run(3, 1), run(0, 2, DEATH_GROUND), run(7, 3, None)]
+        for record in runs:
+            self.history.append(record)
+        self.history.close()
+
+        with RunHistory(self.path) as reopened:
+            self.assertEqual(len(reopened), 3)
+            self.assertEqual(list(reopened), runs)
+            self.assertEqual(reopened.personal_best(), runs[2])
+
+    def test_append_is_deferred(self):
+        """Test that append() only queues the run until a flush"""
+        self.history.append(run(5))
+        self.assertEqual(len(self.history), 1)
+        self.assertEqual(self.history.count, 0, "Nothing is written on the game thread")
+        self.assertEqual(self.history.personal_best().score, 5, "The leaderboard is updated at once")
+        self.history.flush()
+        self.assertEqual(self.history.count, 1)
+        self.assertEqual(self.history[0], run(5))
+
+    def test_background_flush(self):
+        """Test that the writer thread flushes queued runs by itself"""
+        self.history.close()
+        history = RunHistory(self.path, flush_interval=0.01)
+        history.append(run(2))
+        deadline = time.monotonic() + 5
+        while history.count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(history.count, 1)
+        history.close()
+
+    def test_leaderboard(self):
+        """Test that the leaderboard keeps the best runs, earlier runs winning ties"""
+        scores = [4, 9, 1, 9, 0, 6, 3, 12, 5, 2, 8, 7, 11, 1]
+        for seed, score in enumerate(scores):
+            self.history.append(run(score, seed))
+        board = self.history.leaderboard()
+        self.assertEqual(len(board), LEADERBOARD_SIZE)
+        self.assertEqual([r.score for r in board], sorted(scores, reverse=True)[:LEADERBOARD_SIZE])
+        self.assertEqual([r.seed for r in board if r.score == 9], [1, 3])
+        self.assertEqual(self.history.personal_best().seed, 7)
+
+    def test_open_reads_only_the_leaderboard(self):
+        """Test that opening a long history does not scan its runs"""
+        for seed in range(5000):
+            self.history.append(run(seed % 97, seed))
+        self.history.close()
+
+        with mock.patch.object(RunHistory, "__getitem__", autospec=True, side_effect=RunHistory.__getitem__) as get:
+            reopened = RunHistory(self.path)
+        self.assertLessEqual(get.call_count, LEADERBOARD_SIZE)
+        self.assertEqual(reopened.personal_best().score, 96)
+        self.assertEqual([r.score for r in reopened.leaderboard()], [96] * LEADERBOARD_SIZE)
+        self.assertEqual(len(reopened), 5000)
+        reopened.close()
+
+    def test_file_grows(self):
+        """Test appending past the capacity of the mapped file"""
+        self.history.close()
+        os.remove(self.path)
+        with mock.patch.object(histories, "GROW_RECORDS", 4):
+            history = RunHistory(self.path, flush_interval=60)
+            self.assertEqual(history.capacity, 4)
+            for seed in range(10):
+                history.append(run(seed, seed))
+                if seed % 3 == 0:
+                    history.flush()
+            history.close()
+        with RunHistory(self.path) as reopened:
+            self.assertEqual([r.seed for r in reopened], list(range(10)))
+
+    def test_rejects_other_files(self):
+        """Test that a file that is not a run history raises ValueError"""
+        path = os.path.join(self.directory.name, "other.bin")
+        with open(path, "wb") as file:
+            file.write(b"not a history" * 10)
+        with self.assertRaises(ValueError):
+            RunHistory(path)
+
+    def test_rejects_truncated_files(self):
+        """Test that a history cut short anywhere raises ValueError"""
+        path = os.path.join(self.directory.name, "runs.bin")
+        history = RunHistory(path)
+        for score in range(5):
+            history.append(RunRecord(0.0, score, 100, None, score))
+        history.close()
+        with open(path, "rb") as file:
+            data = file.read()
+
+        for size in (10, HISTORY_HEADER.size + 20, RECORDS_OFFSET + 2 * RECORD.size + 10):
+            with self.subTest(size=size):
+                with open(path, "wb") as file:
+                    file.write(data[:size])
+                with self.assertRaises(ValueError):
+                    RunHistory(path)
+
+class TestHistoryInGame(GameLoopTestCase):
+    """Unit tests for runs logged by the game loop"""
+
+    def script(self, frame):
+        """Never flap, restart after each game over and quit soon after the third game starts"""
+        events = []
+        if frame % 300 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        if frame > 610:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def test_every_game_is_logged(self):
+        """Test that main() logs each game and the one that was quit"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "history.fph")
+            self.play_main(history_path=path)
+
+            with RunHistory(path) as history:
+                runs = list(history)
+        self.assertEqual([r.death_cause for r in runs], [DEATH_GROUND, DEATH_GROUND, None])
+        self.assertTrue(all(r.frames > 0 for r in runs))
+        self.assertEqual(len({r.seed for r in runs}), 3, "Each game has its own seed")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -95,5 +95,17 @@ class TestPipe(unittest.TestCase):
         self.assertLessEqual(self.pipe.top_height, WINDOW_HEIGHT, "Top pipe shouldn't exceed screen height")
         self.assertLessEqual(self.pipe.bottom_y + self.pipe.bottom_height, WINDOW_HEIGHT, "Bottom pipe shouldn't exceed screen height")
 
+    def test_pipe_is_slotted(self):
+        """Test that pipes keep no per-instance dict"""
+        self.assertFalse(hasattr(self.pipe, "__dict__"))
+
+    def test_heights_follow_reset(self):
+        """Test that derived heights match the collision rects after reuse"""
+        self.pipe.reset(250, 200)
+        self.assertEqual(self.pipe.top_height, 200 - PIPE_GAP // 2)
+        self.assertEqual(self.pipe.bottom_y, 200 + PIPE_GAP // 2)
+        self.assertEqual(self.pipe.bottom_y + self.pipe.bottom_height, WINDOW_HEIGHT)
+        self.assertEqual(self.pipe.top_rect.height, self.pipe.top_height)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+from unittest import mock
+import tracemalloc
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import Simulation, Pipe, PipePool, PIPE_POOL_CAPACITY, PIPE_X_START, PIPE_WIDTH
+from FlappyPy.rollout import follow_gap
+
+class TestPipePool(unittest.TestCase):
+    """Unit tests for the ring buffer of reusable pipes"""
+
+    def setUp(self):
+        """Create an empty pool"""
+        self.pool = PipePool(capacity=3)
+
+    def test_spawn_and_iterate_in_order(self):
+        """Test that pipes come out oldest first"""
+        for gap in (200, 250, 300):
+            self.pool.spawn(PIPE_X_START, gap)
+        self.assertEqual(len(self.pool), 3)
+        self.assertEqual([pipe.gap_center_y for pipe in self.pool], [200, 250, 300])
+        self.assertEqual(self.pool[0].gap_center_y, 200)
+        self.assertEqual(self.pool[-1].gap_center_y, 300)
+
+    def test_spawn_reuses_slots(self):
+        """Test that despawned slots are reused instead of building new pipes"""
+        slots = list(self.pool.slots)
+        with mock.patch.object(Pipe, "__init__", side_effect=AssertionError("new Pipe built")):
+            for gap in range(200, 220):
+                self.pool.spawn(PIPE_X_START, gap)
+                self.pool.drop_oldest()
+        self.assertEqual(self.pool.slots, slots)
+
+    def test_spawn_resets_pipe(self):
+        """Test that a reused pipe behaves like a new one"""
+        pipe = self.pool.spawn(100, 250)
+        pipe.update()
+        pipe.scored = True
+        self.pool.drop_oldest()
+        for _ in range(3):
+            pipe = self.pool.spawn(PIPE_X_START, 300)
+            self.pool.drop_oldest()
+
+        fresh = Pipe(PIPE_X_START, 300)
+        self.assertFalse(pipe.scored)
+        self.assertEqual((pipe.x, pipe.previous_x, pipe.top_height, pipe.bottom_y),
+                         (fresh.x, fresh.previous_x, fresh.top_height, fresh.bottom_y))
+
+    def test_drop_oldest_wraps_around(self):
+        """Test despawning across the end of the ring"""
+        for gap in (200, 210, 220):
+            self.pool.spawn(PIPE_X_START, gap)
+        self.pool.drop_oldest(2)
+        self.pool.spawn(PIPE_X_START, 230)
+        self.pool.spawn(PIPE_X_START, 240)
+        self.assertEqual([pipe.gap_center_y for pipe in self.pool], [220, 230, 240])
+
+    def test_grows_when_full(self):
+        """Test that appending beyond capacity keeps every pipe"""
+        for gap in range(200, 205):
+            self.pool.append(Pipe(PIPE_X_START, gap))
+        self.assertEqual([pipe.gap_center_y for pipe in self.pool], list(range(200, 205)))
+
+    def test_index_out_of_range(self):
+        """Test that indexing past the live pipes fails"""
+        self.pool.spawn(PIPE_X_START, 200)
+        with self.assertRaises(IndexError):
+            self.pool[1]
+
+class TestSteadyStateAllocations(unittest.TestCase):
+    """Unit tests checking that a running game does not allocate per frame"""
+
+    def setUp(self):
+        """Warm up a game until pipes spawn and despawn regularly"""
+        self.simulation = Simulation(seed=1)
+        self.play(600)
+
+    def play(self, frames):
+        """Step the game with a simple autopilot"""
+        for _ in range(frames):
+            self.simulation.step(follow_gap(self.simulation.state))
+
+    def test_pipes_are_recycled(self):
+        """Test that no Pipe is built and the ring is never replaced"""
+        slots = self.simulation.state.pipes.slots
+        with mock.patch.object(Pipe, "__init__", side_effect=AssertionError("new Pipe built")):
+            self.play(2000)
+        self.assertFalse(self.simulation.state.game_over)
+        self.assertIs(self.simulation.state.pipes.slots, slots)
+        self.assertEqual(len(slots), PIPE_POOL_CAPACITY)
+
+    def test_memory_does_not_grow(self):
+        """Test with tracemalloc that thousands of frames leave no allocations behind"""
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            self.play(3000)
+            end, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertFalse(self.simulation.state.game_over, "The autopilot should survive")
+        self.assertLess(end - start, 1024, "Memory should not grow with the number of frames")
+        self.assertLess(peak - start, 4096, "Frames should only make short-lived allocations")
+
+    def test_offscreen_pipes_are_culled(self):
+        """Test that pipes leave the pool once fully off screen"""
+        for _ in range(500):
+            self.simulation.step(follow_gap(self.simulation.state))
+            for pipe in self.simulation.state.pipes:
+                self.assertGreater(pipe.x + PIPE_WIDTH, 0)
+
+if __name__ == '__main__':
+    unittest.main()
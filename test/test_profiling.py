@@ -0,0 +1,164 @@
+import unittest
+from unittest import mock
+import tempfile
+import csv
+import json
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy import profiling
+from FlappyPy.main import Simulation
+from FlappyPy.profiling import (
+    FrameProfiler, ProfiledSimulation, percentile, PHASE_NAMES,
+    PHASE_EVENTS, PHASE_BIRD, PHASE_COLLISIONS, PHASE_GAME, PHASE_RENDER,
+)
+from FlappyPy.rollout import follow_gap
+from test.helpers import GameLoopTestCase
+
+class FakeNanoseconds:
+    """perf_counter_ns() replacement advancing by step nanoseconds per reading"""
+
+    def __init__(self, step=1000):
+        self.now = 0
+        self.step = step
+
+    def __call__(self):
+        self.now += self.step
+        return self.now
+
+def record_frames(profiler, count):
+    """Record count frames where each marked phase takes one clock step"""
+    for _ in range(count):
+        profiler.begin_frame()
+        profiler.mark(PHASE_EVENTS)
+        profiler.mark(PHASE_RENDER)
+        profiler.end_frame()
+
+class TestFrameProfiler(unittest.TestCase):
+    """Unit tests for frame timing and statistics"""
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        ordered = list(range(1, 101))
+        self.assertEqual(percentile(ordered, 50), 50)
+        self.assertEqual(percentile(ordered, 99), 99)
+        self.assertEqual(percentile(ordered, 100), 100)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_marks_split_the_frame(self):
+        """Test that each mark charges its phase and add() is not counted twice"""
+        with mock.patch.object(profiling, "perf_counter_ns", FakeNanoseconds()):
+            profiler = FrameProfiler()
+            profiler.begin_frame()
+            profiler.mark(PHASE_EVENTS)
+            profiler.add(PHASE_BIRD, 300)
+            profiler.add(PHASE_COLLISIONS, 200)
+            profiler.mark(PHASE_GAME)
+            profiler.end_frame()
+
+        stats = profiler.stats()
+        self.assertAlmostEqual(stats["events"]["max"], 0.001)
+        self.assertAlmostEqual(stats["bird"]["max"], 0.0003)
+        self.assertAlmostEqual(stats["collisions"]["max"], 0.0002)
+        self.assertAlmostEqual(stats["game"]["max"], 0.0005, msg="The nested time is not counted twice")
+        self.assertAlmostEqual(stats["frame"]["max"], 0.003)
+
+    def test_ring_buffer_keeps_recent_frames(self):
+        """Test that only the last capacity frames are kept"""
+        profiler = FrameProfiler(capacity=4)
+        with mock.patch.object(profiling, "perf_counter_ns", FakeNanoseconds(1000)):
+            record_frames(profiler, 6)
+        with mock.patch.object(profiling, "perf_counter_ns", FakeNanoseconds(5000)):
+            record_frames(profiler, 2)
+        self.assertEqual(profiler.frames, 8)
+        self.assertEqual(len(profiler), 4)
+        stats = profiler.stats()["events"]
+        self.assertAlmostEqual(stats["p50"], 0.001)
+        self.assertAlmostEqual(stats["max"], 0.005)
+        self.assertAlmostEqual(stats["mean"], 0.003)
+
+    def test_export(self):
+        """Test writing the timings as CSV and JSON"""
+        profiler = FrameProfiler(capacity=3)
+        with mock.patch.object(profiling, "perf_counter_ns", FakeNanoseconds()):
+            record_frames(profiler, 5)
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "frames.csv")
+            json_path = os.path.join(directory, "frames.json")
+            profiler.export(csv_path)
+            profiler.export(json_path)
+            with open(csv_path, newline="") as file:
+                rows = list(csv.reader(file))
+            with open(json_path) as file:
+                data = json.load(file)
+            with self.assertRaises(ValueError):
+                profiler.export(os.path.join(directory, "frames.txt"))
+
+        self.assertEqual(rows[0], ["frame"] + list(PHASE_NAMES) + ["total"])
+        self.assertEqual([row[0] for row in rows[1:]], ["2", "3", "4"])
+        self.assertEqual([frame[0] for frame in data["frames"]], [2, 3, 4])
+        self.assertAlmostEqual(data["stats"]["frame"]["p99"], 0.003)
+
+    def test_overlay(self):
+        """Test that the overlay shows text only when enabled"""
+        pygame.font.init()
+        try:
+            profiler = FrameProfiler(overlay=True)
+            self.assertEqual(profiler.overlay_items(), [])
+            record_frames(profiler, 3)
+            items = profiler.overlay_items()
+            self.assertGreater(len(items), 1)
+            self.assertIs(profiler.overlay_items(), items, "Text is only rebuilt every few frames")
+            hidden = FrameProfiler()
+            record_frames(hidden, 3)
+            self.assertEqual(hidden.overlay_items(), [])
+        finally:
+            pygame.font.quit()
+
+class TestProfiledSimulation(unittest.TestCase):
+    """Unit tests for the timed simulation"""
+
+    def test_matches_simulation(self):
+        """Test that timing the step does not change the game"""
+        profiler = FrameProfiler()
+        timed = ProfiledSimulation(profiler, seed=5)
+        plain = Simulation(seed=5)
+        for _ in range(3000):
+            profiler.begin_frame()
+            state, events = timed.step(follow_gap(timed.state))
+            expected, expected_events = plain.step(follow_gap(plain.state))
+            profiler.end_frame()
+            self.assertEqual(events, expected_events)
+            self.assertEqual((state.bird.y, state.frame, state.score.get_current_score(), state.game_over),
+                             (expected.bird.y, expected.frame, expected.score.get_current_score(), expected.game_over))
+            if state.game_over:
+                break
+        self.assertGreater(state.score.get_current_score(), 0)
+        self.assertGreater(profiler.stats()["bird"]["max"], 0)
+
+class TestProfilingInGame(GameLoopTestCase):
+    """Unit tests for profiling the game loop"""
+
+    def script(self, frame):
+        """Never flap, and quit on the game over screen"""
+        return [pygame.event.Event(pygame.QUIT)] if frame > 400 else []
+
+    def test_main_exports_frame_times(self):
+        """Test that main() profiles every played frame and exports them"""
+        with tempfile.TemporaryDirectory() as directory:
+            profiler = FrameProfiler(overlay=True, export_path=os.path.join(directory, "frames.json"))
+            self.play_main(profiler=profiler)
+            with open(profiler.export_path) as file:
+                data = json.load(file)
+
+        self.assertGreater(profiler.frames, 0)
+        self.assertLess(profiler.frames, 400, "Game over frames are not profiled")
+        self.assertEqual(len(data["frames"]), profiler.frames)
+        for phase in ("events", "bird", "pipes", "collisions", "render", "present", "frame"):
+            self.assertIn(phase, data["stats"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import unittest
+from unittest import mock
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.rendering import Renderer, TextCache, SpriteAtlas
+from FlappyPy.main import (
+    Bird, Pipe, build_sprite_atlas, BACKGROUND_COLOR, PIPE_COLOR, WINDOW_WIDTH, WINDOW_HEIGHT,
+    SPRITE_BIRD_FALLING, SPRITE_BIRD_FLYING, SPRITE_PIPE
+)
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    """Unit tests for dirty-rectangle frame presentation"""
+
+    def setUp(self):
+        """Open a window and create a dirty-rect renderer on it"""
+        pygame.init()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.renderer = Renderer(self.screen, BACKGROUND_COLOR)
+
+    def tearDown(self):
+        """Clean up pygame after each test"""
+        pygame.quit()
+
+    def draw_frame(self, pipe, bird):
+        """Draw one frame and return the rects that were pushed"""
+        self.renderer.begin_frame()
+        self.renderer.add(pipe.draw(self.screen))
+        self.renderer.add(bird.draw(self.screen))
+        return self.renderer.present()
+
+    def test_draw_returns_covered_area(self):
+        """Test that Pipe.draw and Bird.draw report the area they covered"""
+        pipe = Pipe(200, WINDOW_HEIGHT // 2)
+        self.assertEqual(pipe.draw(self.screen), pygame.Rect(200, 0, pipe.width, WINDOW_HEIGHT))
+
+        bird = Bird()
+        rect = bird.draw(self.screen)
+        self.assertEqual(rect.topleft, (bird.x, bird.y))
+
+    def test_first_frame_is_full_flip(self):
+        """Test that the first frame repaints and flips the whole screen"""
+        with mock.patch("pygame.display.flip") as flip:
+            self.assertIsNone(self.draw_frame(Pipe(200, 300), Bird()))
+        flip.assert_called_once()
+
+    def test_later_frames_update_only_dirty_rects(self):
+        """Test that later frames push only old and new element areas"""
+        pipe, bird = Pipe(200, 300), Bird()
+        self.draw_frame(pipe, bird)
+
+        pipe.update()
+        bird.update()
+        with mock.patch("pygame.display.update") as update, mock.patch("pygame.display.flip") as flip:
+            rects = self.draw_frame(pipe, bird)
+        flip.assert_not_called()
+        update.assert_called_once_with(rects)
+        self.assertEqual(len(rects), 4, "Old and new rects for the pipe and the bird")
+        self.assertLess(sum(r.width * r.height for r in rects), WINDOW_WIDTH * WINDOW_HEIGHT)
+
+    def test_old_positions_are_erased(self):
+        """Test that a moved pipe leaves only background behind"""
+        pipe, bird = Pipe(200, 300), Bird()
+        self.draw_frame(pipe, bird)
+        for _ in range(30):
+            pipe.update()
+        with mock.patch("pygame.display.update"):
+            self.draw_frame(pipe, bird)
+
+        self.assertEqual(self.screen.get_at((265, 5))[:3], BACKGROUND_COLOR)
+        self.assertEqual(self.screen.get_at((pipe.x + 1, 5))[:3], PIPE_COLOR)
+
+    def test_invalidate_forces_full_flip(self):
+        """Test that invalidate() makes the next frame a full repaint"""
+        pipe, bird = Pipe(200, 300), Bird()
+        self.draw_frame(pipe, bird)
+        self.renderer.invalidate()
+        with mock.patch("pygame.display.flip") as flip:
+            self.assertIsNone(self.draw_frame(pipe, bird))
+        flip.assert_called_once()
+
+    def test_full_flip_fallback(self):
+        """Test that dirty_rects=False flips every frame"""
+        renderer = Renderer(self.screen, BACKGROUND_COLOR, dirty_rects=False)
+        with mock.patch("pygame.display.flip") as flip, mock.patch("pygame.display.update") as update:
+            for _ in range(3):
+                renderer.begin_frame()
+                renderer.add(Bird().draw(self.screen))
+                renderer.present()
+        self.assertEqual(flip.call_count, 3)
+        update.assert_not_called()
+
+class TestTextCache(unittest.TestCase):
+    """Unit tests for the rendered text cache"""
+
+    def setUp(self):
+        """Create a cache over a font that counts its renders"""
+        pygame.init()
+        self.font = mock.Mock(spec=["render"])
+        self.font.render.side_effect = lambda text, antialias, color: pygame.Surface((len(text), 10))
+        self.cache = TextCache(self.font, max_entries=3)
+
+    def test_repeated_text_is_rendered_once(self):
+        """Test that the same HUD text is rasterized only once"""
+        first = self.cache.render("Score: 0", True, (255, 255, 255))
+        for _ in range(100):
+            self.assertIs(self.cache.render("Score: 0", True, (255, 255, 255)), first)
+        self.assertEqual(self.font.render.call_count, 1)
+        self.assertEqual((self.cache.hits, self.cache.misses), (100, 1))
+
+    def test_key_includes_color_and_antialias(self):
+        """Test that color and antialiasing are part of the cache key"""
+        self.cache.render("Score: 1", True, (255, 255, 255))
+        self.cache.render("Score: 1", True, (255, 0, 0))
+        self.cache.render("Score: 1", False, (255, 255, 255))
+        self.assertEqual(self.font.render.call_count, 3)
+
+    def test_least_recently_used_is_evicted(self):
+        """Test that the least recently used string is evicted first"""
+        for text in ("a", "b", "c"):
+            self.cache.render(text, True, (0, 0, 0))
+        self.cache.render("a", True, (0, 0, 0))  # "b" is now the oldest
+        self.cache.render("d", True, (0, 0, 0))
+
+        self.assertEqual(len(self.cache.surfaces), 3)
+        self.cache.render("a", True, (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 4)
+        self.cache.render("b", True, (0, 0, 0))
+        self.assertEqual(self.font.render.call_count, 5)
+
+    def test_matches_font_render(self):
+        """Test that cached surfaces look like direct font renders"""
+        font = pygame.font.Font(None, 36)
+        cache = TextCache(font)
+        cached = cache.render("Score: 42", True, (255, 255, 255))
+        direct = font.render("Score: 42", True, (255, 255, 255))
+        self.assertEqual(cached.get_size(), direct.get_size())
+
+class TestSpriteAtlas(unittest.TestCase):
+    """Unit tests for the packed sprite atlas and batched drawing"""
+
+    def setUp(self):
+        """Open a window and build the game atlas"""
+        pygame.init()
+        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.atlas = build_sprite_atlas()
+
+    def tearDown(self):
+        """Clean up pygame after each test"""
+        pygame.quit()
+
+    def test_bird_frames_share_one_page(self):
+        """Test that both bird frames are packed into the same surface without overlap"""
+        falling_page, falling = self.atlas.areas[SPRITE_BIRD_FALLING]
+        flying_page, flying = self.atlas.areas[SPRITE_BIRD_FLYING]
+        self.assertIs(falling_page, flying_page)
+        self.assertFalse(falling.colliderect(flying))
+
+    def test_pipe_body_is_opaque(self):
+        """Test that the pipe body lives on the opaque page"""
+        page, _ = self.atlas.areas[SPRITE_PIPE]
+        self.assertIs(page, self.atlas.opaque_surface)
+        self.assertFalse(page.get_flags() & pygame.SRCALPHA)
+
+    def test_item_crops_to_height(self):
+        """Test that items can use only the top part of a sprite"""
+        _, dest, area = self.atlas.item(SPRITE_PIPE, (5, 6), 40)
+        self.assertEqual(dest, (5, 6))
+        self.assertEqual(area.height, 40)
+
+    def test_packing_preserves_pixels(self):
+        """Test that sprites are copied into the atlas unchanged"""
+        sprite = pygame.Surface((4, 4), pygame.SRCALPHA)
+        sprite.fill((10, 20, 30, 128))
+        atlas = SpriteAtlas({"a": sprite})
+        page, area = atlas.areas["a"]
+        self.assertEqual(page.get_at(area.topleft), sprite.get_at((0, 0)))
+
+    def test_batched_pipes_match_draw(self):
+        """Test that blitting pipes from the atlas looks like Pipe.draw"""
+        pipe = Pipe(150, 250)
+        self.screen.fill(BACKGROUND_COLOR)
+        pipe.draw(self.screen)
+        expected = self.screen.copy()
+
+        self.screen.fill(BACKGROUND_COLOR)
+        self.screen.blits(pipe.blit_items(self.atlas))
+        for point in [(150, 0), (219, 174), (150, 175), (219, 325), (150, 326), (219, 599), (149, 10), (220, 10)]:
+            self.assertEqual(self.screen.get_at(point), expected.get_at(point), f"Pixel {point} differs")
+
+    def test_bird_item_follows_sprite_state(self):
+        """Test that the bird uses its falling or flying frame from the atlas"""
+        bird = Bird()
+        self.assertEqual(bird.blit_item(self.atlas)[2], self.atlas.areas[SPRITE_BIRD_FALLING][1])
+        bird.flap()
+        self.assertEqual(bird.blit_item(self.atlas)[2], self.atlas.areas[SPRITE_BIRD_FLYING][1])
+        self.assertEqual(bird.blit_item(self.atlas)[1], (bird.x, bird.y))
+
+if __name__ == '__main__':
+    unittest.main()
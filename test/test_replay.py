@@ -0,0 +1,160 @@
+import unittest
+from unittest import mock
+import tempfile
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy import replay as replays
+from FlappyPy.main import Simulation, ACTION_NONE, ACTION_FLAP, ACTION_RELEASE, FPS
+from FlappyPy.replay import Replay, ReplayRecorder, simulate_replay, verify_replay, verify_replays
+from FlappyPy.rollout import follow_gap
+from test.helpers import GameLoopTestCase
+
+def record_game(seed, policy=follow_gap, max_frames=3000):
+    """Play a seeded game with policy, recording it like main() does"""
+    recorder = ReplayRecorder(seed)
+    simulation = Simulation(seed=seed)
+    state = simulation.state
+    while not state.game_over and state.frame < max_frames:
+        action = policy(state)
+        if action != ACTION_NONE:
+            simulation.apply_action(action)
+            recorder.record(action)
+        recorder.tick()
+        state, _ = simulation.step()
+    return recorder.finish(state)
+
+def flap_late(state):
+    """Bot that drops to the ground and then flaps"""
+    return ACTION_FLAP if state.frame > 20 and state.bird.y > 500 else ACTION_NONE
+
+class TestReplayFormat(unittest.TestCase):
+    """Unit tests for the binary replay format"""
+
+    def test_round_trip(self):
+        """Test that encoding and decoding keeps every field"""
+        replay = Replay(2**64 - 1, [(0, ACTION_FLAP), (5, ACTION_RELEASE), (1000, ACTION_FLAP)], 2000, 7, True)
+        decoded = Replay.from_bytes(replay.to_bytes())
+        self.assertEqual(
+            (decoded.seed, decoded.events, decoded.frames, decoded.score, decoded.game_over),
+            (replay.seed, replay.events, replay.frames, replay.score, replay.game_over)
+        )
+
+    def test_ten_minutes_fit_in_a_few_kb(self):
+        """Test that a ten-minute game with frequent flaps stays small"""
+        frames = 10 * 60 * FPS
+        events = []
+        for frame in range(0, frames - 8, 25):
+            events += [(frame, ACTION_FLAP), (frame + 8, ACTION_RELEASE)]
+        data = Replay(1, events, frames, 100, True).to_bytes()
+        self.assertLess(len(data), 4096)
+
+    def test_actions_per_frame(self):
+        """Test that frames without events are ACTION_NONE"""
+        replay = Replay(0, [(2, ACTION_FLAP), (4, ACTION_RELEASE)], 6, 0, False)
+        self.assertEqual(list(replay.actions()), [0, 0, ACTION_FLAP, 0, ACTION_RELEASE, 0])
+
+    def test_rejects_other_files(self):
+        """Test that foreign or damaged files raise ValueError"""
+        data = Replay(3, [(10, ACTION_FLAP)], 20, 0, True).to_bytes()
+        for bad in (b"PNG\x00" + data[4:], data[:10], data[:-1] + b"\x80", data[:-1] + b"\x7f"):
+            with self.assertRaises(ValueError):
+                Replay.from_bytes(bad)
+
+    def test_save_and_load(self):
+        """Test writing a replay to disk and reading it back"""
+        replay = record_game(11, max_frames=500)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game.fpr")
+            replay.save(path)
+            self.assertEqual(Replay.load(path).to_bytes(), replay.to_bytes())
+
+class TestReplayRecorder(unittest.TestCase):
+    """Unit tests for recording input frame by frame"""
+
+    def test_actions_belong_to_next_tick(self):
+        """Test that actions land on the frame of the following tick"""
+        recorder = ReplayRecorder(0)
+        recorder.tick()
+        recorder.record(ACTION_FLAP)
+        recorder.tick()
+        recorder.tick()
+        recorder.record(ACTION_RELEASE)
+        recorder.tick()
+        self.assertEqual(recorder.events, [(1, ACTION_FLAP), (3, ACTION_RELEASE)])
+
+    def test_flap_wins_within_a_frame(self):
+        """Test that a quick tap between two ticks keeps the flap"""
+        recorder = ReplayRecorder(0)
+        recorder.record(ACTION_FLAP)
+        recorder.record(ACTION_RELEASE)
+        recorder.tick()
+        recorder.record(ACTION_RELEASE)
+        recorder.record(ACTION_FLAP)
+        recorder.tick()
+        self.assertEqual(recorder.events, [(0, ACTION_FLAP), (1, ACTION_FLAP)])
+
+class TestReplayVerification(unittest.TestCase):
+    """Unit tests for fast-forward verification"""
+
+    def setUp(self):
+        """Record a few finished and interrupted games"""
+        self.replays = [record_game(seed, max_frames=1500) for seed in range(3)]
+        self.replays.append(record_game(9, flap_late))
+
+    def test_recorded_games_verify(self):
+        """Test that honest replays reproduce their result"""
+        self.assertTrue(self.replays[-1].game_over)
+        self.assertGreater(self.replays[0].score, 0)
+        for replay in self.replays:
+            self.assertTrue(verify_replay(replay), replay)
+            state = simulate_replay(replay)
+            self.assertEqual(state.score.get_current_score(), replay.score)
+
+    def test_tampered_replays_fail(self):
+        """Test that a changed score, input or seed is detected"""
+        honest = self.replays[0]
+        inflated = Replay(honest.seed, honest.events, honest.frames, honest.score + 1, honest.game_over)
+        other_seed = Replay(honest.seed + 1, honest.events, honest.frames, honest.score, honest.game_over)
+        no_input = Replay(honest.seed, [], honest.frames, honest.score, honest.game_over)
+        for replay in (inflated, other_seed, no_input):
+            self.assertFalse(verify_replay(replay))
+        self.assertEqual(verify_replays([honest, inflated, other_seed, no_input]), [True, False, False, False])
+
+    def test_batch_matches_one_by_one(self):
+        """Test that batched verification agrees with verify_replay()"""
+        tampered = [Replay(r.seed, r.events, r.frames, r.score + 1, r.game_over) for r in self.replays]
+        mixed = self.replays + tampered
+        expected = [verify_replay(replay) for replay in mixed]
+        self.assertEqual(verify_replays(mixed), expected)
+        with mock.patch.object(replays, "BatchSimulation", None):
+            self.assertEqual(verify_replays(mixed), expected)
+
+class TestRecordingInGame(GameLoopTestCase):
+    """Unit tests for replays saved by the game loop"""
+
+    def script(self, frame):
+        """Tap space every 20 frames and quit after 900 frames"""
+        events = []
+        if frame % 20 == 0:
+            events.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+        if frame % 20 == 4:
+            events.append(pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE))
+        if frame > 900:
+            events.append(pygame.event.Event(pygame.QUIT))
+        return events
+
+    def test_every_game_is_saved_and_verifies(self):
+        """Test that main() saves replays that reproduce each game"""
+        with tempfile.TemporaryDirectory() as directory:
+            self.play_main(replay_dir=directory)
+            saved = [Replay.load(os.path.join(directory, name)) for name in sorted(os.listdir(directory))]
+        self.assertGreater(len(saved), 1, "Several games and the interrupted one")
+        self.assertTrue(any(replay.events for replay in saved))
+        self.assertEqual(verify_replays(saved), [True] * len(saved))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import ACTION_NONE, DEATH_GROUND, DEATH_PIPE
+from FlappyPy.rollout import RolloutRunner, RolloutSummary, EpisodeResult, run_episode, follow_gap
+
+def do_nothing(state):
+    """Bot that never flaps"""
+    return ACTION_NONE
+
+class DisplayProbe:
+    """Bot that fails if it runs in a process with an open display"""
+
+    def __call__(self, state):
+        if pygame.display.get_init():
+            raise RuntimeError("display opened in worker")
+        return follow_gap(state)
+
+class TestRunEpisode(unittest.TestCase):
+    """Unit tests for playing single episodes"""
+
+    def test_idle_bot_hits_ground(self):
+        """Test that a bot that never flaps falls to the ground"""
+        result = run_episode(0, do_nothing)
+        self.assertEqual(result.death_cause, DEATH_GROUND)
+        self.assertEqual(result.score, 0)
+        self.assertGreater(result.frames, 0)
+
+    def test_frame_limit(self):
+        """Test that episodes stop at max_frames without a death cause"""
+        result = run_episode(0, follow_gap, max_frames=500)
+        self.assertEqual(result.frames, 500)
+        self.assertIsNone(result.death_cause)
+
+    def test_seeded_episodes_repeat(self):
+        """Test that the same seed and bot give the same result"""
+        self.assertEqual(run_episode(7, follow_gap, 2000), run_episode(7, follow_gap, 2000))
+
+class TestRolloutRunner(unittest.TestCase):
+    """Unit tests for sharding episodes across processes"""
+
+    def setUp(self):
+        """Run from a headless parent, as rollouts normally do"""
+        pygame.quit()
+
+    def test_chunks(self):
+        """Test that seeds are split into chunks of chunk_size"""
+        runner = RolloutRunner(workers=2, chunk_size=3)
+        self.assertEqual(runner.chunks(range(7)), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(len(RolloutRunner(workers=2).chunks(range(80))), 8, "Default is 4 chunks per worker")
+
+    def test_workers_match_in_process(self):
+        """Test that worker processes return the same results as playing in process"""
+        seeds = range(12)
+        local = sorted(RolloutRunner(workers=0, max_frames=800).imap(seeds))
+        remote = sorted(RolloutRunner(DisplayProbe(), workers=2, chunk_size=5, max_frames=800).imap(seeds))
+        self.assertEqual(remote, local)
+        self.assertEqual([result.seed for result in remote], list(seeds))
+
+    def test_results_are_streamed(self):
+        """Test that on_result sees every episode and the summary aggregates them"""
+        seen = []
+        summary = RolloutRunner(do_nothing, workers=2, chunk_size=2).run(range(6), on_result=seen.append)
+        self.assertEqual(sorted(result.seed for result in seen), list(range(6)))
+        self.assertEqual(summary.episodes, 6)
+        self.assertEqual(summary.deaths[DEATH_GROUND], 6)
+
+    def test_summary(self):
+        """Test aggregation of episode results"""
+        summary = RolloutSummary()
+        summary.add(EpisodeResult(0, 3, 500, DEATH_PIPE))
+        summary.add(EpisodeResult(1, 1, 300, DEATH_GROUND))
+        summary.add(EpisodeResult(2, 5, 1000, None))
+        self.assertEqual(summary.best_score, 5)
+        self.assertAlmostEqual(summary.mean_score, 3.0)
+        self.assertAlmostEqual(summary.mean_frames, 600.0)
+        self.assertEqual(summary.deaths, {DEATH_PIPE: 1, DEATH_GROUND: 1, None: 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -26,5 +26,9 @@ class TestScoring(unittest.TestCase):
         self.assertEqual(score.get_current_score(), 1,
                         "Score should increment to 1 after adding point")
 
+    def test_score_is_slotted(self):
+        """Test that scores keep no per-instance dict"""
+        self.assertFalse(hasattr(Score(), "__dict__"))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,193 @@
+import unittest
+from unittest import mock
+import asyncio
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import Simulation, ACTION_NONE, ACTION_FLAP, DEATH_GROUND
+from FlappyPy.history import CAUSE_CODES
+from FlappyPy import server as servers
+from FlappyPy.server import (
+    GameServer, Session, SessionProtocol, MessageReader, MESSAGES,
+    MSG_START, MSG_TICK, MSG_SPAWN, MSG_SCORE, MSG_OVER, INPUT_FLAP, INPUT_RELEASE, INPUT_RESTART,
+)
+from FlappyPy.rollout import follow_gap
+
+class FakeTransport:
+    """Collects what the server writes"""
+
+    def __init__(self):
+        self.reader = MessageReader()
+        self.messages = []
+        self.aborted = False
+
+    def write(self, data):
+        self.messages += self.reader.feed(data)
+
+    def abort(self):
+        self.aborted = True
+
+class TestSession(unittest.TestCase):
+    """Unit tests for one server-side session"""
+
+    def setUp(self):
+        """Open a session on a fake connection"""
+        self.transport = FakeTransport()
+        self.session = Session(GameServer(), self.transport)
+
+    def step(self):
+        """Run one tick and send its updates"""
+        self.session.step()
+        self.session.flush()
+
+    def test_starts_with_seed(self):
+        """Test that a session opens with the seed of its game"""
+        self.session.flush()
+        kind, seed = self.transport.messages[0]
+        self.assertEqual(kind, MSG_START)
+        self.assertEqual(seed, self.session.simulation.seed)
+
+    def test_matches_local_simulation(self):
+        """Test that the updates sent follow the same game played locally"""
+        self.session.flush()
+        local = Simulation(seed=self.transport.messages[0][1])
+        while not local.state.game_over and local.state.frame < 3000:
+            action = follow_gap(local.state)
+            if action == ACTION_FLAP:
+                self.session.receive(bytes([INPUT_FLAP]))
+            local.step(action)
+            self.step()
+
+        messages = self.transport.messages
+        ticks = [y for kind, y in messages if kind == MSG_TICK]
+        self.assertEqual(len(ticks), local.state.frame)
+        self.assertEqual(ticks[-1], int(local.state.bird.y * 2))
+        self.assertEqual(len([m for m in messages if m[0] == MSG_SPAWN]), local.state.spawn_count)
+        scores = [m[1] for m in messages if m[0] == MSG_SCORE]
+        self.assertEqual(scores, list(range(1, local.state.score.get_current_score() + 1)))
+        self.assertGreater(len(scores), 0)
+
+    def test_game_over_and_restart(self):
+        """Test that a game over is reported and a restart begins a new game"""
+        self.session.receive(bytes([INPUT_RESTART]))  # Ignored while playing
+        while not self.session.simulation.state.game_over:
+            self.step()
+        kind, frames, score, cause = self.transport.messages[-1]
+        self.assertEqual((kind, score, cause), (MSG_OVER, 0, CAUSE_CODES[DEATH_GROUND]))
+        self.assertEqual(frames, self.session.simulation.state.frame)
+
+        sent = len(self.transport.messages)
+        self.step()
+        self.assertEqual(len(self.transport.messages), sent, "Nothing happens until a restart")
+        self.session.receive(bytes([INPUT_RESTART]))
+        self.step()
+        self.assertEqual(self.transport.messages[-1][0], MSG_START)
+        self.assertFalse(self.session.simulation.state.game_over)
+
+    def test_flap_wins_within_a_tick(self):
+        """Test that a release after a flap in the same tick keeps the flap"""
+        self.session.receive(bytes([INPUT_FLAP, INPUT_RELEASE]))
+        self.assertEqual(self.session.pending, ACTION_FLAP)
+        self.step()
+        self.assertEqual(self.session.pending, ACTION_NONE)
+
+    def test_held_back_while_writing_is_paused(self):
+        """Test that updates wait while the transport is paused and then arrive in order"""
+        server = GameServer()
+        protocol = SessionProtocol(server)
+        protocol.connection_made(self.transport)
+        protocol.pause_writing()
+        for _ in range(10):
+            server.tick()
+        self.assertEqual(self.transport.messages, [])
+
+        protocol.resume_writing()
+        server.tick()
+        messages = self.transport.messages
+        self.assertEqual(messages[0][0], MSG_START)
+        self.assertEqual(len([m for m in messages if m[0] == MSG_TICK]), 11)
+
+    def test_client_that_stops_reading_is_dropped(self):
+        """Test that a paused client falling too far behind is disconnected"""
+        server = GameServer()
+        protocol = SessionProtocol(server)
+        protocol.connection_made(self.transport)
+        other = server.open_session(FakeTransport())
+        protocol.pause_writing()
+        with mock.patch.object(servers, "MAX_PENDING_OUTPUT", 50), \
+                self.assertLogs("FlappyPy.server", "WARNING"):
+            for _ in range(20):
+                server.tick()
+        self.assertTrue(self.transport.aborted)
+        self.assertEqual(server.sessions, [other])
+        self.assertEqual(self.transport.messages, [])
+        self.assertEqual(len([m for m in other.transport.messages if m[0] == MSG_TICK]), 20, "Other clients keep playing")
+
+class TestMessageReader(unittest.TestCase):
+    """Unit tests for splitting the update stream"""
+
+    def test_split_messages(self):
+        """Test that messages cut across reads are put back together"""
+        data = MESSAGES[MSG_START].pack(MSG_START, 7) + MESSAGES[MSG_TICK].pack(MSG_TICK, -4)
+        reader = MessageReader()
+        self.assertEqual(reader.feed(data[:5]), [])
+        self.assertEqual(reader.feed(data[5:10]), [(MSG_START, 7)])
+        self.assertEqual(reader.feed(data[10:]), [(MSG_TICK, -4)])
+
+    def test_rejects_unknown_messages(self):
+        """Test that a byte stream from something else raises ValueError"""
+        with self.assertRaises(ValueError):
+            MessageReader().feed(b"\xff\x00")
+
+class Client(asyncio.Protocol):
+    """Test client collecting the server's messages"""
+
+    def __init__(self):
+        self.reader = MessageReader()
+        self.messages = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        self.messages += self.reader.feed(data)
+
+class TestGameServer(unittest.TestCase):
+    """Unit tests for serving several clients over TCP"""
+
+    def test_clients_are_ticked_together(self):
+        """Test that every connected client gets its own game and one update per tick"""
+        async def scenario():
+            server = GameServer()
+            _, port = await server.listen_tcp("127.0.0.1", 0)
+            ticking = asyncio.ensure_future(server.run())
+            loop = asyncio.get_running_loop()
+            clients = [(await loop.create_connection(Client, "127.0.0.1", port))[1] for _ in range(3)]
+            while len(server.sessions) < 3:
+                await asyncio.sleep(0.01)
+            clients[0].transport.write(bytes([INPUT_FLAP]))
+            await asyncio.sleep(0.3)
+            for client in clients:
+                client.transport.close()
+            await asyncio.sleep(0.05)
+            server.stop()
+            await ticking
+            return server, clients
+
+        server, clients = asyncio.run(scenario())
+        self.assertEqual(server.sessions, [], "Closed connections drop their sessions")
+        self.assertGreater(server.ticks, 5)
+        self.assertEqual(len(server.tick_times), server.ticks)
+        self.assertIn("p99", server.tick_stats())
+        seeds = {client.messages[0] for client in clients}
+        self.assertEqual(len(seeds), 3, "Each session plays its own seed")
+        for client in clients:
+            self.assertGreater(len([m for m in client.messages if m[0] == MSG_TICK]), 5)
+        first = [y for kind, y in clients[0].messages if kind == MSG_TICK]
+        other = [y for kind, y in clients[1].messages if kind == MSG_TICK]
+        self.assertLess(min(first), min(other), "The flap moved only its own bird")
+
+if __name__ == '__main__':
+    unittest.main()
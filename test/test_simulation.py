@@ -0,0 +1,233 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import (
+    Simulation, Bird, Pipe,
+    ACTION_NONE, ACTION_FLAP, ACTION_RELEASE, EVENT_FLAP, EVENT_SCORE, EVENT_GAME_OVER,
+    DEATH_PIPE, DEATH_GROUND, BIRD_START_Y, BIRD_JUMP_STRENGTH,
+    PIPE_SPAWN_INTERVAL, PIPE_X_START, GAP_CENTER_MIN, GAP_CENTER_MAX,
+    PIPE_WIDTH, WINDOW_HEIGHT, SNAPSHOT_HEADER, SNAPSHOT_PIPE, SNAPSHOT_RNG, generate_gap_centers
+)
+from FlappyPy.rollout import follow_gap
+
+class TestSimulation(unittest.TestCase):
+    """Unit tests for the headless simulation core"""
+
+    def setUp(self):
+        """Create a fresh simulation for each test"""
+        self.simulation = Simulation(seed=0)
+
+    def test_initial_state(self):
+        """Test that a new simulation starts a fresh game"""
+        state = self.simulation.state
+        self.assertEqual(state.bird.y, BIRD_START_Y)
+        self.assertEqual(len(state.pipes), 0)
+        self.assertEqual(state.score.get_current_score(), 0)
+        self.assertFalse(state.game_over)
+        self.assertEqual(state.frame, 0)
+
+    def test_step_applies_gravity(self):
+        """Test that one step advances the bird like Bird.update()"""
+        reference = Bird()
+        reference.update()
+
+        state, events = self.simulation.step()
+        self.assertEqual(state.bird.y, reference.y)
+        self.assertEqual(state.bird.velocity, reference.velocity)
+        self.assertEqual(events, [])
+        self.assertEqual(state.frame, 1)
+
+    def test_flap_action(self):
+        """Test that the flap action jumps and reports a flap event"""
+        state, events = self.simulation.step(ACTION_FLAP)
+        self.assertIn(EVENT_FLAP, events)
+        self.assertTrue(state.bird.is_flying)
+        self.assertEqual(state.bird.velocity, BIRD_JUMP_STRENGTH + state.bird.gravity)
+
+        state, events = self.simulation.step(ACTION_RELEASE)
+        self.assertFalse(state.bird.is_flying)
+
+    def test_pipe_spawning(self):
+        """Test that pipes spawn on the spawn interval inside the gap range"""
+        for _ in range(PIPE_SPAWN_INTERVAL - 1):
+            # Keep the bird in the air
+            falling = self.simulation.state.bird.y > BIRD_START_Y
+            self.simulation.step(ACTION_FLAP if falling else ACTION_NONE)
+        self.assertEqual(len(self.simulation.state.pipes), 0)
+
+        state, _ = self.simulation.step()
+        self.assertEqual(len(state.pipes), 1)
+        self.assertEqual(state.pipes[0].x, PIPE_X_START)
+        self.assertGreaterEqual(state.pipes[0].gap_center_y, GAP_CENTER_MIN)
+        self.assertLessEqual(state.pipes[0].gap_center_y, GAP_CENTER_MAX)
+
+    def test_ground_collision_ends_game(self):
+        """Test that falling to the ground ends the game"""
+        events = []
+        while not self.simulation.state.game_over:
+            _, events = self.simulation.step()
+
+        state = self.simulation.state
+        self.assertIn(EVENT_GAME_OVER, events)
+        self.assertEqual(state.death_cause, DEATH_GROUND)
+        self.assertGreaterEqual(state.bird.y + state.bird.height, WINDOW_HEIGHT)
+
+    def test_pipe_collision_ends_game(self):
+        """Test that hitting a pipe ends the game"""
+        state = self.simulation.state
+        state.pipes.append(Pipe(state.bird.x, 100))  # Bird is below the gap
+
+        state, events = self.simulation.step()
+        self.assertTrue(state.game_over)
+        self.assertIn(EVENT_GAME_OVER, events)
+        self.assertEqual(state.death_cause, DEATH_PIPE)
+
+    def test_passing_pipe_scores(self):
+        """Test that passing a pipe adds one point"""
+        state = self.simulation.state
+        pipe = Pipe(state.bird.x - PIPE_WIDTH - 1, WINDOW_HEIGHT // 2)
+        state.pipes.append(pipe)
+
+        state, events = self.simulation.step()
+        self.assertIn(EVENT_SCORE, events)
+        self.assertEqual(state.score.get_current_score(), 1)
+        self.assertTrue(pipe.scored)
+
+    def test_step_after_game_over_is_noop(self):
+        """Test that a finished game does not advance"""
+        self.simulation.state.game_over = True
+        state, events = self.simulation.step(ACTION_FLAP)
+        self.assertEqual(events, [])
+        self.assertEqual(state.frame, 0)
+
+    def test_reset(self):
+        """Test that reset starts a new game"""
+        for _ in range(10):
+            self.simulation.step()
+        state = self.simulation.reset()
+        self.assertIs(state, self.simulation.state)
+        self.assertEqual(state.frame, 0)
+        self.assertEqual(state.bird.y, BIRD_START_Y)
+
+class TestSeededCourses(unittest.TestCase):
+    """Unit tests for seeded and pregenerated pipe courses"""
+
+    def play(self, simulation, frames=1500):
+        """Keep the bird near the middle and return the spawned gap centers"""
+        gaps = []
+        for _ in range(frames):
+            state = simulation.state
+            spawned = state.spawn_count
+            state, _ = simulation.step(follow_gap(state))
+            if state.spawn_count != spawned:
+                gaps.append(state.pipes[-1].gap_center_y)
+        return gaps
+
+    def test_same_seed_same_course(self):
+        """Test that two games with the same seed get the same pipes"""
+        first = self.play(Simulation(seed=42))
+        second = self.play(Simulation(seed=42))
+        self.assertGreater(len(first), 5)
+        self.assertEqual(first, second)
+
+    def test_different_seeds_differ(self):
+        """Test that different seeds give different courses"""
+        self.assertNotEqual(generate_gap_centers(1, 50), generate_gap_centers(2, 50))
+
+    def test_reset_with_seed_replays_course(self):
+        """Test that resetting with the same seed replays the course"""
+        simulation = Simulation(seed=7)
+        first = self.play(simulation)
+        simulation.reset(seed=7)
+        self.assertEqual(self.play(simulation), first)
+
+    def test_pregenerated_course_matches_seed(self):
+        """Test that a pregenerated course equals the seeded generator"""
+        gaps = self.play(Simulation(seed=3))
+        course = generate_gap_centers(3, len(gaps))
+        self.assertEqual(course.itemsize, 2, "Courses should be stored compactly")
+        self.assertEqual(list(course), gaps)
+        self.assertEqual(self.play(Simulation(gap_centers=course)), gaps)
+
+    def test_course_values_in_range(self):
+        """Test that pregenerated gaps keep the pipes on screen"""
+        course = generate_gap_centers(0, 1000)
+        self.assertGreaterEqual(min(course), GAP_CENTER_MIN)
+        self.assertLessEqual(max(course), GAP_CENTER_MAX)
+
+    def test_course_wraps_around(self):
+        """Test that a short course repeats"""
+        gaps = self.play(Simulation(gap_centers=[200, 300]), frames=1000)
+        self.assertEqual(gaps[:4], [200, 300, 200, 300])
+
+def fingerprint(state):
+    """Everything that changes in a game"""
+    return (
+        state.bird.snapshot(), [pipe.snapshot() for pipe in state.pipes], state.score.get_current_score(),
+        state.game_over, state.death_cause, state.frames_since_spawn, state.spawn_count, state.frame,
+    )
+
+class TestSaveStates(unittest.TestCase):
+    """Unit tests for Simulation.snapshot() and restore()"""
+
+    def play(self, simulation, frames):
+        """Play frames with the autopilot and return the state after each"""
+        return [fingerprint(simulation.step(follow_gap(simulation.state))[0]) for _ in range(frames)]
+
+    def test_resume_with_random_pipes(self):
+        """Test that a restored game spawns the same pipes and plays on identically"""
+        simulation = Simulation(seed=11)
+        self.play(simulation, 500)
+        snapshot = simulation.snapshot()
+        expected = self.play(simulation, 1500)
+        self.assertGreater(expected[-1][6], 12, "New pipes were drawn from the generator")
+
+        simulation.restore(snapshot)
+        self.assertEqual(self.play(simulation, 1500), expected)
+
+        resumed = Simulation(seed=0)  # A fresh game, as after a restart
+        resumed.restore(snapshot)
+        self.assertEqual(self.play(resumed, 1500), expected)
+
+    def test_game_over_round_trip(self):
+        """Test that a finished game is restored with its cause of death"""
+        simulation = Simulation(seed=1)
+        while not simulation.state.game_over:
+            simulation.step()
+        snapshot = simulation.snapshot()
+        restored = Simulation()
+        restored.restore(snapshot)
+        self.assertEqual(fingerprint(restored.state), fingerprint(simulation.state))
+        self.assertEqual(restored.state.death_cause, DEATH_GROUND)
+
+    def test_refuses_another_kind_of_game(self):
+        """Test that seeded and gap_centers snapshots cannot be restored into each other"""
+        seeded = Simulation(seed=3)
+        course = Simulation(gap_centers=generate_gap_centers(3, 100))
+        self.play(seeded, 300)
+        self.play(course, 300)
+        for source, target in ((course, seeded), (seeded, course)):
+            with self.subTest(seeded=source.gap_centers is None):
+                before = target.snapshot()
+                with self.assertRaises(ValueError):
+                    target.restore(source.snapshot())
+                self.assertEqual(target.snapshot(), before, "The game is left as it was")
+
+    def test_compact_layout(self):
+        """Test that a snapshot is a header, a record per pipe and the generator when it is used"""
+        simulation = Simulation(seed=2)
+        self.play(simulation, 400)
+        pipes = len(simulation.state.pipes)
+        self.assertGreater(pipes, 0)
+        self.assertEqual(len(simulation.snapshot()), SNAPSHOT_HEADER.size + pipes * SNAPSHOT_PIPE.size + SNAPSHOT_RNG.size)
+
+        course = Simulation(gap_centers=generate_gap_centers(2, 100))
+        self.play(course, 400)
+        self.assertEqual(len(course.snapshot()), SNAPSHOT_HEADER.size + pipes * SNAPSHOT_PIPE.size,
+                         "A pregenerated course needs no generator state")
+
+if __name__ == '__main__':
+    unittest.main()
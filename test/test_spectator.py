@@ -0,0 +1,133 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import Simulation, ACTION_FLAP, ACTION_RELEASE, FPS
+from FlappyPy.spectator import (
+    SpectatorEncoder, SpectatorDecoder, SpectatorChannel, FLAG_KEYFRAME, FLAG_SPAWN, FLAG_GAME_OVER,
+)
+from FlappyPy.rollout import follow_gap
+
+def snapshot(state):
+    """Everything a spectator sees of a game"""
+    return (
+        state.frame, state.bird.y, state.bird.previous_y, state.bird.velocity, state.bird.is_flying,
+        state.score.get_current_score(), state.game_over,
+        [(pipe.x, pipe.previous_x, pipe.gap_center_y) for pipe in state.pipes],
+    )
+
+def tap(state):
+    """Bot that releases space the frame after each flap, so the sprite changes too"""
+    return ACTION_RELEASE if state.bird.is_flying else follow_gap(state)
+
+class TestSpectatorStream(unittest.TestCase):
+    """Unit tests for encoding and decoding spectator streams"""
+
+    def play(self, channel, seed, frames, policy=follow_gap):
+        """Play a game published on channel, checking every subscriber after each tick"""
+        simulation = Simulation(seed=seed)
+        messages = []
+        for _ in range(frames):
+            simulation.step(policy(simulation.state))
+            messages.append(channel.publish(simulation.state))
+            for decoder in channel.subscribers:
+                self.assertEqual(snapshot(decoder.state), snapshot(simulation.state))
+        return simulation, messages
+
+    def test_spectators_see_the_game_exactly(self):
+        """Test that decoded states match the game, including spawns, scores and sprite changes"""
+        channel = SpectatorChannel()
+        channel.subscribe(SpectatorDecoder())
+        simulation, messages = self.play(channel, 2, 1500, tap)
+        self.assertGreater(simulation.state.score.get_current_score(), 0)
+        self.assertTrue(any(message[0] & FLAG_SPAWN for message in messages if message))
+
+    def test_bandwidth(self):
+        """Test that a spectator needs only a few hundred bytes per second"""
+        channel = SpectatorChannel()
+        self.play(channel, 5, 60 * FPS)
+        self.assertLess(channel.bytes_published / 60, 400)
+
+    def test_keyframes(self):
+        """Test that keyframes come first and then at the interval"""
+        channel = SpectatorChannel(keyframe_interval=50)
+        _, messages = self.play(channel, 1, 200)
+        keyframes = [index for index, message in enumerate(messages) if message[0] & FLAG_KEYFRAME]
+        self.assertEqual(keyframes, [0, 50, 100, 150])
+
+    def test_late_subscribers_sync_at_once(self):
+        """Test that a spectator joining mid-game gets a keyframe straight away"""
+        channel = SpectatorChannel()
+        simulation = Simulation(seed=3)
+        for _ in range(200):
+            simulation.step(follow_gap(simulation.state))
+            channel.publish(simulation.state)
+        late = SpectatorDecoder()
+        channel.subscribe(late)
+        self.assertTrue(late.synced)
+        for _ in range(30):
+            simulation.step(follow_gap(simulation.state))
+            channel.publish(simulation.state)
+        self.assertEqual(snapshot(late.state), snapshot(simulation.state))
+
+    def test_silent_after_game_over_and_keyframe_on_restart(self):
+        """Test that a finished game sends nothing until the next game starts"""
+        encoder = SpectatorEncoder()
+        simulation = Simulation(seed=0)
+        decoder = SpectatorDecoder()
+        while not simulation.state.game_over:
+            simulation.step()
+            decoder.write(encoder.encode(simulation.state))
+        self.assertTrue(decoder.state.game_over)
+        self.assertIsNone(encoder.encode(simulation.state))
+
+        simulation.reset(seed=1)
+        simulation.step()
+        message = encoder.encode(simulation.state)
+        self.assertTrue(message[0] & FLAG_KEYFRAME)
+        self.assertFalse(message[0] & FLAG_GAME_OVER)
+        decoder.write(message)
+        self.assertEqual(snapshot(decoder.state), snapshot(simulation.state))
+
+    def test_scores_past_uint16(self):
+        """Test that scores too high for a delta are sent in keyframes"""
+        channel = SpectatorChannel()
+        decoder = SpectatorDecoder()
+        channel.subscribe(decoder)
+        simulation = Simulation(seed=2)
+        simulation.state.score.current_score = 0xFFFF - 1
+        scored = []
+        while len(scored) < 3:
+            previous = simulation.state.score.get_current_score()
+            simulation.step(follow_gap(simulation.state))
+            message = channel.publish(simulation.state)
+            score = simulation.state.score.get_current_score()
+            if score != previous:
+                scored.append(score)
+                self.assertEqual(bool(message[0] & FLAG_KEYFRAME), score > 0xFFFF)
+            self.assertEqual(snapshot(decoder.state), snapshot(simulation.state))
+        self.assertEqual(scored, [0xFFFF, 0xFFFF + 1, 0xFFFF + 2])
+
+    def test_stream_split_anywhere(self):
+        """Test that the decoder waits for whole messages and skips deltas before a keyframe"""
+        encoder = SpectatorEncoder()
+        simulation = Simulation(seed=4)
+        stream = bytearray()
+        for _ in range(300):
+            simulation.step(follow_gap(simulation.state))
+            stream += encoder.encode(simulation.state)
+
+        decoder = SpectatorDecoder()
+        for start in range(0, len(stream), 7):
+            decoder.write(bytes(stream[start:start + 7]))
+        self.assertEqual(decoder.ticks, 300)
+        self.assertEqual(snapshot(decoder.state), snapshot(simulation.state))
+
+        joined_late = SpectatorDecoder()
+        joined_late.write(encoder.encode(simulation.step()[0]))  # A delta: ignored
+        self.assertFalse(joined_late.synced)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import unittest
+from unittest import mock
+import asyncio
+import tempfile
+import sys
+import os
+import pygame
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy import main as game
+from FlappyPy.timing import FixedTimestep, FramePacer
+from FlappyPy.main import Bird, Pipe, WINDOW_WIDTH, WINDOW_HEIGHT
+from test.helpers import FakeClock, GameLoopTestCase
+
+class TestFixedTimestep(unittest.TestCase):
+    """Unit tests for the fixed-timestep accumulator"""
+
+    def setUp(self):
+        """Create a 60 Hz clock driven by a fake time source"""
+        self.time = FakeClock()
+        self.timestep = FixedTimestep(60, max_ticks_per_frame=5, time_source=self.time)
+        self.timestep.advance()  # First frame only starts the clock
+
+    def test_first_frame_runs_no_ticks(self):
+        """Test that the first frame only records the start time"""
+        timestep = FixedTimestep(60, time_source=self.time)
+        self.assertEqual(timestep.advance(), 0)
+
+    def test_one_tick_per_frame_at_tick_rate(self):
+        """Test that rendering at the tick rate runs one tick per frame"""
+        for _ in range(10):
+            self.time.now += 1 / 60 + 1e-9
+            self.assertEqual(self.timestep.advance(), 1)
+        self.assertEqual(self.timestep.catch_up_frames, 0)
+
+    def test_fast_rendering_interpolates(self):
+        """Test that frames faster than the tick rate run zero ticks and interpolate"""
+        self.time.now += 1 / 240
+        self.assertEqual(self.timestep.advance(), 0)
+        self.assertAlmostEqual(self.timestep.alpha, 0.25)
+
+        self.time.now += 1 / 240
+        self.assertEqual(self.timestep.advance(), 0)
+        self.assertAlmostEqual(self.timestep.alpha, 0.5)
+
+    def test_slow_frame_catches_up(self):
+        """Test that a dropped frame is made up with extra ticks"""
+        self.time.now += 3 / 60 + 1e-9
+        self.assertEqual(self.timestep.advance(), 3)
+        self.assertEqual(self.timestep.catch_up_frames, 1)
+        self.assertEqual(self.timestep.most_ticks_in_frame, 3)
+        self.assertEqual(self.timestep.dropped_ticks, 0)
+
+    def test_long_stall_drops_ticks(self):
+        """Test that a long stall is capped instead of spiralling"""
+        self.time.now += 1.0
+        self.assertEqual(self.timestep.advance(), 5)
+        self.assertEqual(self.timestep.dropped_ticks, 55)
+        self.assertLess(self.timestep.alpha, 1.0)
+
+    def test_game_speed_independent_of_frame_rate(self):
+        """Test that the same wall time gives the same ticks at any frame rate"""
+        for frame_rate in (30, 60, 144, 1000):
+            time_source = FakeClock()
+            timestep = FixedTimestep(60, time_source=time_source)
+            timestep.advance()
+            for _ in range(frame_rate * 2):
+                time_source.now += 1 / frame_rate
+                timestep.advance()
+            self.assertIn(timestep.ticks, (119, 120), f"Wrong tick count at {frame_rate} FPS")
+
+    def test_reset_forgets_elapsed_time(self):
+        """Test that reset discards time accumulated during a pause"""
+        self.time.now += 10.0
+        self.timestep.reset()
+        self.assertEqual(self.timestep.advance(), 0)
+
+    def test_report(self):
+        """Test that the report mentions catch-up statistics"""
+        self.time.now += 2 / 60 + 1e-9
+        self.timestep.advance()
+        report = self.timestep.report()
+        self.assertIn("1 catch-up frames", report)
+        self.assertIn("60 Hz", report)
+
+class TestInterpolatedDrawing(unittest.TestCase):
+    """Unit tests for drawing between two ticks"""
+
+    def setUp(self):
+        """Create an offscreen surface to draw on"""
+        pygame.init()
+        self.screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    def test_update_remembers_previous_position(self):
+        """Test that updates keep the previous position for interpolation"""
+        bird = Bird()
+        pipe = Pipe(200, WINDOW_HEIGHT // 2)
+        y, x = bird.y, pipe.x
+        bird.update()
+        pipe.update()
+        self.assertEqual(bird.previous_y, y)
+        self.assertEqual(pipe.previous_x, x)
+
+    def test_pipe_drawn_at_previous_position(self):
+        """Test that alpha 0 draws a pipe at its previous position"""
+        pipe = Pipe(200, WINDOW_HEIGHT // 2)
+        for _ in range(2):
+            pipe.update()  # previous_x 197, x 194
+        self.screen.fill((0, 0, 0))
+        pipe.draw(self.screen, 0.0)
+        self.assertEqual(self.screen.get_at((196, 5))[:3], (0, 0, 0))
+        self.assertNotEqual(self.screen.get_at((197, 5))[:3], (0, 0, 0))
+
+class TestFramePacer(unittest.TestCase):
+    """Unit tests for capping the frame rate on an event loop"""
+
+    def pace(self, frame_times, fps):
+        """Delays wait(fps) sleeps for, with each frame taking the given time"""
+        time_source = FakeClock()
+        pacer = FramePacer(time_source=time_source)
+        delays = []
+
+        async def sleep(delay):
+            delays.append(delay)
+            time_source.now += delay
+
+        async def frames():
+            for frame_time in frame_times:
+                time_source.now += frame_time
+                await pacer.wait(fps)
+
+        with mock.patch("asyncio.sleep", sleep):
+            asyncio.run(frames())
+        return delays
+
+    def test_waits_out_the_rest_of_the_frame(self):
+        """Test that fast frames sleep until the next one is due"""
+        delays = self.pace([0.0, 0.004, 0.010], 50)
+        self.assertEqual(delays[0], 0.0, "The first frame only starts the pacer")
+        self.assertAlmostEqual(delays[1], 0.016)
+        self.assertAlmostEqual(delays[2], 0.010)
+
+    def test_slow_frames_and_no_cap_only_yield(self):
+        """Test that late frames and fps 0 still yield without waiting"""
+        self.assertEqual(self.pace([0.0, 0.05, 0.03], 50), [0.0, 0.0, 0.0])
+        self.assertEqual(self.pace([0.0, 0.001, 0.001], 0), [0.0, 0.0, 0.0])
+
+class TestRunGame(GameLoopTestCase):
+    """Unit tests for the asyncio game loop"""
+
+    def script(self, frame):
+        """Quit while the first game is still running"""
+        return [pygame.event.Event(pygame.QUIT)] if frame > 20 else []
+
+    def test_other_tasks_run_between_frames(self):
+        """Test that a coroutine sharing the loop runs every frame and replays are saved by the end"""
+        ticks = 0
+        done = False
+
+        async def telemetry():
+            nonlocal ticks
+            while not done:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def play(directory):
+            nonlocal done
+            monitor = asyncio.ensure_future(telemetry())
+            await game.run_game(render_fps=0, replay_dir=directory)
+            done = True
+            await monitor
+
+        with tempfile.TemporaryDirectory() as directory:
+            with mock.patch("pygame.event.get", self.scripted_events):
+                asyncio.run(play(directory))
+            saved = os.listdir(directory)
+        self.assertGreaterEqual(ticks, 20)
+        self.assertEqual(len(saved), 1, "The quit game is saved before run_game() returns")
+
+    def test_creates_the_replay_directory(self):
+        """Test that the first replay on a fresh install creates its directory"""
+        with tempfile.TemporaryDirectory() as directory:
+            replay_dir = os.path.join(directory, "new", "replays")
+            with mock.patch("pygame.event.get", self.scripted_events):
+                asyncio.run(game.run_game(render_fps=0, replay_dir=replay_dir))
+            self.assertEqual(len(os.listdir(replay_dir)), 1)
+
+    def test_failed_save_is_logged(self):
+        """Test that a replay that cannot be written is logged and does not stop the game"""
+        with tempfile.NamedTemporaryFile() as file:  # A file where the directory should be
+            with mock.patch("pygame.event.get", self.scripted_events), \
+                    self.assertLogs("FlappyPy.main", "ERROR") as logs:
+                asyncio.run(game.run_game(render_fps=0, replay_dir=file.name))
+        self.assertIn("Could not save the replay", logs.output[0])
+
+if __name__ == '__main__':
+    unittest.main()
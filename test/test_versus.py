@@ -0,0 +1,154 @@
+import unittest
+import sys
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from FlappyPy.main import Bird, Pipe, Score, ACTION_NONE, ACTION_FLAP, FPS
+from FlappyPy.versus import VersusGame, RollbackSession, UdpLink, LossyLink
+from FlappyPy.rollout import follow_gap
+
+def tap(state):
+    """follow_gap with an extra flap now and then, so the two birds differ"""
+    extra = state.frame % 40 == 0 and state.bird.velocity > 0 and state.bird.y > 250
+    return ACTION_FLAP if extra else follow_gap(state)
+
+class TestSnapshots(unittest.TestCase):
+    """Unit tests for snapshot() and restore()"""
+
+    def test_round_trip(self):
+        """Test that restoring a snapshot brings back a game that plays on identically"""
+        game = VersusGame(6)
+        play = lambda: game.step([follow_gap(player.state) for player in game.players]) or game.save()
+        for _ in range(400):
+            play()
+        saved = game.save()
+        expected = [play() for _ in range(200)]
+
+        game.load(saved)
+        self.assertEqual(game.save(), saved)
+        self.assertEqual([play() for _ in range(200)], expected)
+
+    def test_objects(self):
+        """Test the snapshots of a bird, a pipe and a score"""
+        bird, pipe, score = Bird(), Pipe(200, 300), Score()
+        bird.jump()
+        bird.update()
+        pipe.update()
+        pipe.scored = True
+        score.add_point()
+        saved = (bird.snapshot(), pipe.snapshot(), score.snapshot())
+        bird.update()
+        pipe.reset(400, 250)
+        score.add_point()
+        bird.restore(saved[0])
+        pipe.restore(saved[1])
+        score.restore(saved[2])
+        self.assertEqual((bird.snapshot(), pipe.snapshot(), score.snapshot()), saved)
+        self.assertEqual(pipe.top_rect.x, pipe.x)
+
+class TestVersusGame(unittest.TestCase):
+    """Unit tests for the two-player race"""
+
+    def test_shared_course(self):
+        """Test that both players meet the same pipes and the longer flight wins"""
+        game = VersusGame(4)
+        first, second = (player.state for player in game.players)
+        heights = set()
+        for _ in range(600):
+            game.step([follow_gap(first), tap(second)])
+            heights.add(first.bird.y - second.bird.y)
+        self.assertGreater(len(heights), 1, "The birds flew differently")
+        self.assertEqual([pipe.snapshot() for pipe in first.pipes], [pipe.snapshot() for pipe in second.pipes])
+
+        while not game.over:
+            game.step([follow_gap(first) if first.frame < 1000 else ACTION_NONE, ACTION_NONE])
+        self.assertEqual(game.winner(), 0)
+
+class TestRollbackSession(unittest.TestCase):
+    """Unit tests for two sessions racing over loopback"""
+
+    def race(self, latency, loss, frames=900):
+        """Race two bots over a bad network; return both sessions once every input is delivered
+
+        Sessions forget inputs they no longer need, so each player's inputs
+        are also logged in self.played for the offline check.
+        """
+        self.played = ({}, {})
+        clock = [0.0]
+        links = [UdpLink(), UdpLink()]
+        links[0].peer, links[1].peer = links[1].address, links[0].address
+        self.addCleanup(links[0].close)
+        self.addCleanup(links[1].close)
+        sessions = [
+            RollbackSession(player, LossyLink(link, latency, latency / 2, loss, seed=player, clock=lambda: clock[0]), 4)
+            for player, link in enumerate(links)
+        ]
+        policies = (follow_gap, tap)
+        pending = [None, None]
+        while min(session.frame for session in sessions) < frames:
+            clock[0] += 1 / FPS
+            for session, policy in zip(sessions, policies):
+                if session.frame == frames:
+                    session.poll()
+                    session.send()
+                    continue
+                if pending[session.player] is None:
+                    pending[session.player] = policy(session.game.players[session.player].state)
+                if session.advance(pending[session.player]):
+                    pending[session.player] = None
+                self.played[session.player].update(session.inputs[session.player])
+
+        # Let the last inputs arrive (they are sent again until acknowledged)
+        for _ in range(300):
+            clock[0] += 1 / FPS
+            for session in sessions:
+                session.poll()
+                session.send()
+        return sessions
+
+    def assertMatchesOffline(self, sessions):
+        """Assert that both sessions saw the same race as one played with every input known"""
+        inputs = self.played
+        offline = VersusGame(4)
+        for frame in range(sessions[0].frame):
+            offline.step([inputs[0][frame], inputs[1][frame]])
+        self.assertEqual(sessions[0].frame, sessions[1].frame)
+        self.assertEqual(sessions[0].game.save(), offline.save())
+        self.assertEqual(sessions[1].game.save(), offline.save())
+
+    def test_converges_despite_latency(self):
+        """Test that late inputs are rolled back and both sides agree"""
+        sessions = self.race(latency=0.1, loss=0.0)
+        self.assertMatchesOffline(sessions)
+        self.assertGreater(sessions[0].rollbacks, 0)
+        self.assertGreater(sessions[0].game.players[0].state.score.get_current_score(), 0)
+        for session in sessions:
+            self.assertLess(sum(map(len, session.inputs)), 20, "Confirmed inputs are forgotten")
+
+    def test_converges_despite_loss(self):
+        """Test that lost packets are made up by the next ones"""
+        sessions = self.race(latency=0.05, loss=0.2)
+        self.assertMatchesOffline(sessions)
+        self.assertGreater(sessions[1].link.dropped, 0)
+
+    def test_waits_for_a_silent_peer(self):
+        """Test that a session stops max_rollback frames ahead of a peer that sends nothing"""
+        link = UdpLink()
+        link.peer = link.address  # Our own packets are ignored as if they came from nowhere
+        self.addCleanup(link.close)
+
+        class Silent:
+            send = link.send
+
+            def receive(self):
+                link.receive()
+                return []
+
+        session = RollbackSession(0, Silent(), 1, max_rollback=5)
+        advanced = [session.advance(ACTION_NONE) for _ in range(10)]
+        self.assertEqual(advanced, [True] * 5 + [False] * 5)
+        self.assertEqual(session.frame, 5)
+
+if __name__ == '__main__':
+    unittest.main()